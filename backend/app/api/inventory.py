@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import date
+from typing import List, Optional
 from app.database import get_db
 from app.schemas.inventory import (
     InventoryItemCreate,
     InventoryItemUpdate,
     InventoryItemResponse,
+    InventoryBulkItemResult,
+    InventoryBulkResponse,
     ExpiryAlert
 )
 from app.services.inventory_service import InventoryService
+from app.services.expiry_service import expiry_scanner
+from app.services.collection_versions import EXPIRY_SCAN, INVENTORY, versioned_response
+
+_items_adapter = TypeAdapter(List[InventoryItemResponse])
+_alerts_adapter = TypeAdapter(List[ExpiryAlert])
 
 router = APIRouter(prefix="/api/inventory", tags=["inventory"])
 
@@ -19,10 +29,77 @@ def create_inventory_item(item: InventoryItemCreate, db: Session = Depends(get_d
     return InventoryService.create_item(db, item)
 
 
+def _bulk_response(results: List[InventoryBulkItemResult]) -> InventoryBulkResponse:
+    results = sorted(results, key=lambda result: result.index)
+    return InventoryBulkResponse(
+        created=sum(result.status == "created" for result in results),
+        merged=sum(result.status == "merged" for result in results),
+        invalid=sum(result.status == "invalid" for result in results),
+        results=results
+    )
+
+
+@router.post("/bulk", response_model=InventoryBulkResponse)
+def bulk_upsert_inventory(
+    items: List[InventoryItemCreate] = Body(max_length=5000),
+    db: Session = Depends(get_db)
+):
+    """Create many inventory items at once, merging duplicates by name and unit"""
+    return _bulk_response(InventoryService.bulk_upsert(db, list(enumerate(items))))
+
+
+@router.post("/bulk/import", response_model=InventoryBulkResponse)
+async def import_inventory(
+    request: Request,
+    profile_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Import inventory from a CSV (text/csv) or NDJSON (application/x-ndjson) body"""
+    content_type = request.headers.get("content-type", "")
+    if "csv" not in content_type and "ndjson" not in content_type:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson"
+        )
+    
+    body = await request.body()
+    try:
+        items, errors = InventoryService.parse_import(body, content_type, profile_id)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import must be UTF-8 encoded"
+        )
+    if len(items) > 5000:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Imports are limited to 5000 rows"
+        )
+    
+    results = await run_in_threadpool(InventoryService.bulk_upsert, db, items)
+    return _bulk_response(results + errors)
+
+
 @router.get("/profile/{profile_id}", response_model=List[InventoryItemResponse])
-def get_inventory_by_profile(profile_id: int, db: Session = Depends(get_db)):
-    """Get all inventory items for a profile"""
-    return InventoryService.get_items_by_profile(db, profile_id)
+def get_inventory_by_profile(
+    profile_id: int,
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get inventory items for a profile, newest first (next page cursor in X-Next-Cursor)"""
+    def build():
+        items, next_cursor = InventoryService.get_items_by_profile(db, profile_id, limit, cursor)
+        return items, {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    
+    try:
+        return versioned_response(request, db, profile_id, [INVENTORY], _items_adapter, build)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/{item_id}", response_model=InventoryItemResponse)
@@ -62,17 +139,37 @@ def delete_inventory_item(item_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/profile/{profile_id}/expiry-alerts", response_model=List[ExpiryAlert])
-def get_expiry_alerts(profile_id: int, db: Session = Depends(get_db)):
+def get_expiry_alerts(profile_id: int, request: Request, db: Session = Depends(get_db)):
     """Get expiry alerts for a profile"""
-    return InventoryService.get_expiry_alerts(db, profile_id)
+    # days_until_expiry changes with the date even when nothing was written
+    return versioned_response(
+        request, db, profile_id, [INVENTORY], _alerts_adapter,
+        lambda: (InventoryService.get_expiry_alerts(db, profile_id), {}),
+        global_collections=[EXPIRY_SCAN],
+        variant=date.today().isoformat()
+    )
+
+
+@router.get("/expiry-scan/stats")
+def get_expiry_scan_stats():
+    """Get duration and row counts of the background expiry scan"""
+    return expiry_scanner.stats
 
 
 @router.get("/profile/{profile_id}/low-stock", response_model=List[InventoryItemResponse])
 def get_low_stock_items(
     profile_id: int,
+    request: Request,
     threshold: float = Query(default=1.0, ge=0),
+    mass_threshold: float = Query(default=100.0, ge=0),
+    volume_threshold: float = Query(default=100.0, ge=0),
     db: Session = Depends(get_db)
 ):
-    """Get low stock items for a profile"""
-    return InventoryService.get_low_stock_items(db, profile_id, threshold)
+    """Get low stock items for a profile (threshold in pieces, grams and milliliters)"""
+    return versioned_response(
+        request, db, profile_id, [INVENTORY], _items_adapter,
+        lambda: (InventoryService.get_low_stock_items(
+            db, profile_id, threshold, mass_threshold, volume_threshold
+        ), {})
+    )
 
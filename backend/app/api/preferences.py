@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.preference import UserPreferenceCreate, UserPreferenceUpdate, UserPreferenceResponse
 from app.services.preference_service import PreferenceService
+from app.services.collection_versions import PREFERENCES, versioned_response
 
 router = APIRouter(prefix="/api/preferences", tags=["preferences"])
 
+_preference_adapter = TypeAdapter(UserPreferenceResponse)
+
 
 @router.post("/", response_model=UserPreferenceResponse, status_code=status.HTTP_201_CREATED)
 def create_preference(preference: UserPreferenceCreate, db: Session = Depends(get_db)):
@@ -22,15 +26,18 @@ def create_preference(preference: UserPreferenceCreate, db: Session = Depends(ge
 
 
 @router.get("/{profile_id}", response_model=UserPreferenceResponse)
-def get_preference(profile_id: int, db: Session = Depends(get_db)):
+def get_preference(profile_id: int, request: Request, db: Session = Depends(get_db)):
     """Get preferences for a profile"""
-    preference = PreferenceService.get_preference_by_profile(db, profile_id)
-    if not preference:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Preferences not found for this profile"
-        )
-    return preference
+    def build():
+        preference = PreferenceService.get_preference_by_profile(db, profile_id)
+        if not preference:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Preferences not found for this profile"
+            )
+        return preference, {}
+    
+    return versioned_response(request, db, profile_id, [PREFERENCES], _preference_adapter, build)
 
 
 @router.put("/{profile_id}", response_model=UserPreferenceResponse)
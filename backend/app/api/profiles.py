@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
@@ -54,8 +54,27 @@ def update_profile(profile_id: int, profile_update: ProfileUpdate, db: Session =
 
 
 @router.delete("/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_profile(profile_id: int, db: Session = Depends(get_db)):
-    """Delete a profile"""
+def delete_profile(
+    profile_id: int,
+    background_tasks: BackgroundTasks,
+    background: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a profile with all its inventory, recipes and preferences
+    
+    With background=true the profile is only checked to exist and the
+    deletion runs after the response, which is then 202 Accepted.
+    """
+    if background:
+        if not ProfileService.get_profile_by_id(db, profile_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found"
+            )
+        background_tasks.add_task(ProfileService.delete_profile_in_background, profile_id)
+        return Response(status_code=status.HTTP_202_ACCEPTED)
+    
     success = ProfileService.delete_profile(db, profile_id)
     if not success:
         raise HTTPException(
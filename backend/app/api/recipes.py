@@ -1,24 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
 from app.schemas.recipe import (
     RecipeResponse,
     RecipeGenerateRequest,
+    RecipeBatchGenerateRequest,
+    RecipeBatchResponse,
     RecipeFavoriteCreate,
-    RecipeFavoriteResponse
+    RecipeFavoriteResponse,
+    RecipeCookRequest,
+    RecipeCookResponse,
+    RecipeMatch,
+    RecipeSearchResponse
 )
 from app.services.recipe_service import RecipeService
+from app.services.recipe_search import RecipeSearch
+from app.services.recipe_index import RecipeIndexNotReadyError
+from app.services.recipe_cache import recipe_cache
+from app.services.gemini_service import gemini_service
+from app.services.llm_client import LLMError, LLMTimeoutError, LLMUnavailableError
+from app.services.collection_versions import FAVORITES, RECIPES, versioned_response
 
 router = APIRouter(prefix="/api/recipes", tags=["recipes"])
 
+_recipes_adapter = TypeAdapter(List[RecipeResponse])
+_favorites_adapter = TypeAdapter(List[RecipeFavoriteResponse])
+
 
 @router.post("/generate", response_model=RecipeResponse, status_code=status.HTTP_201_CREATED)
-def generate_recipe(request: RecipeGenerateRequest, db: Session = Depends(get_db)):
-    """Generate a recipe using AI based on available ingredients and preferences"""
+async def generate_recipe(request: RecipeGenerateRequest, response: Response):
+    """Generate a recipe using AI based on available ingredients and preferences
+    
+    While the LLM is unavailable, one of the profile's stored recipes that
+    fits the request may be returned instead, with 200 rather than 201 and
+    an X-Recipe-Source: stored header.
+    """
     try:
-        recipe = RecipeService.generate_recipe(db, request)
+        recipe, stored = await RecipeService.generate_recipe(request)
+        if stored:
+            response.status_code = status.HTTP_200_OK
+            response.headers["X-Recipe-Source"] = "stored"
         return recipe
+    except LLMUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after else None
+        )
+    except LLMTimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=str(e)
+        )
+    except LLMError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Error generating recipe: {str(e)}"
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -31,16 +73,145 @@ def generate_recipe(request: RecipeGenerateRequest, db: Session = Depends(get_db
         )
 
 
+def _event_stream(request: RecipeGenerateRequest) -> StreamingResponse:
+    return StreamingResponse(
+        RecipeService.stream_recipe(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/generate/stream")
+async def generate_recipe_stream(request: RecipeGenerateRequest):
+    """Generate a recipe, streaming fields as Server-Sent Events"""
+    return _event_stream(request)
+
+
+@router.get("/generate/stream")
+async def generate_recipe_stream_get(
+    profile_id: int,
+    ingredients: Optional[List[str]] = Query(default=None),
+    cuisine_type: Optional[str] = None,
+    max_cooking_time: Optional[int] = None,
+    dietary_preferences: Optional[List[str]] = Query(default=None),
+    available_utensils: Optional[List[str]] = Query(default=None),
+    servings: Optional[int] = 2
+):
+    """Generate a recipe as Server-Sent Events, for EventSource clients"""
+    return _event_stream(RecipeGenerateRequest(
+        profile_id=profile_id,
+        ingredients=ingredients,
+        cuisine_type=cuisine_type,
+        max_cooking_time=max_cooking_time,
+        dietary_preferences=dietary_preferences,
+        available_utensils=available_utensils,
+        servings=servings
+    ))
+
+
+@router.post("/generate/batch", response_model=RecipeBatchResponse)
+async def generate_recipes_batch(batch: RecipeBatchGenerateRequest):
+    """Generate several recipes concurrently, reporting failures per item"""
+    if batch.requests is not None:
+        requests = batch.requests
+        variants = None
+    else:
+        requests = [batch.request] * batch.variants
+        variants = list(range(1, batch.variants + 1)) if batch.variants > 1 else None
+    
+    try:
+        results = await RecipeService.generate_recipes_batch(requests, variants)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error saving generated recipes: {str(e)}"
+        )
+    return RecipeBatchResponse(results=results)
+
+
+@router.get("/cache/stats")
+def get_recipe_cache_stats():
+    """Get hit/miss statistics for the generated recipe cache"""
+    return recipe_cache.stats()
+
+
+@router.get("/llm/stats")
+def get_llm_stats():
+    """Get prompt, parsing, retry and circuit breaker statistics for LLM calls"""
+    return {**gemini_service.stats, "client": gemini_service.client.stats()}
+
+
 @router.get("/profile/{profile_id}", response_model=List[RecipeResponse])
-def get_recipes_by_profile(profile_id: int, limit: int = 50, db: Session = Depends(get_db)):
-    """Get all recipes for a profile"""
-    recipes = RecipeService.get_recipes_by_profile(db, profile_id, limit)
+def get_recipes_by_profile(
+    profile_id: int,
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get recipes for a profile, newest first (next page cursor in X-Next-Cursor)"""
+    def build():
+        recipes, next_cursor = RecipeService.get_recipes_with_favorite_flags(
+            db, profile_id, limit, cursor
+        )
+        return recipes, {"X-Next-Cursor": next_cursor} if next_cursor else {}
     
-    # Add is_favorite field to each recipe
-    for recipe in recipes:
-        recipe.is_favorite = RecipeService.is_favorited(db, profile_id, recipe.id)
+    try:
+        # is_favorite flags depend on the profile's favourites too
+        return versioned_response(request, db, profile_id, [RECIPES, FAVORITES], _recipes_adapter, build)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/match/{profile_id}", response_model=List[RecipeMatch])
+def match_recipes(
+    profile_id: int,
+    limit: int = Query(default=20, ge=1, le=100),
+    min_coverage: float = Query(default=0.0, ge=0, le=1),
+    max_cooking_time: Optional[int] = Query(default=None, gt=0),
+    include_other_profiles: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Find the profile's stored recipes the pantry can cover, without calling the LLM
     
-    return recipes
+    With include_other_profiles=true, every profile's recipes are ranked.
+    """
+    try:
+        return RecipeService.match_recipes(
+            db, profile_id, limit, min_coverage, max_cooking_time, include_other_profiles
+        )
+    except RecipeIndexNotReadyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
+
+
+@router.get("/search", response_model=RecipeSearchResponse)
+def search_recipes(
+    profile_id: int,
+    q: str = Query(min_length=1, max_length=200),
+    difficulty: Optional[str] = None,
+    max_cooking_time: Optional[int] = Query(default=None, gt=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over a profile's recipes, best matches first, with facet counts"""
+    try:
+        recipes, total, facets = RecipeSearch.search(
+            db, profile_id, q, difficulty, max_cooking_time, limit, offset
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return RecipeSearchResponse(results=recipes, total=total, facets=facets)
 
 
 @router.get("/{recipe_id}", response_model=RecipeResponse)
@@ -55,6 +226,22 @@ def get_recipe(recipe_id: int, db: Session = Depends(get_db)):
     return recipe
 
 
+@router.post("/{recipe_id}/cook", response_model=RecipeCookResponse)
+def cook_recipe(
+    recipe_id: int,
+    cook: RecipeCookRequest,
+    db: Session = Depends(get_db)
+):
+    """Deduct a recipe's ingredients from the cooking profile's inventory and return what changed"""
+    result = RecipeService.cook_recipe(db, recipe_id, cook.profile_id, cook.servings)
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recipe not found"
+        )
+    return result
+
+
 @router.delete("/{recipe_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_recipe(recipe_id: int, db: Session = Depends(get_db)):
     """Delete a recipe"""
@@ -94,7 +281,23 @@ def remove_from_favorites(profile_id: int, recipe_id: int, db: Session = Depends
 
 
 @router.get("/favorites/profile/{profile_id}", response_model=List[RecipeFavoriteResponse])
-def get_favorites(profile_id: int, db: Session = Depends(get_db)):
-    """Get all favorite recipes for a profile"""
-    return RecipeService.get_favorites(db, profile_id)
+def get_favorites(
+    profile_id: int,
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get favorite recipes for a profile, newest first (next page cursor in X-Next-Cursor)"""
+    def build():
+        favorites, next_cursor = RecipeService.get_favorites(db, profile_id, limit, cursor)
+        return favorites, {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    
+    try:
+        return versioned_response(request, db, profile_id, [FAVORITES], _favorites_adapter, build)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
@@ -1,11 +1,63 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
     database_url: str
-    gemini_api_key: str
+    # Only required when llm_provider is "gemini"; checked on the first LLM call
+    gemini_api_key: Optional[str] = None
     environment: str = "development"
+    # Make relationships lazy="raise", so a lazy load that an explicit loader
+    # option should have covered fails instead of issuing a query (for tests)
+    db_lazy_raise: bool = False
+    # Pooled connections opened at startup, so the first requests don't wait to connect
+    db_warmup_connections: int = 2
+    
+    # LLM provider: "gemini", or "stub" for synthetic recipes without network access
+    llm_provider: str = "gemini"
+    gemini_model: str = "gemini-2.5-flash"
+    # Stub latency distribution ("fixed:<s>", "uniform:<lo>:<hi>", "normal:<mean>:<sd>",
+    # "lognormal:<median>:<sigma>"), share of simulated upstream errors and RNG seed
+    llm_stub_latency: str = "lognormal:0.8:0.35"
+    llm_stub_error_rate: float = 0.0
+    llm_stub_seed: Optional[int] = None
+    
+    # Maximum number of in-flight LLM calls per process
+    llm_max_concurrency: int = 8
+    
+    # Recipe prompt size: estimated token budget and cap on listed ingredients
+    llm_prompt_token_budget: int = 400
+    llm_prompt_max_ingredients: int = 40
+    
+    # Attempts per recipe when a response fails validation even after repair
+    llm_parse_max_attempts: int = 2
+    
+    # LLM call resilience: deadline per attempt (so a call with retries can take up to
+    # (llm_max_retries + 1) * llm_timeout_seconds plus backoff), retries with jittered
+    # backoff, hedged second request after a delay (0 disables) and circuit breaker
+    llm_timeout_seconds: float = 30.0
+    llm_max_retries: int = 2
+    llm_backoff_base_seconds: float = 0.5
+    llm_backoff_max_seconds: float = 8.0
+    llm_hedge_delay_seconds: float = 0.0
+    llm_breaker_failure_threshold: float = 0.5
+    llm_breaker_min_calls: int = 10
+    llm_breaker_open_seconds: float = 30.0
+    # While the breaker is open, serve the profile's own stored recipe that best fits the request
+    llm_fallback_to_match: bool = True
+    
+    # Generated recipe cache: "memory", "sqlite" or "none"
+    recipe_cache_backend: str = "memory"
+    recipe_cache_ttl_seconds: int = 86400
+    recipe_cache_max_entries: int = 1024
+    recipe_cache_sqlite_path: str = "recipe_cache.db"
+    
+    # Serialized list responses kept per process, keyed on collection versions (0 disables)
+    response_cache_max_entries: int = 512
+    
+    # Add a Server-Timing header (database time and LLM spans) to every response
+    server_timing_header: bool = True
     
     class Config:
         env_file = ".env"
@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -13,6 +14,10 @@ engine = create_engine(
     max_overflow=20
 )
 
+# Default loader strategy for model relationships; endpoints that serialize a
+# relationship load it explicitly with selectinload/joinedload
+RELATIONSHIP_LAZY = "raise" if settings.db_lazy_raise else "select"
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -26,3 +31,13 @@ def get_db():
     finally:
         db.close()
 
+
+
+@contextmanager
+def session_scope():
+    """Short-lived session for work done outside a request dependency"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,79 @@
+"""
+Lightweight schema migrations
+
+Each module in app/migrations/versions defines ``revision``, ``description``
+and ``upgrade(conn)``. Pending revisions are applied in order and recorded in
+the ``schema_migrations`` table. Migrations must be idempotent: revision 0001
+creates any missing tables from the current models, so later revisions can
+find their tables, columns or indexes already present on a fresh database.
+"""
+import importlib
+import pkgutil
+from datetime import datetime
+from typing import List
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("revision", String(32), primary_key=True),
+    Column("description", String(255), nullable=True),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+# Arbitrary key for the Postgres advisory lock that serializes concurrent runners
+_ADVISORY_LOCK_KEY = 4216043
+
+
+def _load_migrations() -> List:
+    from app.migrations import versions
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    return sorted(modules, key=lambda module: module.revision)
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """Apply all pending migrations and return the revisions that were applied"""
+    applied = []
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Workers starting together must not race on DDL
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+        schema_migrations.create(bind=conn, checkfirst=True)
+        done = set(conn.execute(schema_migrations.select().with_only_columns(
+            schema_migrations.c.revision
+        )).scalars())
+
+        for migration in _load_migrations():
+            if migration.revision in done:
+                continue
+            migration.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                revision=migration.revision,
+                description=migration.description,
+                applied_at=datetime.utcnow()
+            ))
+            applied.append(migration.revision)
+    return applied
+
+
+def create_index_if_missing(conn: Connection, index: Index) -> None:
+    """Create an index unless one with the same name already exists"""
+    existing = {ix["name"] for ix in inspect(conn).get_indexes(index.table.name)}
+    if index.name not in existing:
+        index.create(bind=conn)
+
+
+def add_column_if_missing(conn: Connection, table_name: str, column: Column) -> bool:
+    """Add a column to an existing table unless it is already there"""
+    existing = {col["name"] for col in inspect(conn).get_columns(table_name)}
+    if column.name in existing:
+        return False
+    column_type = column.type.compile(dialect=conn.dialect)
+    conn.execute(text(f'ALTER TABLE {table_name} ADD COLUMN {column.name} {column_type}'))
+    return True
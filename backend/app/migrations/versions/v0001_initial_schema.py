@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+from app.database import Base
+import app.models  # noqa: F401  (registers every model on Base.metadata)
+
+revision = "0001"
+description = "Create tables that do not exist yet"
+
+
+def upgrade(conn: Connection) -> None:
+    Base.metadata.create_all(bind=conn)
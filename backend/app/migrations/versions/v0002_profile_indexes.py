@@ -0,0 +1,33 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from app.migrations import create_index_if_missing
+from app.models import InventoryItem, Recipe, RecipeFavorite
+
+revision = "0002"
+description = "Composite indexes on profile-scoped tables"
+
+INDEXES = {
+    Recipe: ["ix_recipes_profile_created"],
+    RecipeFavorite: [
+        "ix_recipe_favorites_profile_created",
+        "uq_recipe_favorites_profile_recipe",
+        "ix_recipe_favorites_recipe",
+    ],
+    InventoryItem: [
+        "ix_inventory_items_profile_created",
+        "ix_inventory_items_profile_expiry",
+    ],
+}
+
+
+def upgrade(conn: Connection) -> None:
+    # Duplicate favourites would violate the new unique index; keep the oldest
+    conn.execute(text(
+        "DELETE FROM recipe_favorites WHERE id NOT IN ("
+        "SELECT MIN(id) FROM recipe_favorites GROUP BY profile_id, recipe_id)"
+    ))
+    
+    for model, names in INDEXES.items():
+        for index in model.__table__.indexes:
+            if index.name in names:
+                create_index_if_missing(conn, index)
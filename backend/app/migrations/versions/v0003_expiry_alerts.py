@@ -0,0 +1,9 @@
+from sqlalchemy.engine import Connection
+from app.models import ExpiryAlertEntry
+
+revision = "0003"
+description = "Materialized expiry_alerts table"
+
+
+def upgrade(conn: Connection) -> None:
+    ExpiryAlertEntry.__table__.create(bind=conn, checkfirst=True)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Float, String, update
+from sqlalchemy.engine import Connection
+from app.migrations import add_column_if_missing, create_index_if_missing
+from app.models import InventoryItem
+from app.services.units import base_quantity_expression, base_unit_expression
+
+revision = "0004"
+description = "Base-unit inventory quantities"
+
+
+def upgrade(conn: Connection) -> None:
+    add_column_if_missing(conn, "inventory_items", Column("base_quantity", Float))
+    add_column_if_missing(conn, "inventory_items", Column("base_unit", String(8)))
+    
+    # Backfill every row with one set-based UPDATE driven by the conversion table
+    table = InventoryItem.__table__
+    conn.execute(
+        update(table)
+        .where(table.c.base_unit.is_(None))
+        .values(
+            base_quantity=base_quantity_expression(table.c.quantity, table.c.unit),
+            base_unit=base_unit_expression(table.c.unit),
+            updated_at=table.c.updated_at
+        )
+    )
+    
+    for index in table.indexes:
+        if index.name == "ix_inventory_items_profile_base":
+            create_index_if_missing(conn, index)
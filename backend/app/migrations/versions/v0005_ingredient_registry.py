@@ -0,0 +1,80 @@
+from sqlalchemy import JSON, Column, Integer, bindparam, select, update
+from sqlalchemy.engine import Connection
+from app.migrations import add_column_if_missing, create_index_if_missing
+from app.models import Ingredient, IngredientAlias, InventoryItem, Recipe, UserPreference
+from app.services.ingredient_registry import IngredientRegistry, seed_ingredients
+
+revision = "0005"
+description = "Canonical ingredient registry"
+
+
+def upgrade(conn: Connection) -> None:
+    Ingredient.__table__.create(bind=conn, checkfirst=True)
+    IngredientAlias.__table__.create(bind=conn, checkfirst=True)
+    add_column_if_missing(conn, "inventory_items", Column("ingredient_id", Integer))
+    add_column_if_missing(conn, "user_preferences", Column("disliked_ingredient_ids", JSON))
+    
+    registry = IngredientRegistry()
+    registry.load(conn)
+    seed_ingredients(conn, registry)
+    
+    # Inventory: one UPDATE per distinct name, sent as a single executemany
+    inventory = InventoryItem.__table__
+    names = conn.execute(
+        select(inventory.c.name).where(inventory.c.ingredient_id.is_(None)).distinct()
+    ).scalars().all()
+    params = [
+        {"b_name": name, "b_ingredient_id": registry.register(conn, name)}
+        for name in names
+    ]
+    params = [p for p in params if p["b_ingredient_id"] is not None]
+    if params:
+        conn.execute(
+            update(inventory)
+            .where(inventory.c.name == bindparam("b_name"), inventory.c.ingredient_id.is_(None))
+            .values(ingredient_id=bindparam("b_ingredient_id"), updated_at=inventory.c.updated_at),
+            params
+        )
+    
+    preferences = UserPreference.__table__
+    rows = conn.execute(
+        select(preferences.c.id, preferences.c.disliked_ingredients)
+        .where(preferences.c.disliked_ingredient_ids.is_(None))
+    ).all()
+    params = [
+        {"b_id": row_id, "b_ids": _ingredient_ids(conn, registry, disliked or [])}
+        for row_id, disliked in rows
+    ]
+    if params:
+        conn.execute(
+            update(preferences)
+            .where(preferences.c.id == bindparam("b_id"))
+            .values(disliked_ingredient_ids=bindparam("b_ids"), updated_at=preferences.c.updated_at),
+            params
+        )
+    
+    recipes = Recipe.__table__
+    params = []
+    for row_id, ingredients in conn.execute(select(recipes.c.id, recipes.c.ingredients)):
+        if not ingredients or all("ingredient_id" in ingredient for ingredient in ingredients):
+            continue
+        params.append({"b_id": row_id, "b_ingredients": [
+            {**ingredient, "ingredient_id": registry.register(conn, str(ingredient.get("name", "")))}
+            for ingredient in ingredients
+        ]})
+    if params:
+        conn.execute(
+            update(recipes)
+            .where(recipes.c.id == bindparam("b_id"))
+            .values(ingredients=bindparam("b_ingredients")),
+            params
+        )
+    
+    for index in inventory.indexes:
+        if index.name == "ix_inventory_items_profile_ingredient":
+            create_index_if_missing(conn, index)
+
+
+def _ingredient_ids(conn: Connection, registry: IngredientRegistry, names):
+    ids = (registry.register(conn, name) for name in names)
+    return sorted({ingredient_id for ingredient_id in ids if ingredient_id is not None})
@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+from app.services.recipe_search import RecipeSearch
+
+revision = "0006"
+description = "Full-text recipe search index"
+
+
+def upgrade(conn: Connection) -> None:
+    RecipeSearch.create(conn)
+    RecipeSearch.rebuild(conn)
@@ -0,0 +1,9 @@
+from sqlalchemy.engine import Connection
+from app.models import CollectionVersion
+
+revision = "0007"
+description = "Per-profile collection versions for ETags"
+
+
+def upgrade(conn: Connection) -> None:
+    CollectionVersion.__table__.create(bind=conn, checkfirst=True)
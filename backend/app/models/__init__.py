@@ -1,13 +1,20 @@
 from app.models.profile import Profile
+from app.models.ingredient import Ingredient, IngredientAlias
 from app.models.inventory import InventoryItem
 from app.models.recipe import Recipe, RecipeFavorite
 from app.models.preference import UserPreference
+from app.models.expiry_alert import ExpiryAlertEntry
+from app.models.collection_version import CollectionVersion
 
 __all__ = [
     "Profile",
+    "Ingredient",
+    "IngredientAlias",
     "InventoryItem",
     "Recipe",
     "RecipeFavorite",
-    "UserPreference"
+    "UserPreference",
+    "ExpiryAlertEntry",
+    "CollectionVersion"
 ]
 
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+
+class CollectionVersion(Base):
+    """Version of one profile's collection (inventory, recipes, ...), bumped by every write to it"""
+    __tablename__ = "collection_versions"
+    
+    # Profile 0 holds versions of changes that affect every profile
+    profile_id = Column(Integer, primary_key=True, autoincrement=False)
+    collection = Column(String(32), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base, RELATIONSHIP_LAZY
+
+
+class ExpiryAlertEntry(Base):
+    """Materialized expiry alert for one inventory item, refreshed by ExpiryService"""
+    __tablename__ = "expiry_alerts"
+    __table_args__ = (
+        Index("ix_expiry_alerts_profile_expiry", "profile_id", "expiry_date"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False)
+    item_id = Column(Integer, ForeignKey("inventory_items.id"), nullable=False, unique=True)
+    expiry_date = Column(Date, nullable=False)
+    status = Column(String(32), nullable=False)  # "expired", "expiring_soon", "expiring_this_week"
+    computed_on = Column(Date, nullable=False)
+    
+    # Relationships
+    item = relationship("InventoryItem", lazy=RELATIONSHIP_LAZY)
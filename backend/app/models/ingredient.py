@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base, RELATIONSHIP_LAZY
+
+
+class Ingredient(Base):
+    __tablename__ = "ingredients"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False, unique=True)  # canonical, normalized
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    aliases = relationship(
+        "IngredientAlias", back_populates="ingredient", cascade="all, delete-orphan", lazy=RELATIONSHIP_LAZY
+    )
+
+
+class IngredientAlias(Base):
+    __tablename__ = "ingredient_aliases"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    alias = Column(String(255), nullable=False, unique=True)  # normalized spelling
+    ingredient_id = Column(Integer, ForeignKey("ingredients.id"), nullable=False)
+    
+    # Relationships
+    ingredient = relationship("Ingredient", back_populates="aliases", lazy=RELATIONSHIP_LAZY)
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
-from app.database import Base
+from app.database import Base, RELATIONSHIP_LAZY
 
 
 class UnitType(str, enum.Enum):
@@ -18,12 +18,26 @@ class UnitType(str, enum.Enum):
 
 class InventoryItem(Base):
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        # Keyset pagination over a profile's inventory
+        Index("ix_inventory_items_profile_created", "profile_id", "created_at", "id"),
+        # Expiry alerts scan a profile's items by expiry date
+        Index("ix_inventory_items_profile_expiry", "profile_id", "expiry_date"),
+        # Low-stock and sufficiency checks range over base quantities
+        Index("ix_inventory_items_profile_base", "profile_id", "base_unit", "base_quantity"),
+        # Merging and matching look up a profile's stock by canonical ingredient
+        Index("ix_inventory_items_profile_ingredient", "profile_id", "ingredient_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False)
     name = Column(String(255), nullable=False)
+    ingredient_id = Column(Integer, ForeignKey("ingredients.id"), nullable=True)  # canonical ingredient
     quantity = Column(Float, nullable=False)
     unit = Column(Enum(UnitType), nullable=False)
+    # Quantity converted to grams, milliliters or a count (see app.services.units)
+    base_quantity = Column(Float, nullable=True)
+    base_unit = Column(String(8), nullable=True)  # "g", "ml", "count"
     category = Column(String(100), nullable=True)  # e.g., "vegetable", "dairy", "spice"
     expiry_date = Column(Date, nullable=True)
     purchase_date = Column(Date, nullable=True)
@@ -32,5 +46,5 @@ class InventoryItem(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    profile = relationship("Profile", back_populates="inventory_items")
+    profile = relationship("Profile", back_populates="inventory_items", lazy=RELATIONSHIP_LAZY)
 
@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, JSON, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from app.database import Base
+from app.database import Base, RELATIONSHIP_LAZY
 
 
 class UserPreference(Base):
@@ -14,6 +14,7 @@ class UserPreference(Base):
     dietary_restrictions = Column(JSON, nullable=True)  # ["vegan", "gluten-free", etc.]
     preferred_cuisines = Column(JSON, nullable=True)  # ["Indian", "Italian", etc.]
     disliked_ingredients = Column(JSON, nullable=True)
+    disliked_ingredient_ids = Column(JSON, nullable=True)  # canonical ingredient ids
     
     # Cooking preferences
     available_utensils = Column(JSON, nullable=True)  # ["oven", "air fryer", etc.]
@@ -24,5 +25,5 @@ class UserPreference(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    profile = relationship("Profile", back_populates="preferences")
+    profile = relationship("Profile", back_populates="preferences", lazy=RELATIONSHIP_LAZY)
 
@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from app.database import Base
+from app.database import Base, RELATIONSHIP_LAZY
 
 
 class Profile(Base):
@@ -15,8 +15,16 @@ class Profile(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    inventory_items = relationship("InventoryItem", back_populates="profile", cascade="all, delete-orphan")
-    preferences = relationship("UserPreference", back_populates="profile", cascade="all, delete-orphan")
-    recipes = relationship("Recipe", back_populates="profile", cascade="all, delete-orphan")
-    favorites = relationship("RecipeFavorite", back_populates="profile", cascade="all, delete-orphan")
+    inventory_items = relationship(
+        "InventoryItem", back_populates="profile", cascade="all, delete-orphan", lazy=RELATIONSHIP_LAZY
+    )
+    preferences = relationship(
+        "UserPreference", back_populates="profile", cascade="all, delete-orphan", lazy=RELATIONSHIP_LAZY
+    )
+    recipes = relationship(
+        "Recipe", back_populates="profile", cascade="all, delete-orphan", lazy=RELATIONSHIP_LAZY
+    )
+    favorites = relationship(
+        "RecipeFavorite", back_populates="profile", cascade="all, delete-orphan", lazy=RELATIONSHIP_LAZY
+    )
 
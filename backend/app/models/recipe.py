@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from app.database import Base
+from app.database import Base, RELATIONSHIP_LAZY
 
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    __table_args__ = (
+        # Keyset pagination over a profile's recipes
+        Index("ix_recipes_profile_created", "profile_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False)
@@ -23,12 +27,20 @@ class Recipe(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    profile = relationship("Profile", back_populates="recipes")
-    favorites = relationship("RecipeFavorite", back_populates="recipe", cascade="all, delete-orphan")
+    profile = relationship("Profile", back_populates="recipes", lazy=RELATIONSHIP_LAZY)
+    favorites = relationship(
+        "RecipeFavorite", back_populates="recipe", cascade="all, delete-orphan", lazy=RELATIONSHIP_LAZY
+    )
 
 
 class RecipeFavorite(Base):
     __tablename__ = "recipe_favorites"
+    __table_args__ = (
+        Index("ix_recipe_favorites_profile_created", "profile_id", "created_at", "id"),
+        # A recipe can only be favourited once per profile
+        Index("uq_recipe_favorites_profile_recipe", "profile_id", "recipe_id", unique=True),
+        Index("ix_recipe_favorites_recipe", "recipe_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False)
@@ -37,6 +49,6 @@ class RecipeFavorite(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    profile = relationship("Profile", back_populates="favorites")
-    recipe = relationship("Recipe", back_populates="favorites")
+    profile = relationship("Profile", back_populates="favorites", lazy=RELATIONSHIP_LAZY)
+    recipe = relationship("Recipe", back_populates="favorites", lazy=RELATIONSHIP_LAZY)
 
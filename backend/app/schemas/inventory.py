@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import date, datetime
-from typing import Optional
+from typing import Optional, List
 from app.models.inventory import UnitType
 
 
@@ -31,6 +31,9 @@ class InventoryItemUpdate(BaseModel):
 class InventoryItemResponse(InventoryItemBase):
     id: int
     profile_id: int
+    ingredient_id: Optional[int] = None
+    base_quantity: Optional[float] = None
+    base_unit: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
@@ -43,3 +46,17 @@ class ExpiryAlert(BaseModel):
     days_until_expiry: int
     status: str  # "expired", "expiring_soon", "expiring_this_week"
 
+
+
+class InventoryBulkItemResult(BaseModel):
+    index: int
+    status: str  # "created", "merged", "invalid"
+    item_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class InventoryBulkResponse(BaseModel):
+    created: int
+    merged: int
+    invalid: int
+    results: List[InventoryBulkItemResult]
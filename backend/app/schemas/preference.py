@@ -23,6 +23,7 @@ class UserPreferenceUpdate(UserPreferenceBase):
 class UserPreferenceResponse(UserPreferenceBase):
     id: int
     profile_id: int
+    disliked_ingredient_ids: Optional[List[int]] = None
     created_at: datetime
     updated_at: datetime
     
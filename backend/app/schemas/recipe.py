@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
@@ -13,6 +13,23 @@ class RecipeGenerateRequest(BaseModel):
     servings: Optional[int] = 2
 
 
+class RecipeBatchGenerateRequest(BaseModel):
+    # Either an explicit list of requests, or one request repeated as variants
+    requests: Optional[List[RecipeGenerateRequest]] = Field(default=None, max_length=20)
+    request: Optional[RecipeGenerateRequest] = None
+    variants: int = Field(default=1, ge=1, le=10)
+    
+    @model_validator(mode="after")
+    def check_requests(self):
+        if (self.requests is None) == (self.request is None):
+            raise ValueError("Provide exactly one of 'requests' or 'request'")
+        if self.requests is not None and not self.requests:
+            raise ValueError("'requests' must not be empty")
+        if self.requests is not None and "variants" in self.model_fields_set:
+            raise ValueError("'variants' only applies to 'request'")
+        return self
+
+
 class RecipeBase(BaseModel):
     title: str
     cuisine_type: Optional[str] = None
@@ -26,6 +43,29 @@ class RecipeBase(BaseModel):
     image_url: Optional[str] = None
 
 
+class GeneratedIngredient(BaseModel):
+    name: str = Field(min_length=1)
+    quantity: Optional[str] = None
+    unit: Optional[str] = None
+    
+    @field_validator("quantity", "unit", mode="before")
+    @classmethod
+    def coerce_to_text(cls, value):
+        return str(value) if isinstance(value, (int, float)) else value
+
+
+class GeneratedRecipe(RecipeBase):
+    """A recipe as returned by the LLM, validated before it is stored"""
+    title: str = Field(min_length=1)
+    ingredients: List[GeneratedIngredient] = Field(min_length=1)
+    instructions: str = Field(min_length=1)
+    
+    @field_validator("instructions", mode="before")
+    @classmethod
+    def join_steps(cls, value):
+        return "\n".join(str(step) for step in value) if isinstance(value, list) else value
+
+
 class RecipeResponse(RecipeBase):
     id: int
     profile_id: int
@@ -54,3 +94,62 @@ class RecipeFavoriteResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class RecipeBatchItemResult(BaseModel):
+    index: int
+    success: bool
+    recipe: Optional[RecipeResponse] = None
+    error: Optional[str] = None
+
+
+class RecipeBatchResponse(BaseModel):
+    results: List[RecipeBatchItemResult]
+
+
+class RecipeCookRequest(BaseModel):
+    # Profile doing the cooking, whose inventory is used
+    profile_id: int
+    # Scale ingredient amounts from the recipe's servings to this many
+    servings: Optional[int] = Field(default=None, gt=0)
+
+
+class CookedIngredient(BaseModel):
+    ingredient: str
+    item_id: int
+    item_name: str
+    unit: str
+    quantity_used: float
+    quantity_before: float
+    quantity_after: float
+    removed: bool
+
+
+class UnmatchedIngredient(BaseModel):
+    ingredient: str
+    reason: str  # "not_in_inventory", "unknown_quantity", "unit_mismatch"
+
+
+class RecipeCookResponse(BaseModel):
+    recipe_id: int
+    consumed: List[CookedIngredient]
+    unmatched: List[UnmatchedIngredient]
+
+
+class RecipeMatch(BaseModel):
+    recipe: RecipeResponse
+    coverage: float  # share of the recipe's ingredients found in the pantry
+    matched_count: int
+    total_count: int
+    missing_ingredients: List[str]
+
+
+class RecipeSearchFacets(BaseModel):
+    difficulty: Dict[str, int]  # matches per difficulty, ignoring the difficulty filter
+    cooking_time: Dict[str, int]  # matches per time bucket ("0-15", "16-30", "31-60", "61+"), ignoring max_cooking_time
+
+
+class RecipeSearchResponse(BaseModel):
+    results: List[RecipeResponse]
+    total: int
+    facets: RecipeSearchFacets
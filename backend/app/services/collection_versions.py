@@ -0,0 +1,180 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.collection_version import CollectionVersion
+
+settings = get_settings()
+
+# Collections with their own version per profile
+INVENTORY = "inventory"
+RECIPES = "recipes"
+FAVORITES = "favorites"
+PREFERENCES = "preferences"
+# Global collection (profile 0), bumped by the expiry scan that rewrites every profile's alerts
+EXPIRY_SCAN = "expiry_scan"
+
+_GLOBAL_PROFILE = 0
+
+
+class CollectionVersions:
+    """Monotonic per-profile collection versions, read to build ETags"""
+
+    @staticmethod
+    def bump(db: Session, profile_ids: Union[int, Iterable[int]], *collections: str) -> None:
+        """Increment versions in the caller's transaction, creating missing rows
+
+        Call this before committing a write, so readers never see new data
+        under an old version.
+        """
+        if isinstance(profile_ids, int):
+            profile_ids = [profile_ids]
+        # A fixed order keeps concurrent bumps from deadlocking on Postgres
+        rows = [
+            {"profile_id": profile_id, "collection": collection, "version": 1}
+            for profile_id in sorted(set(profile_ids))
+            for collection in sorted(set(collections))
+        ]
+        if not rows:
+            return
+        table = CollectionVersion.__table__
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.profile_id, table.c.collection],
+                set_={"version": table.c.version + 1}
+            ),
+            rows
+        )
+
+    @staticmethod
+    def bump_global(db: Session, *collections: str) -> None:
+        """Increment versions that every profile's ETags include"""
+        CollectionVersions.bump(db, _GLOBAL_PROFILE, *collections)
+
+    @staticmethod
+    def get(
+        db: Session,
+        profile_id: int,
+        collections: Sequence[str],
+        global_collections: Sequence[str] = ()
+    ) -> Tuple[int, ...]:
+        """Current versions in the given order (0 for never-written collections), in one query"""
+        keys = [(profile_id, collection) for collection in collections]
+        keys += [(_GLOBAL_PROFILE, collection) for collection in global_collections]
+        rows = db.execute(
+            select(CollectionVersion.profile_id, CollectionVersion.collection, CollectionVersion.version)
+            .where(tuple_(CollectionVersion.profile_id, CollectionVersion.collection).in_(keys))
+        ).all()
+        versions = {(row.profile_id, row.collection): row.version for row in rows}
+        return tuple(versions.get(key, 0) for key in keys)
+
+
+class ResponseCache:
+    """Per-process LRU of serialized response bodies, keyed on collection versions
+
+    Entries are never invalidated: a write bumps the version, so later
+    requests use a new key and stale bodies age out.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Tuple[bytes, Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: Any) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: Any, body: bytes, headers: Dict[str, str]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (body, headers)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+def _if_none_match(request: Request) -> List[str]:
+    """Entity tags listed in the request's If-None-Match header"""
+    header = request.headers.get("if-none-match")
+    return [candidate.strip() for candidate in header.split(",")] if header else []
+
+
+def _etag_matches(candidates: List[str], etag: str) -> bool:
+    """Weak comparison of If-None-Match entity tags against an ETag"""
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def versioned_response(
+    request: Request,
+    db: Session,
+    profile_id: int,
+    collections: Sequence[str],
+    adapter: TypeAdapter,
+    build: Callable[[], Tuple[Any, Dict[str, str]]],
+    global_collections: Sequence[str] = (),
+    variant: str = ""
+) -> Response:
+    """
+    Serve a profile's collection with a strong ETag derived from its versions
+
+    A matching If-None-Match gets a 304 after reading only the version rows.
+    Otherwise the body comes from the response cache, or from build(), which
+    returns the content (serialized with adapter) and extra headers, or
+    raises (e.g. a 404) when there is nothing to serve; If-None-Match: *
+    only gets a 304 once that representation exists. variant covers
+    anything besides the versions and query string that changes the body,
+    such as the current date.
+    """
+    versions = CollectionVersions.get(db, profile_id, collections, global_collections)
+    key = (request.url.path, str(request.url.query), versions, variant)
+    etag = '"%s"' % hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+    # Clients may keep the body but must revalidate it on every use
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    candidates = _if_none_match(request)
+    if _etag_matches(candidates, etag):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    cached = response_cache.get(key)
+    if cached is None:
+        content, extra_headers = build()
+        body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+        response_cache.set(key, body, extra_headers)
+    else:
+        body, extra_headers = cached
+    if "*" in candidates:
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers={**headers, **extra_headers})
+
+
+# Singleton instance
+response_cache = ResponseCache(settings.response_cache_max_entries)
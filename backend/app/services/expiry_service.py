@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, delete, insert, literal, select
+from sqlalchemy.orm import Session
+from app.database import session_scope
+from app.models.expiry_alert import ExpiryAlertEntry
+from app.models.inventory import InventoryItem
+from app.schemas.inventory import ExpiryAlert
+from app.services.collection_versions import CollectionVersions, EXPIRY_SCAN
+
+logger = logging.getLogger(__name__)
+
+
+class ExpiryService:
+
+    @staticmethod
+    def refresh_alerts(
+        db: Session,
+        profile_id: Optional[int] = None,
+        item_ids: Optional[Iterable[int]] = None
+    ) -> Dict[str, int]:
+        """
+        Recompute materialized expiry alerts in one set-based pass
+
+        Covers every profile by default, or just one profile or a set of items.
+        Pending changes are flushed first; the caller commits.
+        """
+        db.flush()
+        today = date.today()
+
+        stale = delete(ExpiryAlertEntry)
+        source = select(
+            InventoryItem.profile_id,
+            InventoryItem.id,
+            InventoryItem.expiry_date,
+            case(
+                (InventoryItem.expiry_date < today, "expired"),
+                (InventoryItem.expiry_date <= today + timedelta(days=3), "expiring_soon"),
+                else_="expiring_this_week"
+            ),
+            literal(today)
+        ).where(InventoryItem.expiry_date <= today + timedelta(days=7))
+
+        if profile_id is not None:
+            stale = stale.where(ExpiryAlertEntry.profile_id == profile_id)
+            source = source.where(InventoryItem.profile_id == profile_id)
+        if item_ids is not None:
+            item_ids = list(item_ids)
+            stale = stale.where(ExpiryAlertEntry.item_id.in_(item_ids))
+            source = source.where(InventoryItem.id.in_(item_ids))
+
+        deleted = db.execute(stale).rowcount
+        inserted = db.execute(insert(ExpiryAlertEntry).from_select(
+            ["profile_id", "item_id", "expiry_date", "status", "computed_on"],
+            source
+        )).rowcount
+        return {"rows_deleted": deleted, "rows_inserted": inserted}
+
+    @staticmethod
+    def clear_item_alerts(db: Session, item_ids: Iterable[int]) -> None:
+        """Remove alerts for items that are about to be deleted"""
+        db.execute(delete(ExpiryAlertEntry).where(ExpiryAlertEntry.item_id.in_(list(item_ids))))
+
+    @staticmethod
+    def get_alerts(db: Session, profile_id: int) -> List[ExpiryAlert]:
+        """Read materialized expiry alerts for a profile, most urgent first"""
+        today = date.today()
+        rows = db.query(InventoryItem, ExpiryAlertEntry.status).join(
+            ExpiryAlertEntry, ExpiryAlertEntry.item_id == InventoryItem.id
+        ).filter(
+            ExpiryAlertEntry.profile_id == profile_id
+        ).order_by(ExpiryAlertEntry.expiry_date, ExpiryAlertEntry.item_id).all()
+
+        return [
+            ExpiryAlert(
+                item=item,
+                days_until_expiry=(item.expiry_date - today).days,
+                status=status
+            )
+            for item, status in rows
+        ]
+
+
+class ExpiryScanner:
+    """Recomputes all expiry alerts at startup and at every day rollover"""
+
+    def __init__(self):
+        self.stats: Dict[str, Any] = {
+            "runs": 0,
+            "last_run_at": None,
+            "last_duration_seconds": None,
+            "last_rows_deleted": None,
+            "last_rows_inserted": None,
+        }
+
+    def run_once(self) -> Dict[str, Any]:
+        """Run a full scan and record its duration and row counts"""
+        started = time.perf_counter()
+        with session_scope() as db:
+            rows = ExpiryService.refresh_alerts(db)
+            CollectionVersions.bump_global(db, EXPIRY_SCAN)
+            db.commit()
+        duration = time.perf_counter() - started
+
+        self.stats.update(
+            runs=self.stats["runs"] + 1,
+            last_run_at=datetime.utcnow().isoformat(),
+            last_duration_seconds=duration,
+            last_rows_deleted=rows["rows_deleted"],
+            last_rows_inserted=rows["rows_inserted"],
+        )
+        logger.info(
+            "Expiry scan finished in %.3fs (%d alerts written, %d removed)",
+            duration, rows["rows_inserted"], rows["rows_deleted"]
+        )
+        return self.stats
+
+    async def run_forever(self) -> None:
+        """Scan now, then again shortly after each local midnight"""
+        while True:
+            try:
+                await run_in_threadpool(self.run_once)
+            except Exception:
+                logger.exception("Expiry scan failed")
+
+            tomorrow = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+            await asyncio.sleep((tomorrow - datetime.now()).total_seconds() + 1)
+
+
+# Singleton instance
+expiry_scanner = ExpiryScanner()
@@ -1,19 +1,59 @@
-import google.generativeai as genai
 from app.config import get_settings
-from typing import List, Dict, Any, Optional
-import json
-import re
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+from app.services.prompt_builder import build_recipe_prompt
+from app.services.llm_client import CircuitBreaker, LLMResponseError, ResilientLLMClient
+from app.services.llm_providers import LLMProvider, create_provider
+from app.services.metrics import span
+from app.services.recipe_parser import RecipeParseError, parse_recipe
+from app.services.recipe_stream_parser import IncrementalRecipeParser, RecipeEvent
+import asyncio
+import logging
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
-genai.configure(api_key=settings.gemini_api_key)
+
+# Marks the end of an upstream recipe stream in GeminiService's chunk queue
+_STREAM_END = object()
 
 
 class GeminiService:
-    def __init__(self):
-        # Use the latest available Gemini model
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+    """Builds recipe prompts, calls the configured LLM provider and parses its answers
+    
+    The provider (Gemini or the local stub) is chosen by settings.llm_provider
+    and does no work until the first call.
+    """
     
-    def generate_recipe(
+    def __init__(self, provider: Optional[LLMProvider] = None):
+        self.provider = provider or create_provider(settings)
+        self.client = ResilientLLMClient(
+            self.provider,
+            timeout=settings.llm_timeout_seconds,
+            max_retries=settings.llm_max_retries,
+            backoff_base=settings.llm_backoff_base_seconds,
+            backoff_max=settings.llm_backoff_max_seconds,
+            hedge_delay=settings.llm_hedge_delay_seconds or None,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.llm_breaker_failure_threshold,
+                min_calls=settings.llm_breaker_min_calls,
+                open_seconds=settings.llm_breaker_open_seconds
+            ),
+            # Bounds outstanding LLM calls so a spike cannot pile up unbounded
+            # work; held per attempt, so retry backoff doesn't occupy a slot
+            max_concurrency=settings.llm_max_concurrency
+        )
+        self.stats: Dict[str, Any] = {
+            "calls": 0,
+            "estimated_prompt_tokens_total": 0,
+            "prompt_tokens_total": 0,
+            "ingredients_dropped_total": 0,
+            "last_prompt": None,
+            "parse_ok": 0,
+            "parse_repaired": 0,
+            "parse_failed": 0,
+            "parse_retries": 0,
+        }
+    
+    async def generate_recipe(
         self,
         ingredients: List[str],
         cuisine_type: Optional[str] = None,
@@ -21,29 +61,108 @@ class GeminiService:
         dietary_preferences: Optional[List[str]] = None,
         available_utensils: Optional[List[str]] = None,
         servings: int = 2,
-        disliked_ingredients: Optional[List[str]] = None
+        disliked_ingredients: Optional[List[str]] = None,
+        variant: Optional[int] = None
     ) -> Dict[str, Any]:
         """
-        Generate a recipe using Gemini API based on available ingredients and preferences
+        Generate a recipe with the LLM provider based on available ingredients and preferences
+        
+        Raises an LLMError subclass when the call times out, fails, is
+        rejected by the open circuit breaker, or yields no valid recipe.
         """
         
         # Build the prompt
-        prompt = self._build_recipe_prompt(
-            ingredients=ingredients,
-            cuisine_type=cuisine_type,
-            max_cooking_time=max_cooking_time,
-            dietary_preferences=dietary_preferences,
-            available_utensils=available_utensils,
-            servings=servings,
-            disliked_ingredients=disliked_ingredients
-        )
+        with span("prompt_build"):
+            prompt, prompt_stats = self._build_recipe_prompt(
+                ingredients=ingredients,
+                cuisine_type=cuisine_type,
+                max_cooking_time=max_cooking_time,
+                dietary_preferences=dietary_preferences,
+                available_utensils=available_utensils,
+                servings=servings,
+                disliked_ingredients=disliked_ingredients,
+                variant=variant
+            )
+        
+        # A response that fails validation even after repair is retried a bounded number of times
+        for attempt in range(settings.llm_parse_max_attempts):
+            with span("llm_generate"):
+                response = await self.client.generate(prompt)
+            self._record_prompt(prompt_stats, response.prompt_tokens)
+            try:
+                with span("llm_parse"):
+                    return self._parse_recipe_response(response.text)
+            except LLMResponseError:
+                if attempt + 1 >= settings.llm_parse_max_attempts:
+                    raise
+                self.stats["parse_retries"] += 1
+                logger.warning("Discarding unparseable recipe response (attempt %d)", attempt + 1)
+    
+    async def generate_recipe_stream(
+        self,
+        ingredients: List[str],
+        cuisine_type: Optional[str] = None,
+        max_cooking_time: Optional[int] = None,
+        dietary_preferences: Optional[List[str]] = None,
+        available_utensils: Optional[List[str]] = None,
+        servings: int = 2,
+        disliked_ingredients: Optional[List[str]] = None,
+        variant: Optional[int] = None
+    ) -> AsyncIterator[RecipeEvent]:
+        """
+        Stream a recipe from the LLM, yielding events as fields complete and
+        finally a ("recipe", recipe_data) event with the fully parsed recipe
+        """
+        
+        with span("prompt_build"):
+            prompt, prompt_stats = self._build_recipe_prompt(
+                ingredients=ingredients,
+                cuisine_type=cuisine_type,
+                max_cooking_time=max_cooking_time,
+                dietary_preferences=dietary_preferences,
+                available_utensils=available_utensils,
+                servings=servings,
+                disliked_ingredients=disliked_ingredients,
+                variant=variant
+            )
+        
+        # The upstream stream is read by its own task into a queue, so the LLM
+        # slot is released as soon as the model finishes, however slowly the
+        # client reads the events
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def pump() -> None:
+            try:
+                with span("llm_generate"):
+                    async for chunk in self.client.generate_stream(prompt):
+                        queue.put_nowait(chunk)
+                queue.put_nowait(_STREAM_END)
+            except Exception as e:
+                queue.put_nowait(e)
         
+        parser = IncrementalRecipeParser()
+        chunks = []
+        prompt_tokens = None
+        reader = asyncio.create_task(pump())
         try:
-            response = self.model.generate_content(prompt)
-            recipe_data = self._parse_recipe_response(response.text)
-            return recipe_data
-        except Exception as e:
-            raise Exception(f"Error generating recipe with Gemini: {str(e)}")
+            while True:
+                chunk = await queue.get()
+                if chunk is _STREAM_END:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                prompt_tokens = chunk.prompt_tokens or prompt_tokens
+                chunks.append(chunk.text)
+                for event in parser.feed(chunk.text):
+                    yield event
+        finally:
+            # The client went away: stop reading upstream
+            reader.cancel()
+        self._record_prompt(prompt_stats, prompt_tokens)
+        
+        with span("llm_parse"):
+            recipe_data = self._parse_recipe_response(''.join(chunks))
+        yield "recipe", recipe_data
     
     def _build_recipe_prompt(
         self,
@@ -53,113 +172,48 @@ class GeminiService:
         dietary_preferences: Optional[List[str]],
         available_utensils: Optional[List[str]],
         servings: int,
-        disliked_ingredients: Optional[List[str]]
-    ) -> str:
-        """Build a detailed prompt for Gemini"""
-        
-        prompt = f"""You are a professional chef assistant. Generate a detailed recipe based on the following criteria:
-
-**Available Ingredients:**
-{', '.join(ingredients)}
-
-**Requirements:**
-- Servings: {servings}"""
-        
-        if cuisine_type:
-            prompt += f"\n- Cuisine Type: {cuisine_type}"
-        
-        if max_cooking_time:
-            prompt += f"\n- Maximum Cooking Time: {max_cooking_time} minutes"
-        
-        if dietary_preferences:
-            prompt += f"\n- Dietary Preferences: {', '.join(dietary_preferences)}"
-        
-        if available_utensils:
-            prompt += f"\n- Available Kitchen Tools: {', '.join(available_utensils)}"
-        
-        if disliked_ingredients:
-            prompt += f"\n- DO NOT USE: {', '.join(disliked_ingredients)}"
-        
-        prompt += """
-
-Please provide the recipe in the following JSON format:
-{
-    "title": "Recipe Name",
-    "cuisine_type": "Cuisine Type",
-    "cooking_time": <time in minutes>,
-    "difficulty": "easy/medium/hard",
-    "servings": <number>,
-    "ingredients": [
-        {"name": "ingredient name", "quantity": "amount", "unit": "unit"},
-        ...
-    ],
-    "instructions": "Step-by-step cooking instructions with numbered steps",
-    "utensils_required": ["utensil1", "utensil2", ...],
-    "nutritional_info": {
-        "calories": "approximate calories per serving",
-        "protein": "grams",
-        "carbs": "grams",
-        "fat": "grams"
-    }
-}
-
-Make sure the recipe:
-1. Uses primarily the available ingredients
-2. Is practical and delicious
-3. Includes clear, numbered steps
-4. Respects all dietary preferences
-5. Can be made with available utensils
-6. Fits within the time constraint
-
-Respond ONLY with valid JSON, no additional text."""
+        disliked_ingredients: Optional[List[str]],
+        variant: Optional[int] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the compact per-request prompt; the fixed template is the system instruction"""
+        return build_recipe_prompt(
+            ingredients=ingredients,
+            cuisine_type=cuisine_type,
+            max_cooking_time=max_cooking_time,
+            dietary_preferences=dietary_preferences,
+            available_utensils=available_utensils,
+            servings=servings,
+            disliked_ingredients=disliked_ingredients,
+            variant=variant,
+            token_budget=settings.llm_prompt_token_budget,
+            max_ingredients=settings.llm_prompt_max_ingredients
+        )
+    
+    def _record_prompt(self, prompt_stats: Dict[str, Any], prompt_tokens: Optional[int]) -> None:
+        """Log and accumulate prompt size for one call
         
-        return prompt
+        prompt_tokens is the count the provider billed, when it reports one.
+        """
+        self.stats["calls"] += 1
+        self.stats["estimated_prompt_tokens_total"] += prompt_stats["estimated_prompt_tokens"]
+        self.stats["prompt_tokens_total"] += prompt_tokens or 0
+        self.stats["ingredients_dropped_total"] += prompt_stats["ingredients_dropped"]
+        self.stats["last_prompt"] = {**prompt_stats, "prompt_tokens": prompt_tokens}
+        logger.info(
+            "Recipe prompt: %s tokens (estimated %d), %d ingredients listed, %d dropped",
+            prompt_tokens, prompt_stats["estimated_prompt_tokens"],
+            prompt_stats["ingredients_listed"], prompt_stats["ingredients_dropped"]
+        )
     
     def _parse_recipe_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse the Gemini response and extract recipe data"""
-        
+        """Validate the Gemini response into recipe data, counting repairs and failures"""
         try:
-            # Try to extract JSON from the response
-            # Remove markdown code blocks if present
-            json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
-            if json_match:
-                json_text = json_match.group(1)
-            else:
-                json_text = response_text
-            
-            # Parse JSON
-            recipe_data = json.loads(json_text.strip())
-            
-            # Validate required fields
-            required_fields = ['title', 'ingredients', 'instructions']
-            for field in required_fields:
-                if field not in recipe_data:
-                    raise ValueError(f"Missing required field: {field}")
-            
-            # Ensure instructions is a string
-            if isinstance(recipe_data['instructions'], list):
-                recipe_data['instructions'] = '\n'.join(recipe_data['instructions'])
-            
-            return recipe_data
-            
-        except json.JSONDecodeError as e:
-            # If JSON parsing fails, create a structured response from text
-            return self._fallback_parse(response_text)
-    
-    def _fallback_parse(self, response_text: str) -> Dict[str, Any]:
-        """Fallback parser if JSON extraction fails"""
-        
-        return {
-            "title": "Custom Recipe",
-            "cuisine_type": "Mixed",
-            "cooking_time": 30,
-            "difficulty": "medium",
-            "servings": 2,
-            "ingredients": [{"name": "Various ingredients", "quantity": "as needed", "unit": ""}],
-            "instructions": response_text,
-            "utensils_required": ["Basic kitchen tools"],
-            "nutritional_info": None
-        }
+            recipe_data, repaired = parse_recipe(response_text)
+        except RecipeParseError as e:
+            self.stats["parse_failed"] += 1
+            raise LLMResponseError(str(e)) from e
+        self.stats["parse_repaired" if repaired else "parse_ok"] += 1
+        return recipe_data
 
 
 # Singleton instance
@@ -0,0 +1,196 @@
+import difflib
+import functools
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from app.database import session_scope
+from app.models.ingredient import Ingredient, IngredientAlias
+from app.services.ingredients import normalize_ingredient_name
+
+# Canonical ingredients seeded by migration 0005, with the spellings that map to them.
+# Plurals and preparation words are handled by normalization, not listed here.
+SEED_INGREDIENTS: Dict[str, List[str]] = {
+    "tomato": ["roma tomato", "plum tomato", "vine tomato"],
+    "cherry tomato": ["grape tomato"],
+    "onion": ["red onion", "yellow onion", "white onion", "brown onion"],
+    "scallion": ["green onion", "spring onion"],
+    "garlic": ["garlic clove", "clove garlic", "clove of garlic"],
+    "ginger": ["ginger root", "adrak"],
+    "potato": ["aloo"],
+    "bell pepper": ["capsicum", "red bell pepper", "green bell pepper", "yellow bell pepper"],
+    "chili pepper": ["chili", "chilli", "green chili", "red chili", "green chilli", "red chilli"],
+    "cilantro": ["coriander leaf", "fresh coriander", "dhania"],
+    "spinach": ["palak", "baby spinach"],
+    "chickpea": ["garbanzo bean", "chana"],
+    "egg": ["hen egg"],
+    "milk": ["cow milk"],
+    "butter": ["unsalted butter", "salted butter"],
+    "yogurt": ["yoghurt", "curd", "plain yogurt", "dahi"],
+    "cream": ["heavy cream", "double cream", "whipping cream"],
+    "paneer": ["indian cottage cheese"],
+    "parmesan": ["parmesan cheese", "parmigiano reggiano"],
+    "mozzarella": ["mozzarella cheese"],
+    "olive oil": ["extra virgin olive oil", "evoo"],
+    "vegetable oil": ["cooking oil", "canola oil", "sunflower oil"],
+    "rice": ["white rice", "basmati rice", "jasmine rice"],
+    "flour": ["all purpose flour", "plain flour", "maida"],
+    "sugar": ["white sugar", "granulated sugar"],
+    "salt": ["sea salt", "kosher salt", "table salt"],
+    "black pepper": ["pepper", "black peppercorn"],
+    "cumin": ["cumin seed", "jeera"],
+    "turmeric": ["turmeric powder", "haldi"],
+    "lemon": ["lemon juice"],
+    "lime": ["lime juice"],
+    "basil": ["basil leaf", "sweet basil"],
+    "carrot": ["baby carrot"],
+    "mushroom": ["button mushroom", "white mushroom"],
+    "chicken breast": ["chicken breast fillet"],
+    "beef": ["beef mince"],
+}
+
+# Edit-distance matching only applies to names at least this long, so short
+# names such as "pea" and "pear" are never merged
+_FUZZY_MIN_LENGTH = 5
+_FUZZY_CUTOFF = 0.88
+# Fuzzy answers remembered per process; bounded because the names come from users
+_FUZZY_MEMO_SIZE = 4096
+
+
+class IngredientRegistry:
+    """
+    In-memory dictionary of canonical ingredients backed by the ingredients tables
+
+    Names are normalized (case, punctuation, preparation words, plurals) and
+    looked up in an alias hash, falling back to edit-distance similarity for
+    misspellings. Loaded lazily from the database on first use; ``resolve``
+    registers unseen names so every stored name gets an id.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._by_initial: Dict[str, List[str]] = {}
+        self._fuzzy = functools.lru_cache(maxsize=_FUZZY_MEMO_SIZE)(self._closest)
+
+    def load(self, conn) -> None:
+        """Load every ingredient and alias from a Session or Connection"""
+        names = conn.execute(select(Ingredient.id, Ingredient.name)).all()
+        aliases = conn.execute(select(IngredientAlias.alias, IngredientAlias.ingredient_id)).all()
+        with self._lock:
+            self._ids.clear()
+            self._names.clear()
+            self._by_initial.clear()
+            self._fuzzy.cache_clear()
+            for ingredient_id, name in names:
+                self._names[ingredient_id] = name
+            for alias, ingredient_id in aliases:
+                self._add_alias(alias, ingredient_id)
+            self._loaded = True
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Return the id of a known ingredient, or None, without writing anything"""
+        self._ensure_loaded()
+        return self._lookup(normalize_ingredient_name(name))
+
+    def canonical_name(self, name: str) -> str:
+        """The canonical name for a known ingredient, else the normalized name"""
+        self._ensure_loaded()
+        key = normalize_ingredient_name(name)
+        ingredient_id = self._lookup(key) if key else None
+        return self._names[ingredient_id] if ingredient_id is not None else key
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Return the id for a name, registering it as a new ingredient if unseen"""
+        return self.resolve_many([name])[0]
+
+    def resolve_many(self, names: Iterable[str]) -> List[Optional[int]]:
+        """Resolve several names, registering unseen ones in a single transaction
+
+        New ingredients are committed on their own connection, so an id stays
+        valid even if the caller's transaction later rolls back. Names that
+        normalize to nothing (such as "to taste") resolve to None.
+        """
+        self._ensure_loaded()
+        keys = [normalize_ingredient_name(name) for name in names]
+        missing = sorted({key for key in keys if key and self._lookup(key) is None})
+        if missing:
+            with session_scope() as db:
+                try:
+                    for key in missing:
+                        self.register(db, key)
+                    db.commit()
+                except IntegrityError:
+                    # Another worker registered some of these first
+                    db.rollback()
+                    self.load(db)
+                    for key in missing:
+                        if self._lookup(key) is None:
+                            self.register(db, key)
+                    db.commit()
+        return [self._lookup(key) if key else None for key in keys]
+
+    def register(self, conn, name: str) -> Optional[int]:
+        """Insert a new canonical ingredient using conn, without committing"""
+        key = normalize_ingredient_name(name)
+        if not key:
+            return None
+        existing = self._lookup(key)
+        if existing is not None:
+            return existing
+        ingredient_id = conn.execute(
+            insert(Ingredient).values(name=key, created_at=datetime.utcnow()).returning(Ingredient.id)
+        ).scalar_one()
+        conn.execute(insert(IngredientAlias).values(alias=key, ingredient_id=ingredient_id))
+        with self._lock:
+            self._names[ingredient_id] = key
+            self._add_alias(key, ingredient_id)
+        return ingredient_id
+
+    def add_alias(self, conn, alias: str, ingredient_id: int) -> None:
+        """Map another spelling to an existing ingredient, without committing"""
+        key = normalize_ingredient_name(alias)
+        if not key or key in self._ids:
+            return
+        conn.execute(insert(IngredientAlias).values(alias=key, ingredient_id=ingredient_id))
+        with self._lock:
+            self._add_alias(key, ingredient_id)
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            with session_scope() as db:
+                self.load(db)
+
+    def _lookup(self, key: str) -> Optional[int]:
+        ingredient_id = self._ids.get(key)
+        if ingredient_id is not None or len(key) < _FUZZY_MIN_LENGTH:
+            return ingredient_id
+        return self._fuzzy(key)
+
+    def _closest(self, key: str) -> Optional[int]:
+        """Edit-distance match among the spellings sharing the key's first letter"""
+        close = difflib.get_close_matches(
+            key, self._by_initial.get(key[0], []), n=1, cutoff=_FUZZY_CUTOFF
+        )
+        return self._ids[close[0]] if close else None
+
+    def _add_alias(self, key: str, ingredient_id: int) -> None:
+        self._ids[key] = ingredient_id
+        self._by_initial.setdefault(key[0], []).append(key)
+        # New spellings can change earlier fuzzy answers
+        self._fuzzy.cache_clear()
+
+
+def seed_ingredients(conn, registry: IngredientRegistry) -> None:
+    """Register the built-in canonical ingredients and aliases that are missing"""
+    for name, aliases in SEED_INGREDIENTS.items():
+        ingredient_id = registry.register(conn, name)
+        for alias in aliases:
+            registry.add_alias(conn, alias, ingredient_id)
+
+
+# Singleton instance
+ingredient_registry = IngredientRegistry()
@@ -0,0 +1,70 @@
+import difflib
+import re
+from typing import Dict, Iterable, Optional
+
+# Preparation words that don't change which pantry item an ingredient is
+_DESCRIPTORS = {
+    "fresh", "freshly", "chopped", "diced", "minced", "sliced", "grated", "ground",
+    "large", "medium", "small", "whole", "ripe", "raw", "boneless", "skinless",
+    "finely", "roughly", "peeled", "crushed", "dried", "frozen", "cooked", "to", "taste",
+    "of", "optional",
+}
+
+# Words naming a variety or grade of an item rather than a different item, so
+# "red onion" can share stock with "onion" while "coconut milk" and "milk" don't
+_VARIETIES = {
+    "red", "green", "yellow", "white", "baby", "vine", "salted", "unsalted",
+    "plain", "organic", "extra", "virgin", "lean", "button",
+}
+
+_NON_WORD = re.compile(r"[^a-z\s]")
+
+
+def singularize(word: str) -> str:
+    """Strip common English plural endings"""
+    if len(word) <= 3 or word.endswith("ss"):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("oes") or word.endswith(("ches", "shes", "xes", "sses")):
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def normalize_ingredient_name(name: str) -> str:
+    """Lower-case, drop punctuation and preparation words, and singularize"""
+    words = _NON_WORD.sub(" ", name.lower()).split()
+    words = [singularize(word) for word in words if word not in _DESCRIPTORS]
+    return " ".join(words)
+
+
+def match_ingredient(name: str, candidates: Iterable[str], cutoff: float = 0.85) -> Optional[str]:
+    """
+    Find the candidate that best matches an ingredient name
+
+    Both sides are compared normalized. Tries an exact match, then a shared
+    head noun whose other words differ only by variety ("red onion" vs
+    "onion", but not "black pepper" vs "bell pepper"), then edit-distance
+    similarity. Returns the original candidate string or None.
+    """
+    normalized: Dict[str, str] = {}
+    for candidate in candidates:
+        normalized.setdefault(normalize_ingredient_name(candidate), candidate)
+
+    target = normalize_ingredient_name(name)
+    if not target:
+        return None
+    if target in normalized:
+        return normalized[target]
+
+    words = target.split()
+    for key, candidate in normalized.items():
+        key_words = key.split()
+        if (key_words and key_words[-1] == words[-1]
+                and set(key_words[:-1]) ^ set(words[:-1]) <= _VARIETIES):
+            return candidate
+
+    close = difflib.get_close_matches(target, list(normalized), n=1, cutoff=cutoff)
+    return normalized[close[0]] if close else None
@@ -1,8 +1,43 @@
+import csv
+import io
+import json
+from datetime import datetime
+from sqlalchemy import and_, func, insert, or_, update
 from sqlalchemy.orm import Session
-from app.models.inventory import InventoryItem
-from app.schemas.inventory import InventoryItemCreate, InventoryItemUpdate, ExpiryAlert
-from datetime import date, timedelta
-from typing import List
+from app.models.inventory import InventoryItem, UnitType
+from app.schemas.inventory import (
+    InventoryItemCreate,
+    InventoryItemUpdate,
+    ExpiryAlert,
+    InventoryBulkItemResult
+)
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from app.services.pagination import keyset_paginate
+from app.services.expiry_service import ExpiryService
+from app.services.collection_versions import CollectionVersions, INVENTORY
+from app.services.ingredient_registry import ingredient_registry
+from app.services.units import COUNT, MASS, VOLUME, to_base_quantity
+
+# Optional columns that merging fills in when the stored row has no value
+_MERGED_COLUMNS = ("category", "expiry_date", "purchase_date", "notes")
+
+
+def _ingredient_key(ingredient_id: Optional[int], name: str) -> Any:
+    """Duplicate-detection key: the canonical id, or the trimmed lower-case name"""
+    return ingredient_id if ingredient_id is not None else name.strip().lower()
+
+
+def _merge_into(target: Dict[str, Any], values: Dict[str, Any]) -> None:
+    """Add quantities together, keep the earliest expiry and fill missing fields"""
+    target["quantity"] += values["quantity"]
+    for column in _MERGED_COLUMNS:
+        value = values.get(column)
+        if value is None:
+            continue
+        if target.get(column) is None:
+            target[column] = value
+        elif column == "expiry_date":
+            target[column] = min(target[column], value)
 
 
 class InventoryService:
@@ -11,17 +46,159 @@ class InventoryService:
     def create_item(db: Session, item: InventoryItemCreate) -> InventoryItem:
         """Create a new inventory item"""
         db_item = InventoryItem(**item.dict())
+        db_item.ingredient_id = ingredient_registry.resolve(db_item.name)
+        db_item.base_quantity, db_item.base_unit = to_base_quantity(db_item.quantity, db_item.unit)
         db.add(db_item)
+        db.flush()
+        ExpiryService.refresh_alerts(db, item_ids=[db_item.id])
+        CollectionVersions.bump(db, db_item.profile_id, INVENTORY)
         db.commit()
         db.refresh(db_item)
         return db_item
     
     @staticmethod
-    def get_items_by_profile(db: Session, profile_id: int) -> List[InventoryItem]:
-        """Get all inventory items for a profile"""
-        return db.query(InventoryItem).filter(
-            InventoryItem.profile_id == profile_id
-        ).all()
+    def bulk_upsert(
+        db: Session,
+        items: Sequence[Tuple[int, InventoryItemCreate]]
+    ) -> List[InventoryBulkItemResult]:
+        """
+        Insert or merge many inventory items in one transaction
+        
+        Items are keyed on (profile, canonical ingredient, unit), so "Tomatoes"
+        and "roma tomato" merge. Duplicates within the batch and rows already
+        in the pantry have their quantities added together; everything else is
+        written with a single bulk insert. Takes (row index, item) pairs and
+        returns one outcome per pair.
+        """
+        ingredient_ids = ingredient_registry.resolve_many(item.name for _, item in items)
+        merged: Dict[Tuple[int, Any, UnitType], Dict[str, Any]] = {}
+        row_keys = []
+        for (index, item), ingredient_id in zip(items, ingredient_ids):
+            key = (item.profile_id, _ingredient_key(ingredient_id, item.name), item.unit)
+            row_keys.append((index, key))
+            if key in merged:
+                _merge_into(merged[key], item.dict())
+            else:
+                merged[key] = {**item.dict(), "ingredient_id": ingredient_id}
+        
+        if not merged:
+            return []
+        
+        # One query finds every existing row that incoming items merge into
+        ids = {key[1] for key in merged if isinstance(key[1], int)}
+        names = {key[1] for key in merged if isinstance(key[1], str)}
+        existing_rows = db.query(InventoryItem).filter(
+            InventoryItem.profile_id.in_({key[0] for key in merged}),
+            or_(
+                InventoryItem.ingredient_id.in_(ids),
+                and_(
+                    InventoryItem.ingredient_id.is_(None),
+                    func.lower(func.trim(InventoryItem.name)).in_(names)
+                )
+            )
+        ).order_by(InventoryItem.id).all()
+        existing: Dict[Tuple[int, Any, UnitType], InventoryItem] = {}
+        for row in existing_rows:
+            key = (row.profile_id, _ingredient_key(row.ingredient_id, row.name), row.unit)
+            existing.setdefault(key, row)
+        
+        now = datetime.utcnow()
+        updates = []
+        inserts = []
+        for key, values in merged.items():
+            row = existing.get(key)
+            if row is None:
+                inserts.append((key, values))
+                continue
+            current = {column: getattr(row, column) for column in _MERGED_COLUMNS}
+            current["quantity"] = row.quantity
+            _merge_into(current, values)
+            current["base_quantity"], _ = to_base_quantity(current["quantity"], row.unit)
+            updates.append({"id": row.id, **current, "updated_at": now})
+        
+        # Bulk ORM statements bypass the identity map, so drop stale copies
+        for row in existing_rows:
+            db.expunge(row)
+        if updates:
+            db.execute(update(InventoryItem), updates)
+        
+        item_ids = {key: existing[key].id for key in existing if key in merged}
+        for _, values in inserts:
+            values["base_quantity"], values["base_unit"] = to_base_quantity(values["quantity"], values["unit"])
+        if inserts:
+            new_ids = db.scalars(
+                insert(InventoryItem).returning(InventoryItem.id, sort_by_parameter_order=True),
+                [{**values, "created_at": now, "updated_at": now} for _, values in inserts]
+            ).all()
+            item_ids.update(zip((key for key, _ in inserts), new_ids))
+        
+        ExpiryService.refresh_alerts(db, item_ids=item_ids.values())
+        CollectionVersions.bump(db, {key[0] for key in merged}, INVENTORY)
+        db.commit()
+        
+        results = []
+        first_seen = set()
+        for index, key in row_keys:
+            created = key not in existing and key not in first_seen
+            first_seen.add(key)
+            results.append(InventoryBulkItemResult(
+                index=index,
+                status="created" if created else "merged",
+                item_id=item_ids[key]
+            ))
+        return results
+    
+    @staticmethod
+    def parse_import(
+        body: bytes,
+        content_type: str,
+        profile_id: Optional[int] = None
+    ) -> Tuple[List[Tuple[int, InventoryItemCreate]], List[InventoryBulkItemResult]]:
+        """
+        Parse a CSV or NDJSON import into valid items and per-row errors
+        
+        CSV needs a header row naming InventoryItemCreate fields. profile_id
+        fills in rows that don't set their own.
+        """
+        text = body.decode("utf-8-sig")
+        if "csv" in content_type:
+            raw_rows = [
+                {key: value for key, value in row.items() if value not in (None, "")}
+                for row in csv.DictReader(io.StringIO(text))
+            ]
+        else:
+            raw_rows = []
+            for line in text.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    raw_rows.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    raw_rows.append(e)
+        
+        items = []
+        errors = []
+        for index, raw in enumerate(raw_rows):
+            try:
+                if isinstance(raw, Exception):
+                    raise ValueError(f"Invalid JSON: {raw}")
+                if profile_id is not None:
+                    raw.setdefault("profile_id", profile_id)
+                items.append((index, InventoryItemCreate.model_validate(raw)))
+            except (ValueError, TypeError, AttributeError) as e:
+                errors.append(InventoryBulkItemResult(index=index, status="invalid", error=str(e)))
+        return items, errors
+    
+    @staticmethod
+    def get_items_by_profile(
+        db: Session,
+        profile_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[InventoryItem], Optional[str]]:
+        """Get inventory items for a profile, newest first, and the next cursor"""
+        query = db.query(InventoryItem).filter(InventoryItem.profile_id == profile_id)
+        return keyset_paginate(query, InventoryItem, cursor, limit)
     
     @staticmethod
     def get_item_by_id(db: Session, item_id: int) -> InventoryItem:
@@ -38,7 +215,12 @@ class InventoryService:
         update_data = item_update.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_item, key, value)
+        if "name" in update_data:
+            db_item.ingredient_id = ingredient_registry.resolve(db_item.name)
+        db_item.base_quantity, db_item.base_unit = to_base_quantity(db_item.quantity, db_item.unit)
         
+        ExpiryService.refresh_alerts(db, item_ids=[db_item.id])
+        CollectionVersions.bump(db, db_item.profile_id, INVENTORY)
         db.commit()
         db.refresh(db_item)
         return db_item
@@ -50,46 +232,39 @@ class InventoryService:
         if not db_item:
             return False
         
+        ExpiryService.clear_item_alerts(db, [db_item.id])
         db.delete(db_item)
+        CollectionVersions.bump(db, db_item.profile_id, INVENTORY)
         db.commit()
         return True
     
     @staticmethod
     def get_expiry_alerts(db: Session, profile_id: int) -> List[ExpiryAlert]:
-        """Get expiry alerts for items that are expired or expiring soon"""
-        items = db.query(InventoryItem).filter(
-            InventoryItem.profile_id == profile_id,
-            InventoryItem.expiry_date.isnot(None)
-        ).all()
-        
-        today = date.today()
-        alerts = []
-        
-        for item in items:
-            days_until_expiry = (item.expiry_date - today).days
-            
-            if days_until_expiry < 0:
-                status = "expired"
-            elif days_until_expiry <= 3:
-                status = "expiring_soon"
-            elif days_until_expiry <= 7:
-                status = "expiring_this_week"
-            else:
-                continue  # Don't include items expiring later
-            
-            alerts.append(ExpiryAlert(
-                item=item,
-                days_until_expiry=days_until_expiry,
-                status=status
-            ))
+        """Get expiry alerts for items that are expired or expiring soon
         
-        return alerts
+        Alerts are materialized by ExpiryService on inventory writes and at
+        day rollover, so this only reads the expiry_alerts table.
+        """
+        return ExpiryService.get_alerts(db, profile_id)
     
     @staticmethod
-    def get_low_stock_items(db: Session, profile_id: int, threshold: float = 1.0) -> List[InventoryItem]:
-        """Get items that are running low on stock"""
+    def get_low_stock_items(
+        db: Session,
+        profile_id: int,
+        threshold: float = 1.0,
+        mass_threshold: float = 100.0,
+        volume_threshold: float = 100.0
+    ) -> List[InventoryItem]:
+        """Get items that are running low on stock
+        
+        Thresholds apply per dimension in base units: pieces, grams and
+        milliliters, so 2 kg of flour is never "low" next to 1 onion.
+        """
         return db.query(InventoryItem).filter(
             InventoryItem.profile_id == profile_id,
-            InventoryItem.quantity <= threshold
+            or_(
+                and_(InventoryItem.base_unit == COUNT, InventoryItem.base_quantity <= threshold),
+                and_(InventoryItem.base_unit == MASS, InventoryItem.base_quantity <= mass_threshold),
+                and_(InventoryItem.base_unit == VOLUME, InventoryItem.base_quantity <= volume_threshold)
+            )
         ).all()
-
@@ -0,0 +1,311 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class LLMError(Exception):
+    """Base class for recipe generation failures caused by the LLM"""
+
+
+class LLMTimeoutError(LLMError):
+    """The LLM did not answer within the per-call deadline"""
+
+
+class LLMUnavailableError(LLMError):
+    """The LLM can't be called right now: the circuit breaker is open or no provider is configured"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMUpstreamError(LLMError):
+    """The LLM returned an error"""
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class LLMResponseError(LLMError):
+    """The LLM answered, but not with a usable recipe"""
+
+
+class CircuitBreaker:
+    """
+    Opens when too many recent calls failed, and lets one probe through after a pause
+
+    Tracks the outcomes of the last ``window`` calls. Once at least
+    ``min_calls`` are recorded and the failure share reaches
+    ``failure_threshold``, calls are rejected for ``open_seconds``; then a
+    single probe call decides whether to close again or stay open. Outcomes
+    of calls that were already in flight when the breaker opened are ignored.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        min_calls: int = 10,
+        window: int = 20,
+        open_seconds: float = 30.0
+    ):
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.open_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> bool:
+        """Raise LLMUnavailableError unless a call may go ahead now
+
+        Returns True when the call is the half-open probe; pass that on to
+        record or release.
+        """
+        state = self.state
+        if state == "open":
+            retry_after = self.open_seconds - (time.monotonic() - self._opened_at)
+            raise LLMUnavailableError("Recipe generation is temporarily unavailable", retry_after)
+        if state == "half_open":
+            if self._probing:
+                raise LLMUnavailableError("Recipe generation is recovering", 1.0)
+            self._probing = True
+            return True
+        return False
+
+    def record(self, success: bool, probe: bool = False) -> None:
+        """Record the outcome of a call allowed by before_call"""
+        if self._opened_at is not None:
+            # Only the probe decides; calls started before the breaker opened don't count
+            if not probe:
+                return
+            self._probing = False
+            if success:
+                self._opened_at = None
+                self._outcomes.clear()
+            else:
+                self._opened_at = time.monotonic()
+                self.times_opened += 1
+            return
+
+        self._outcomes.append(success)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+            logger.warning("LLM circuit breaker opened (%d of %d recent calls failed)", failures, len(self._outcomes))
+
+    def release(self, probe: bool = False) -> None:
+        """Forget a call allowed by before_call that ended without an outcome"""
+        if probe:
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "open": state != "closed",
+            "recent_calls": len(self._outcomes),
+            "recent_failures": self._outcomes.count(False),
+            "times_opened": self.times_opened,
+        }
+
+
+class ResilientLLMClient:
+    """
+    Wraps an LLMProvider with deadlines, retries, a circuit breaker and
+    optional hedged requests
+
+    Retryable failures are retried with exponential backoff and full jitter.
+    timeout applies to each attempt (and to each chunk of a stream), not to
+    the whole call: with retries a caller can wait up to
+    (max_retries + 1) * timeout plus the backoff sleeps. When hedge_delay is
+    set and the first attempt hasn't answered by then, a second identical
+    request is started and whichever finishes first wins. max_concurrency
+    bounds the provider calls in flight; each attempt holds a slot (a stream
+    until it ends), never the backoff between attempts. Any provider can be
+    passed in, including a local fake or the stub.
+    """
+
+    def __init__(
+        self,
+        provider: Any,
+        timeout: float = 30.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        hedge_delay: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        self.provider = provider
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_delay = hedge_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.counters = {"calls": 0, "retries": 0, "timeouts": 0, "errors": 0, "hedges": 0, "hedge_wins": 0}
+
+    async def generate(self, prompt: str) -> Any:
+        """Call the provider, retrying retryable failures within the breaker's limits"""
+        response, _ = await self._with_retries(self._attempt, prompt)
+        return response
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[Any]:
+        """Stream chunks from the provider; the deadline applies to each chunk
+
+        Only opening the stream (up to its first chunk) is retried, and never
+        hedged, since chunks already yielded cannot be taken back. The
+        breaker sees one outcome per stream, once it ends.
+        """
+        # The opened stream holds a concurrency slot until it ends
+        (chunks, first), probe = await self._with_retries(self._open_stream, prompt, settle=False)
+        settled = False
+        try:
+            if first is not None:
+                yield first
+                while True:
+                    try:
+                        chunk = await self._guard(chunks.__anext__(), "LLM stream stalled for more than")
+                    except StopAsyncIteration:
+                        break
+                    except LLMError as e:
+                        settled = True
+                        self.breaker.record(not self._retryable(e), probe)
+                        raise
+                    yield chunk
+            settled = True
+            self.breaker.record(True, probe)
+        finally:
+            # Abandoned by the consumer: no outcome to record
+            if not settled:
+                self.breaker.release(probe)
+            self._release_slot()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "breaker": self.breaker.stats()}
+
+    async def _with_retries(self, call, prompt: str, settle: bool = True) -> Tuple[Any, bool]:
+        """Return the response and whether it came from the half-open probe
+
+        With settle=False, success is left for the caller to record.
+        """
+        for attempt in range(self.max_retries + 1):
+            probe = self.breaker.before_call()
+            self.counters["calls"] += 1
+            try:
+                response = await call(prompt)
+            except LLMError as e:
+                retryable = self._retryable(e)
+                # Rejected requests show the upstream is reachable, so only
+                # retryable failures count against the breaker
+                self.breaker.record(not retryable, probe)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                self.counters["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            except BaseException:
+                # Cancelled by the caller: no outcome to record
+                self.breaker.release(probe)
+                raise
+            if settle:
+                self.breaker.record(True, probe)
+            return response, probe
+
+    async def _attempt(self, prompt: str) -> Any:
+        if not self.hedge_delay:
+            return await self._call(prompt)
+
+        primary = asyncio.ensure_future(self._call(prompt))
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay)
+            if done:
+                return primary.result()
+
+            self.counters["hedges"] += 1
+            hedge = asyncio.ensure_future(self._call(prompt))
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Every finished task's exception is retrieved, even when the other one won
+                winner = None
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                    else:
+                        error = task.exception()
+                if winner is not None:
+                    if winner is hedge:
+                        self.counters["hedge_wins"] += 1
+                    return winner.result()
+            raise error
+        finally:
+            # Also reached when the caller is cancelled, so no attempt outlives it
+            for task in pending:
+                task.cancel()
+
+    async def _call(self, prompt: str) -> Any:
+        async with self._slots or nullcontext():
+            return await self._guard(self.provider.generate(prompt), "LLM did not respond within")
+
+    async def _open_stream(self, prompt: str) -> Tuple[AsyncIterator[Any], Any]:
+        """Start a stream and read its first chunk; once it opens, the caller releases the slot"""
+        if self._slots:
+            await self._slots.acquire()
+        try:
+            chunks = self.provider.generate_stream(prompt).__aiter__()
+            try:
+                first = await self._guard(chunks.__anext__(), "LLM stream did not start within")
+            except StopAsyncIteration:
+                first = None
+        except BaseException:
+            self._release_slot()
+            raise
+        return chunks, first
+
+    def _release_slot(self) -> None:
+        if self._slots:
+            self._slots.release()
+
+    async def _guard(self, awaitable, timeout_message: str) -> Any:
+        """Await under the deadline, turning failures into LLMError subclasses"""
+        try:
+            return await asyncio.wait_for(awaitable, self.timeout)
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise LLMTimeoutError(f"{timeout_message} {self.timeout:g}s")
+        except StopAsyncIteration:
+            raise
+        except LLMError:
+            self.counters["errors"] += 1
+            raise
+        except Exception as e:
+            self.counters["errors"] += 1
+            raise LLMUpstreamError(f"LLM request failed: {e}", retryable=isinstance(e, OSError)) from e
+
+    @staticmethod
+    def _retryable(error: LLMError) -> bool:
+        return isinstance(error, LLMTimeoutError) or getattr(error, "retryable", False)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: anywhere between zero and the exponential cap
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+from typing import Any, AsyncIterator, Optional
+from app.services.llm_client import LLMResponseError, LLMUnavailableError, LLMUpstreamError
+from app.services.prompt_builder import SYSTEM_INSTRUCTION
+from app.services.recipe_parser import RECIPE_RESPONSE_SCHEMA
+
+
+class LLMResponse:
+    """Text produced by a provider, with the billed prompt tokens when known"""
+
+    __slots__ = ("text", "prompt_tokens")
+
+    def __init__(self, text: str, prompt_tokens: Optional[int] = None):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+
+
+class LLMProvider:
+    """
+    Interface for the model behind recipe generation
+
+    Providers turn a prompt into text and raise LLMError subclasses on
+    failure, marking LLMUpstreamError as retryable where a retry could help.
+    Deadlines, retries and the circuit breaker live in ResilientLLMClient.
+    """
+
+    name = "base"
+
+    async def generate(self, prompt: str) -> LLMResponse:
+        raise NotImplementedError
+
+    def generate_stream(self, prompt: str) -> AsyncIterator[LLMResponse]:
+        """Yield the response in chunks; the last chunk carries prompt_tokens"""
+        raise NotImplementedError
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini, configured lazily on the first call"""
+
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str], model_name: str = "gemini-2.5-flash"):
+        self.api_key = api_key
+        self.model_name = model_name
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            if not self.api_key:
+                raise LLMUnavailableError("Recipe generation is not configured (GEMINI_API_KEY is not set)")
+            # Imported here so the SDK's import cost is only paid when Gemini is used
+            import google.generativeai as genai
+
+            genai.configure(api_key=self.api_key)
+            # The fixed recipe template is sent once as the system instruction
+            # rather than in every prompt, and responses are constrained to
+            # JSON matching the recipe schema
+            self._model = genai.GenerativeModel(
+                self.model_name,
+                system_instruction=SYSTEM_INSTRUCTION,
+                generation_config=genai.GenerationConfig(
+                    response_mime_type="application/json",
+                    response_schema=RECIPE_RESPONSE_SCHEMA
+                )
+            )
+        return self._model
+
+    async def generate(self, prompt: str) -> LLMResponse:
+        model = self.model
+        try:
+            response = await model.generate_content_async(prompt)
+        except Exception as e:
+            raise self._translate(e) from e
+        return LLMResponse(self._text(response), self._prompt_tokens(response))
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[LLMResponse]:
+        model = self.model
+        try:
+            response = await model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                # Usage metadata arrives with the final chunk
+                yield LLMResponse(self._text(chunk), self._prompt_tokens(chunk))
+        except LLMResponseError:
+            raise
+        except Exception as e:
+            raise self._translate(e) from e
+
+    @staticmethod
+    def _text(response: Any) -> str:
+        # Blocked or empty candidates raise ValueError in the SDK
+        try:
+            return response.text
+        except ValueError as e:
+            raise LLMResponseError(f"Gemini returned no usable text: {e}") from e
+
+    @staticmethod
+    def _prompt_tokens(response: Any) -> Optional[int]:
+        return getattr(getattr(response, "usage_metadata", None), "prompt_token_count", None) or None
+
+    @staticmethod
+    def _translate(error: Exception) -> LLMUpstreamError:
+        from google.api_core import exceptions as google_exceptions
+
+        # Throttling, overload and server-side failures are worth retrying
+        retryable = isinstance(error, (
+            google_exceptions.TooManyRequests,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.InternalServerError,
+            google_exceptions.GatewayTimeout,
+            google_exceptions.DeadlineExceeded,
+            ConnectionError,
+        ))
+        return LLMUpstreamError(f"Gemini request failed: {error}", retryable=retryable)
+
+
+def _latency_sampler(spec: str, rng: random.Random):
+    """
+    Build a latency sampler from a spec string, in seconds
+
+    "fixed:<s>", "uniform:<low>:<high>", "normal:<mean>:<stddev>" or
+    "lognormal:<median>:<sigma>" (a heavy right tail, like real LLM latency).
+    """
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class StubProvider(LLMProvider):
+    """
+    Local provider returning realistic synthetic recipes, for development and load tests
+
+    The recipe is derived deterministically from the prompt, using the listed
+    ingredients, so equal prompts give equal recipes. Latency is drawn from a
+    configurable distribution and a share of calls can fail with a retryable
+    error to exercise retries and the circuit breaker.
+    """
+
+    name = "stub"
+
+    _STYLES = ["Skillet", "Bake", "Stir-Fry", "Curry", "Salad", "Soup", "Tacos", "Risotto"]
+    _CUISINES = ["Indian", "Italian", "Mexican", "Thai", "Mediterranean", "Japanese"]
+    _UNITS = ["g", "ml", "piece", "cup", "tbsp", "tsp"]
+
+    def __init__(
+        self,
+        latency: str = "lognormal:0.8:0.35",
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        chunk_size: int = 48
+    ):
+        self._rng = random.Random(seed)
+        self._latency = _latency_sampler(latency, self._rng)
+        self.error_rate = error_rate
+        self.chunk_size = chunk_size
+
+    async def generate(self, prompt: str) -> LLMResponse:
+        await asyncio.sleep(self._latency())
+        self._maybe_fail()
+        return LLMResponse(self._recipe_json(prompt), self._prompt_tokens(prompt))
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[LLMResponse]:
+        latency = self._latency()
+        self._maybe_fail()
+        text = self._recipe_json(prompt)
+        chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        # About a third of the time goes to the first chunk, the rest is spread evenly
+        await asyncio.sleep(latency / 3)
+        for index, chunk in enumerate(chunks):
+            if index:
+                await asyncio.sleep(latency * 2 / 3 / len(chunks))
+            last = index == len(chunks) - 1
+            yield LLMResponse(chunk, self._prompt_tokens(prompt) if last else None)
+
+    def _maybe_fail(self) -> None:
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise LLMUpstreamError("Stub provider simulated an upstream error", retryable=True)
+
+    @staticmethod
+    def _prompt_tokens(prompt: str) -> int:
+        return (len(SYSTEM_INSTRUCTION) + len(prompt) + 3) // 4
+
+    def _recipe_json(self, prompt: str) -> str:
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+        fields = {}
+        for line in prompt.splitlines():
+            key, _, value = line.partition(":")
+            fields[key.strip().lower()] = value.strip()
+        names = [name.strip() for name in fields.get("ingredients", "").split(",") if name.strip()]
+        names = rng.sample(names, min(len(names), rng.randint(3, 8))) or ["rice", "onion", "garlic"]
+
+        max_time = int(fields.get("max time", "60 min").split()[0] or 60)
+        steps = [f"{i}. {rng.choice(['Prepare', 'Chop', 'Heat', 'Add', 'Simmer', 'Season'])} the {name}."
+                 for i, name in enumerate(names, 1)]
+        steps.append(f"{len(steps) + 1}. Serve warm.")
+        recipe = {
+            "title": f"{names[0].title()} {rng.choice(self._STYLES)}",
+            "cuisine_type": fields.get("cuisine") or rng.choice(self._CUISINES),
+            "cooking_time": rng.randint(10, max(10, max_time)),
+            "difficulty": rng.choice(["easy", "medium", "hard"]),
+            "servings": int(fields.get("servings") or 2),
+            "ingredients": [
+                {"name": name, "quantity": str(rng.choice([1, 2, 100, 200, 250])), "unit": rng.choice(self._UNITS)}
+                for name in names
+            ],
+            "instructions": "\n".join(steps),
+            "utensils_required": ["pan", "knife"],
+            "nutritional_info": {
+                "calories": str(rng.randint(250, 800)),
+                "protein": f"{rng.randint(5, 40)}g",
+                "carbs": f"{rng.randint(10, 90)}g",
+                "fat": f"{rng.randint(5, 35)}g",
+            },
+        }
+        return json.dumps(recipe)
+
+
+def create_provider(settings) -> LLMProvider:
+    """Build the provider named by settings.llm_provider"""
+    if settings.llm_provider == "stub":
+        return StubProvider(
+            latency=settings.llm_stub_latency,
+            error_rate=settings.llm_stub_error_rate,
+            seed=settings.llm_stub_seed
+        )
+    if settings.llm_provider == "gemini":
+        return GeminiProvider(settings.gemini_api_key, settings.gemini_model)
+    raise ValueError(f"Unknown LLM provider: {settings.llm_provider}")
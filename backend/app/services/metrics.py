@@ -0,0 +1,285 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        '%s="%s"' % (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{%s}" % ",".join(pairs) if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # Per label set: a count per bucket (plus +Inf), the sum and the count
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames, key, 'le="%s"' % _format_value(bound))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metrics exposed in the Prometheus text format on /metrics
+
+    Besides counters and histograms, existing stats dicts (recipe cache,
+    expiry scanner, LLM client) are registered as callables and exported as
+    gauges when scraped: numbers and booleans are kept, nested dicts are
+    flattened into the metric name and other values are skipped.
+    """
+
+    def __init__(self, namespace: str = "cookgenie"):
+        self.namespace = namespace
+        self._metrics: List[Any] = []
+        self._stats: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(f"{self.namespace}_{name}", documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(f"{self.namespace}_{name}", documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_stats(self, prefix: str, source: Callable[[], Dict[str, Any]]) -> None:
+        """Export the numeric values of a stats dict, read at scrape time"""
+        self._stats.append((f"{self.namespace}_{prefix}", source))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for prefix, source in self._stats:
+            for name, value in self._flatten(prefix, source()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def _flatten(cls, prefix: str, stats: Dict[str, Any]) -> Iterator[Tuple[str, float]]:
+        for key, value in stats.items():
+            name = f"{prefix}_{key}"
+            if isinstance(value, dict):
+                yield from cls._flatten(name, value)
+            elif isinstance(value, (bool, int, float)):
+                yield name, float(value)
+
+
+metrics = MetricsRegistry()
+
+REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "Time to handle a request, by route", ("method", "route", "status")
+)
+REQUEST_DB_STATEMENTS = metrics.histogram(
+    "http_request_db_statements", "SQL statements executed per request", ("method", "route"), COUNT_BUCKETS
+)
+REQUEST_DB_SECONDS = metrics.histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request", ("method", "route")
+)
+DB_STATEMENTS = metrics.counter("db_statements_total", "SQL statements executed, inside or outside requests")
+SPAN_SECONDS = metrics.histogram("span_duration_seconds", "Time spent in instrumented steps", ("span",))
+
+
+class RequestTimings:
+    """Timings collected while handling one request"""
+
+    __slots__ = ("started", "db_statements", "db_seconds", "spans")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_statements = 0
+        self.db_seconds = 0.0
+        # Span name -> [total seconds, count]
+        self.spans: Dict[str, List[float]] = {}
+
+    def add_span(self, name: str, seconds: float) -> None:
+        totals = self.spans.setdefault(name, [0.0, 0])
+        totals[0] += seconds
+        totals[1] += 1
+
+    def server_timing(self) -> str:
+        """The Server-Timing header value for everything recorded so far"""
+        entries = [
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_statements} statements"',
+        ]
+        for name, (seconds, count) in self.spans.items():
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if count > 1:
+                entry += f';desc="{count} calls"'
+            entries.append(entry)
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a step, adding it to the span histogram and the current request's timings"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        SPAN_SECONDS.observe(elapsed, span=name)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add_span(name, elapsed)
+
+
+def instrument_engine(engine) -> None:
+    """Count and time every SQL statement run through engine
+
+    Statements are attributed to the request whose context issued them; this
+    includes work done in the threadpool, which copies the request's context.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["statement_started"].pop()
+        DB_STATEMENTS.inc()
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.db_statements += 1
+            timings.db_seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("statement_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency and database work for each request
+
+    Routes are labelled by their path template (``/api/recipes/{recipe_id}``)
+    so ids don't multiply the series. When server_timing is set, a
+    Server-Timing header with the database time and spans is added to each
+    response; for streamed responses it covers only the work done before the
+    first byte.
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - timings.started, method=method, route=route, status=status
+            )
+            REQUEST_DB_STATEMENTS.observe(timings.db_statements, method=method, route=route)
+            REQUEST_DB_SECONDS.observe(timings.db_seconds, method=method, route=route)
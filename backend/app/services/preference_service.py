@@ -1,7 +1,15 @@
 from sqlalchemy.orm import Session
 from app.models.preference import UserPreference
 from app.schemas.preference import UserPreferenceCreate, UserPreferenceUpdate
-from typing import Optional
+from app.services.ingredient_registry import ingredient_registry
+from app.services.collection_versions import CollectionVersions, PREFERENCES
+from typing import List, Optional
+
+
+def _disliked_ids(names: Optional[List[str]]) -> List[int]:
+    """Canonical ingredient ids for a list of disliked ingredient names"""
+    ids = ingredient_registry.resolve_many(names or [])
+    return sorted({ingredient_id for ingredient_id in ids if ingredient_id is not None})
 
 
 class PreferenceService:
@@ -10,7 +18,9 @@ class PreferenceService:
     def create_preference(db: Session, preference: UserPreferenceCreate) -> UserPreference:
         """Create user preferences"""
         db_preference = UserPreference(**preference.dict())
+        db_preference.disliked_ingredient_ids = _disliked_ids(preference.disliked_ingredients)
         db.add(db_preference)
+        CollectionVersions.bump(db, db_preference.profile_id, PREFERENCES)
         db.commit()
         db.refresh(db_preference)
         return db_preference
@@ -35,7 +45,10 @@ class PreferenceService:
         update_data = preference_update.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_preference, key, value)
+        if "disliked_ingredients" in update_data:
+            db_preference.disliked_ingredient_ids = _disliked_ids(db_preference.disliked_ingredients)
         
+        CollectionVersions.bump(db, profile_id, PREFERENCES)
         db.commit()
         db.refresh(db_preference)
         return db_preference
@@ -51,6 +64,7 @@ class PreferenceService:
             return False
         
         db.delete(db_preference)
+        CollectionVersions.bump(db, profile_id, PREFERENCES)
         db.commit()
         return True
 
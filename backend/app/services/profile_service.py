@@ -1,8 +1,22 @@
+import logging
+from sqlalchemy import delete, or_, select
 from sqlalchemy.orm import Session
+from app.database import session_scope
 from app.models.profile import Profile
+from app.models.expiry_alert import ExpiryAlertEntry
+from app.models.inventory import InventoryItem
+from app.models.preference import UserPreference
+from app.models.recipe import Recipe, RecipeFavorite
+from app.services.collection_versions import (
+    CollectionVersions, FAVORITES, INVENTORY, PREFERENCES, RECIPES
+)
+from app.services.recipe_index import recipe_index
+from app.services.recipe_search import RecipeSearch
 from app.schemas.profile import ProfileCreate, ProfileUpdate
 from typing import List, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class ProfileService:
     
@@ -47,12 +61,51 @@ class ProfileService:
     
     @staticmethod
     def delete_profile(db: Session, profile_id: int) -> bool:
-        """Delete a profile"""
-        db_profile = db.query(Profile).filter(Profile.id == profile_id).first()
-        if not db_profile:
+        """Delete a profile and everything that belongs to it
+        
+        Children are removed with one set-based DELETE per table, in foreign
+        key order, instead of loading them through the ORM cascade, so the
+        statement count is the same however much data the profile has.
+        """
+        exists = db.scalar(select(Profile.id).where(Profile.id == profile_id))
+        if exists is None:
             return False
         
-        db.delete(db_profile)
+        own_recipes = select(Recipe.id).where(Recipe.profile_id == profile_id)
+        # Other profiles lose their favourites of this profile's recipes
+        favorited_by = db.scalars(
+            select(RecipeFavorite.profile_id).where(
+                RecipeFavorite.recipe_id.in_(own_recipes),
+                RecipeFavorite.profile_id != profile_id
+            ).distinct()
+        ).all()
+        
+        db.execute(delete(ExpiryAlertEntry).where(ExpiryAlertEntry.profile_id == profile_id))
+        db.execute(delete(RecipeFavorite).where(or_(
+            RecipeFavorite.profile_id == profile_id,
+            RecipeFavorite.recipe_id.in_(own_recipes)
+        )))
+        RecipeSearch.remove_profile(db, profile_id)
+        db.execute(delete(Recipe).where(Recipe.profile_id == profile_id))
+        db.execute(delete(InventoryItem).where(InventoryItem.profile_id == profile_id))
+        db.execute(delete(UserPreference).where(UserPreference.profile_id == profile_id))
+        # Versions are bumped rather than dropped, so a reused profile id can't
+        # revalidate another profile's cached responses
+        CollectionVersions.bump(db, profile_id, INVENTORY, RECIPES, FAVORITES, PREFERENCES)
+        CollectionVersions.bump(db, favorited_by, FAVORITES)
+        db.execute(delete(Profile).where(Profile.id == profile_id))
         db.commit()
+        # Bulk statements bypass the identity map
+        db.expire_all()
+        recipe_index.remove_profile(profile_id)
         return True
+    
+    @staticmethod
+    def delete_profile_in_background(profile_id: int) -> None:
+        """Delete a profile in its own session, for use as a background task"""
+        try:
+            with session_scope() as db:
+                ProfileService.delete_profile(db, profile_id)
+        except Exception:
+            logger.exception("Background deletion of profile %d failed", profile_id)
 
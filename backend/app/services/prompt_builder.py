@@ -0,0 +1,148 @@
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.ingredient_registry import ingredient_registry
+
+# Fixed instructions sent once as the model's system instruction instead of in every prompt
+SYSTEM_INSTRUCTION = """You are a professional chef assistant. Generate one detailed recipe from the user's criteria.
+
+Respond with a single JSON recipe. Write instructions as numbered steps, one per line.
+
+The recipe must:
+1. Use primarily the available ingredients, preferring those listed first (they expire soonest)
+2. Be practical and delicious
+3. Include clear, numbered steps
+4. Respect all dietary preferences and never use excluded ingredients
+5. Be possible with the available tools
+6. Fit within the time limit
+
+Salt, black pepper, cooking oil, sugar and water are always available even when not listed."""
+
+# Canonical names the system instruction already assumes, so they are never listed
+STAPLES = {"salt", "black pepper", "vegetable oil", "olive oil", "sugar", "water"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) used for budgeting"""
+    return (len(text) + 3) // 4
+
+
+def select_ingredients(
+    ingredients: List[str],
+    budget: int,
+    max_ingredients: int
+) -> Tuple[List[str], int]:
+    """
+    Pick the ingredients to list in a prompt
+
+    Keeps the caller's order (inventory is loaded soonest-expiring first),
+    drops staples and spellings of an ingredient already listed, and stops at
+    max_ingredients or once the listed names would exceed budget tokens.
+    Returns the chosen names and how many were left out.
+    """
+    chosen: List[str] = []
+    seen = set()
+    used = 0
+    for name in ingredients:
+        name = name.strip()
+        canonical = ingredient_registry.canonical_name(name) if name else ""
+        if not canonical or canonical in seen or canonical in STAPLES:
+            continue
+        cost = estimate_tokens(name + ", ")
+        if len(chosen) >= max_ingredients or used + cost > budget:
+            break
+        seen.add(canonical)
+        chosen.append(name)
+        used += cost
+    return chosen, len(ingredients) - len(chosen)
+
+
+def _requirements(
+    cuisine_type: Optional[str],
+    max_cooking_time: Optional[int],
+    dietary_preferences: Optional[List[str]],
+    available_utensils: Optional[List[str]],
+    servings: int,
+    disliked_ingredients: Optional[List[str]],
+    variant: Optional[int]
+) -> str:
+    """The requirement lines of the prompt, which are never truncated"""
+    lines = [f"Servings: {servings}"]
+    if cuisine_type:
+        lines.append(f"Cuisine: {cuisine_type}")
+    if max_cooking_time:
+        lines.append(f"Max time: {max_cooking_time} min")
+    if dietary_preferences:
+        lines.append(f"Diet: {', '.join(dietary_preferences)}")
+    if available_utensils:
+        lines.append(f"Tools: {', '.join(available_utensils)}")
+    if disliked_ingredients:
+        lines.append(f"Exclude: {', '.join(disliked_ingredients)}")
+    if variant:
+        lines.append(f"Variation #{variant}: make it clearly different from other variations")
+    return "\n".join(lines)
+
+
+def _select_for_prompt(
+    ingredients: List[str],
+    requirements: str,
+    token_budget: int,
+    max_ingredients: int
+) -> Tuple[List[str], int]:
+    """Select ingredients to fill whatever budget the requirements leave"""
+    return select_ingredients(
+        ingredients,
+        budget=max(token_budget - estimate_tokens(requirements) - 4, 0),
+        max_ingredients=max_ingredients
+    )
+
+
+def prompt_ingredients(
+    ingredients: List[str],
+    cuisine_type: Optional[str] = None,
+    max_cooking_time: Optional[int] = None,
+    dietary_preferences: Optional[List[str]] = None,
+    available_utensils: Optional[List[str]] = None,
+    servings: int = 2,
+    disliked_ingredients: Optional[List[str]] = None,
+    variant: Optional[int] = None,
+    token_budget: int = 400,
+    max_ingredients: int = 40
+) -> List[str]:
+    """Canonical names of the ingredients build_recipe_prompt lists for these inputs, in prompt order"""
+    requirements = _requirements(
+        cuisine_type, max_cooking_time, dietary_preferences, available_utensils,
+        servings, disliked_ingredients, variant
+    )
+    listed, _ = _select_for_prompt(ingredients, requirements, token_budget, max_ingredients)
+    return [ingredient_registry.canonical_name(name) for name in listed]
+
+
+def build_recipe_prompt(
+    ingredients: List[str],
+    cuisine_type: Optional[str],
+    max_cooking_time: Optional[int],
+    dietary_preferences: Optional[List[str]],
+    available_utensils: Optional[List[str]],
+    servings: int,
+    disliked_ingredients: Optional[List[str]],
+    variant: Optional[int] = None,
+    token_budget: int = 400,
+    max_ingredients: int = 40
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the per-request part of the recipe prompt within a token budget
+
+    Requirements are always included; ingredients fill whatever budget is left.
+    Returns the prompt and its stats (estimated tokens, ingredients listed and
+    dropped).
+    """
+    requirements = _requirements(
+        cuisine_type, max_cooking_time, dietary_preferences, available_utensils,
+        servings, disliked_ingredients, variant
+    )
+    listed, dropped = _select_for_prompt(ingredients, requirements, token_budget, max_ingredients)
+    prompt = f"Ingredients: {', '.join(listed)}\n{requirements}"
+    return prompt, {
+        "estimated_prompt_tokens": estimate_tokens(prompt),
+        "ingredients_listed": len(listed),
+        "ingredients_dropped": dropped,
+    }
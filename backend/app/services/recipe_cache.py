@@ -0,0 +1,247 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from app.config import get_settings
+from app.services.ingredient_registry import ingredient_registry
+from app.services.prompt_builder import prompt_ingredients
+
+settings = get_settings()
+
+
+def _normalize_list(values: Optional[List[str]]) -> List[str]:
+    """Case-fold, trim, de-duplicate and sort a list of free-form strings"""
+    if not values:
+        return []
+    return sorted({value.strip().casefold() for value in values if value and value.strip()})
+
+
+def _canonical_ingredients(names: Optional[List[str]]) -> List[str]:
+    """Map ingredient names to sorted canonical names, so spellings share a key"""
+    canonical = {ingredient_registry.canonical_name(name) for name in names or [] if name}
+    return sorted(canonical - {""})
+
+
+def build_cache_key(
+    ingredients: List[str],
+    cuisine_type: Optional[str] = None,
+    max_cooking_time: Optional[int] = None,
+    dietary_preferences: Optional[List[str]] = None,
+    available_utensils: Optional[List[str]] = None,
+    servings: Optional[int] = 2,
+    disliked_ingredients: Optional[List[str]] = None,
+    variant: Optional[int] = None
+) -> str:
+    """Build a content-addressed key from the inputs the recipe prompt consumes
+
+    Ingredients are keyed as the prompt lists them: canonical names in the
+    caller's order, after staples and anything over the prompt budget are
+    dropped. Resolving names may load the ingredient registry from the
+    database, so async callers run this in the threadpool.
+    """
+    listed = prompt_ingredients(
+        ingredients,
+        cuisine_type=cuisine_type,
+        max_cooking_time=max_cooking_time,
+        dietary_preferences=dietary_preferences,
+        available_utensils=available_utensils,
+        servings=servings,
+        disliked_ingredients=disliked_ingredients,
+        variant=variant,
+        token_budget=settings.llm_prompt_token_budget,
+        max_ingredients=settings.llm_prompt_max_ingredients
+    )
+    canonical = {
+        "ingredients": listed,
+        "cuisine_type": cuisine_type.strip().casefold() if cuisine_type else None,
+        "max_cooking_time": max_cooking_time,
+        "dietary_preferences": _normalize_list(dietary_preferences),
+        "available_utensils": _normalize_list(available_utensils),
+        "servings": servings,
+        "disliked_ingredients": _canonical_ingredients(disliked_ingredients),
+    }
+    if variant is not None:
+        canonical["variant"] = variant
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RecipeCacheBackend:
+    """Storage interface for cached recipe payloads"""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class InMemoryRecipeCache(RecipeCacheBackend):
+    """Per-process LRU cache with a TTL on every entry"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteRecipeCache(RecipeCacheBackend):
+    """Cache stored in a SQLite table so it can be shared between worker processes
+
+    The file is opened and its table created on first use, not on import.
+    Callers hold the lock while using the connection.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._connection is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS recipe_cache ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_recipe_cache_last_used ON recipe_cache (last_used)"
+            )
+            self._connection = conn
+        return self._connection
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM recipe_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM recipe_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE recipe_cache SET last_used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recipe_cache (key, payload, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl_seconds, now)
+            )
+            # Evict expired entries, then least recently used ones beyond capacity
+            self._conn.execute("DELETE FROM recipe_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM recipe_cache WHERE key IN ("
+                "SELECT key FROM recipe_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM recipe_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM recipe_cache").fetchone()[0]
+
+
+class RecipeCache:
+    """Recipe cache front-end that tracks hit and miss counts"""
+
+    def __init__(self, backend: Optional[RecipeCacheBackend]):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.backend is None:
+            return None
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": settings.recipe_cache_backend,
+            "entries": len(self.backend) if self.backend is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _create_backend() -> Optional[RecipeCacheBackend]:
+    """Instantiate the backend selected in settings"""
+    backend = settings.recipe_cache_backend.lower()
+    if backend == "memory":
+        return InMemoryRecipeCache(settings.recipe_cache_max_entries, settings.recipe_cache_ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteRecipeCache(
+            settings.recipe_cache_sqlite_path,
+            settings.recipe_cache_max_entries,
+            settings.recipe_cache_ttl_seconds
+        )
+    if backend == "none":
+        return None
+    raise ValueError(f"Unknown recipe cache backend: {settings.recipe_cache_backend}")
+
+
+# Singleton instance
+recipe_cache = RecipeCache(_create_backend())
@@ -0,0 +1,246 @@
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from app.models.recipe import Recipe
+from app.services.ingredient_registry import ingredient_registry
+from app.services.ingredients import normalize_ingredient_name
+
+# Bit-sliced counters hold up to 2**_COUNTER_BITS - 1 matched ingredients per recipe
+_COUNTER_BITS = 6
+_MAX_TOKENS = 2 ** _COUNTER_BITS - 1
+
+
+def ingredient_tokens(ingredients: Iterable) -> Set[Hashable]:
+    """Ingredient keys for a recipe's ingredient list, a list of names or of ids
+
+    Keys are canonical ingredient ids, taken from a stored ``ingredient_id``
+    or looked up in the registry; names the registry doesn't know fall back to
+    their normalized string.
+    """
+    tokens = set()
+    for ingredient in ingredients or []:
+        if isinstance(ingredient, int):
+            tokens.add(ingredient)
+            continue
+        if isinstance(ingredient, dict):
+            if ingredient.get("ingredient_id") is not None:
+                tokens.add(ingredient["ingredient_id"])
+                continue
+            ingredient = ingredient.get("name", "")
+        name = normalize_ingredient_name(str(ingredient))
+        if name:
+            ingredient_id = ingredient_registry.lookup(str(ingredient))
+            tokens.add(ingredient_id if ingredient_id is not None else name)
+    return tokens
+
+
+class RecipeIndexNotReadyError(Exception):
+    """The index is still being built, so recipes can't be matched yet"""
+
+
+def _limit(tokens: Set[Hashable]) -> frozenset:
+    """Keep at most _MAX_TOKENS tokens, chosen deterministically"""
+    if len(tokens) <= _MAX_TOKENS:
+        return frozenset(tokens)
+    return frozenset(sorted(tokens, key=str)[:_MAX_TOKENS])
+
+
+def _bits(mask: int) -> Iterable[int]:
+    """Yield the positions of the set bits in mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class RecipeIndex:
+    """
+    In-memory inverted index from ingredient tokens to stored recipes
+
+    Each recipe occupies a slot; every posting list, profile and cooking-time
+    filter is a Python int used as a bitset over slots. Matching adds the
+    posting bitsets of the pantry tokens into bit-sliced counters, so the cost
+    grows with the number of pantry tokens rather than the number of postings,
+    and only the winning slots are ever decoded.
+
+    The index is per process: it is built once at startup and kept current
+    by RecipeService on insert and delete in this worker. ``ready`` stays
+    False until the build finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.ready = False
+        self._postings: Dict[Hashable, int] = {}
+        self._by_profile: Dict[int, int] = {}
+        self._by_cooking_time: Dict[Optional[int], int] = {}
+        self._by_size: Dict[int, int] = {}
+        self._slots: Dict[int, int] = {}
+        self._slot_recipes: List[Optional[Tuple[int, int, Optional[int], frozenset]]] = []
+        self._free_slots: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def build(self, db: Session) -> None:
+        """(Re)build the index from every stored recipe"""
+        rows = db.query(
+            Recipe.id, Recipe.profile_id, Recipe.cooking_time, Recipe.ingredients
+        ).yield_per(1000)
+        with self._lock:
+            self._reset()
+            # Collect slot lists first and turn each into a bitset once, rather
+            # than re-allocating a growing int for every recipe
+            slot_lists: Tuple[Dict, ...] = ({}, {}, {}, {})
+            for recipe_id, profile_id, cooking_time, ingredients in rows:
+                tokens = _limit(ingredient_tokens(ingredients))
+                if not tokens:
+                    continue
+                slot = len(self._slot_recipes)
+                self._slots[recipe_id] = slot
+                self._slot_recipes.append((recipe_id, profile_id, cooking_time, tokens))
+                for token in tokens:
+                    slot_lists[0].setdefault(token, []).append(slot)
+                slot_lists[1].setdefault(profile_id, []).append(slot)
+                slot_lists[2].setdefault(cooking_time, []).append(slot)
+                slot_lists[3].setdefault(len(tokens), []).append(slot)
+            
+            size = len(self._slot_recipes) // 8 + 1
+            for target, lists in zip(
+                (self._postings, self._by_profile, self._by_cooking_time, self._by_size),
+                slot_lists
+            ):
+                for key, slots in lists.items():
+                    bitmap = bytearray(size)
+                    for slot in slots:
+                        bitmap[slot >> 3] |= 1 << (slot & 7)
+                    target[key] = int.from_bytes(bitmap, "little")
+            self.ready = True
+
+    def add(self, recipe_id: int, profile_id: int, cooking_time: Optional[int], ingredients) -> None:
+        """Index a newly stored recipe"""
+        with self._lock:
+            if recipe_id in self._slots:
+                self._remove(recipe_id)
+            self._add(recipe_id, profile_id, cooking_time, ingredients)
+
+    def remove(self, recipe_id: int) -> None:
+        """Drop a deleted recipe from the index"""
+        with self._lock:
+            if recipe_id in self._slots:
+                self._remove(recipe_id)
+
+    def remove_profile(self, profile_id: int) -> None:
+        """Drop every recipe belonging to a deleted profile"""
+        with self._lock:
+            for slot in list(_bits(self._by_profile.get(profile_id, 0))):
+                self._remove(self._slot_recipes[slot][0])
+
+    def match(
+        self,
+        pantry: Set[Hashable],
+        disliked: Set[Hashable] = frozenset(),
+        max_cooking_time: Optional[int] = None,
+        profile_id: Optional[int] = None,
+        min_coverage: float = 0.0,
+        limit: int = 20
+    ) -> List[Tuple[int, int, int]]:
+        """
+        Rank recipes by the share of their ingredients found in the pantry
+
+        Returns (recipe_id, matched, total) tuples, best coverage first, with
+        more matched ingredients breaking ties. Recipes using a disliked
+        ingredient or exceeding max_cooking_time are excluded.
+        """
+        with self._lock:
+            candidates = 0
+            counters = [0] * _COUNTER_BITS
+            for token in pantry:
+                posting = self._postings.get(token)
+                if not posting:
+                    continue
+                candidates |= posting
+                carry = posting
+                for level in range(_COUNTER_BITS):
+                    counters[level], carry = counters[level] ^ carry, counters[level] & carry
+                    if not carry:
+                        break
+
+            for token in disliked:
+                candidates &= ~self._postings.get(token, 0)
+            if profile_id is not None:
+                candidates &= self._by_profile.get(profile_id, 0)
+            if max_cooking_time is not None:
+                allowed = 0
+                for cooking_time, mask in self._by_cooking_time.items():
+                    if cooking_time is None or cooking_time <= max_cooking_time:
+                        allowed |= mask
+                candidates &= allowed
+            if not candidates:
+                return []
+
+            levels = [
+                (matched, total)
+                for total in self._by_size
+                for matched in range(1, total + 1)
+                if matched / total >= min_coverage
+            ]
+            levels.sort(key=lambda level: (level[0] / level[1], level[0]), reverse=True)
+
+            results = []
+            for matched, total in levels:
+                mask = candidates & self._by_size[total]
+                for level in range(_COUNTER_BITS):
+                    mask &= counters[level] if matched >> level & 1 else ~counters[level]
+                    if not mask:
+                        break
+                for slot in _bits(mask):
+                    results.append((self._slot_recipes[slot][0], matched, total))
+                    if len(results) >= limit:
+                        return results
+            return results
+
+    def _add(self, recipe_id: int, profile_id: int, cooking_time: Optional[int], ingredients) -> None:
+        tokens = _limit(ingredient_tokens(ingredients))
+        if not tokens:
+            return
+        slot = self._free_slots.pop() if self._free_slots else len(self._slot_recipes)
+        if slot == len(self._slot_recipes):
+            self._slot_recipes.append(None)
+        bit = 1 << slot
+
+        self._slots[recipe_id] = slot
+        self._slot_recipes[slot] = (recipe_id, profile_id, cooking_time, tokens)
+        for token in tokens:
+            self._postings[token] = self._postings.get(token, 0) | bit
+        self._by_profile[profile_id] = self._by_profile.get(profile_id, 0) | bit
+        self._by_cooking_time[cooking_time] = self._by_cooking_time.get(cooking_time, 0) | bit
+        self._by_size[len(tokens)] = self._by_size.get(len(tokens), 0) | bit
+
+    def _remove(self, recipe_id: int) -> None:
+        slot = self._slots.pop(recipe_id)
+        _, profile_id, cooking_time, tokens = self._slot_recipes[slot]
+        self._slot_recipes[slot] = None
+        self._free_slots.append(slot)
+        bit = 1 << slot
+
+        for token in tokens:
+            self._discard(self._postings, token, bit)
+        self._discard(self._by_profile, profile_id, bit)
+        self._discard(self._by_cooking_time, cooking_time, bit)
+        self._discard(self._by_size, len(tokens), bit)
+
+    @staticmethod
+    def _discard(masks: Dict, key, bit: int) -> None:
+        mask = masks.get(key, 0) & ~bit
+        if mask:
+            masks[key] = mask
+        else:
+            masks.pop(key, None)
+
+
+# Singleton instance
+recipe_index = RecipeIndex()
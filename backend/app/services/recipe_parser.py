@@ -0,0 +1,141 @@
+import json
+from typing import Any, Dict, List, Tuple
+from pydantic import ValidationError
+from app.schemas.recipe import GeneratedRecipe
+
+# Gemini response_schema matching GeneratedRecipe
+RECIPE_RESPONSE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "cuisine_type": {"type": "string"},
+        "cooking_time": {"type": "integer"},
+        "difficulty": {"type": "string", "enum": ["easy", "medium", "hard"]},
+        "servings": {"type": "integer"},
+        "ingredients": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "quantity": {"type": "string"},
+                    "unit": {"type": "string"},
+                },
+                "required": ["name", "quantity", "unit"],
+            },
+        },
+        "instructions": {"type": "string"},
+        "utensils_required": {"type": "array", "items": {"type": "string"}},
+        "nutritional_info": {
+            "type": "object",
+            "properties": {
+                "calories": {"type": "string"},
+                "protein": {"type": "string"},
+                "carbs": {"type": "string"},
+                "fat": {"type": "string"},
+            },
+        },
+    },
+    "required": ["title", "ingredients", "instructions"],
+}
+
+
+class RecipeParseError(ValueError):
+    """The LLM response could not be turned into a valid recipe"""
+
+
+def parse_recipe(text: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    Validate an LLM response into recipe data
+
+    The response is first parsed and validated in one pass. Only if it is not
+    valid JSON is it repaired (code fences, trailing commas, truncation) and
+    validated again. Returns the recipe data and whether a repair was needed;
+    raises RecipeParseError otherwise.
+    """
+    try:
+        return _dump(GeneratedRecipe.model_validate_json(text)), False
+    except ValidationError as e:
+        if not any(error["type"] == "json_invalid" for error in e.errors()):
+            raise RecipeParseError(f"Recipe failed validation: {e}") from e
+
+    try:
+        return _dump(GeneratedRecipe.model_validate_json(repair_json(text))), True
+    except ValidationError as e:
+        raise RecipeParseError(f"Recipe failed validation after repair: {e}") from e
+
+
+def repair_json(text: str) -> str:
+    """
+    Best-effort repair of a JSON object from an LLM response
+
+    Skips anything before the first brace and after the object closes, drops
+    trailing commas, and closes a truncated object, dropping its last element
+    when that element is incomplete.
+    """
+    start = text.find("{")
+    if start < 0:
+        raise RecipeParseError("No JSON object in response")
+
+    out: List[str] = []
+    closers: List[str] = []
+    # (length of out before a comma, closers needed at that point)
+    cuts: List[Tuple[int, str]] = []
+    in_string = escape = False
+    for char in text[start:]:
+        if in_string:
+            out.append(char)
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char in "}]":
+            _drop_trailing_comma(out)
+            if closers:
+                closers.pop()
+            out.append(char)
+            if not closers:
+                return "".join(out)
+            continue
+        if char == '"':
+            in_string = True
+        elif char == "{":
+            closers.append("}")
+        elif char == "[":
+            closers.append("]")
+        elif char == ",":
+            cuts.append((len(out), "".join(reversed(closers))))
+        out.append(char)
+
+    # Truncated response. Text cut off mid-string is incomplete, so dropping
+    # the last element is preferred to closing the string
+    candidates = ["".join(out[:length]) + closing for length, closing in reversed(cuts[-3:])]
+    if in_string:
+        if escape:
+            out.pop()
+        candidates.append("".join(out) + '"' + "".join(reversed(closers)))
+    else:
+        candidates.insert(0, "".join(out).rstrip().rstrip(",") + "".join(reversed(closers)))
+    for candidate in candidates:
+        try:
+            json.loads(candidate)
+            return candidate
+        except json.JSONDecodeError:
+            continue
+    raise RecipeParseError("Truncated response could not be repaired")
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    index = len(out) - 1
+    while index >= 0 and out[index].isspace():
+        index -= 1
+    if index >= 0 and out[index] == ",":
+        del out[index]
+
+
+def _dump(recipe: GeneratedRecipe) -> Dict[str, Any]:
+    return recipe.model_dump(exclude={"image_url"})
@@ -0,0 +1,258 @@
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, column, exists, func, literal_column, select, table, text
+from sqlalchemy.orm import Session
+from app.models.recipe import Recipe, RecipeFavorite
+
+# Full-text index over stored recipes: an FTS5 virtual table on SQLite and a
+# tsvector table with a GIN index on PostgreSQL, both named recipe_search and
+# keyed by recipe id. RecipeService keeps it in step with the recipes table.
+SEARCH_TABLE = "recipe_search"
+
+# Relative weight of each field in the ranking
+_SQLITE_WEIGHTS = {"title": 10.0, "ingredients": 5.0, "cuisine_type": 2.0, "instructions": 1.0}
+_POSTGRES_WEIGHTS = {"title": "A", "ingredients": "B", "cuisine_type": "C", "instructions": "D"}
+
+# Upper bounds of the cooking-time facet buckets, in minutes
+COOKING_TIME_BUCKETS = [(15, "0-15"), (30, "16-30"), (60, "31-60")]
+_COOKING_TIME_OVER = "61+"
+
+_REBUILD_CHUNK = 2000
+
+_sqlite_search = table(SEARCH_TABLE, column("rowid"))
+_postgres_search = table(SEARCH_TABLE, column("recipe_id"), column("profile_id"), column("document"))
+
+
+def _dialect(conn) -> str:
+    bind = conn.get_bind() if isinstance(conn, Session) else conn
+    return bind.dialect.name
+
+
+def _ingredient_names(ingredients: Any) -> str:
+    if isinstance(ingredients, str):
+        ingredients = json.loads(ingredients)
+    names = []
+    for ingredient in ingredients or []:
+        name = ingredient.get("name") if isinstance(ingredient, dict) else ingredient
+        if name:
+            names.append(str(name))
+    return " ".join(names)
+
+
+def _document(recipe: Any) -> Dict[str, Any]:
+    """Searchable fields of a Recipe row, RecipeResponse or recipes table row"""
+    return {
+        "recipe_id": recipe.id,
+        "profile_id": recipe.profile_id,
+        "profile_key": f"p{recipe.profile_id}",
+        "title": recipe.title or "",
+        "ingredients": _ingredient_names(recipe.ingredients),
+        "cuisine_type": recipe.cuisine_type or "",
+        "instructions": recipe.instructions or "",
+    }
+
+
+def query_terms(q: str) -> List[str]:
+    """Split a search string into lowercase word terms, dropping punctuation"""
+    return re.findall(r"\w+", q.lower())
+
+
+def cooking_time_bucket(minutes: Optional[int]) -> str:
+    if minutes is None:
+        return "unknown"
+    for upper, label in COOKING_TIME_BUCKETS:
+        if minutes <= upper:
+            return label
+    return _COOKING_TIME_OVER
+
+
+class RecipeSearch:
+    """Maintains and queries the full-text recipe index"""
+
+    @staticmethod
+    def create(conn) -> None:
+        """Create the index table for the connection's dialect if it is missing"""
+        dialect = _dialect(conn)
+        if dialect == "sqlite":
+            # Prefixes of 2 to 6 letters are indexed so partly typed words don't
+            # scan the whole term list; profile_key ("p<id>") restricts matches
+            # to one profile
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+                "profile_key, title, ingredients, cuisine_type, instructions, "
+                "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4 5 6')"
+            ))
+        elif dialect == "postgresql":
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+                "recipe_id INTEGER PRIMARY KEY REFERENCES recipes (id) ON DELETE CASCADE, "
+                "profile_id INTEGER NOT NULL, "
+                "document TSVECTOR NOT NULL)"
+            ))
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)"
+            ))
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_profile ON {SEARCH_TABLE} (profile_id)"
+            ))
+        else:
+            raise ValueError(f"Recipe search is not supported on {dialect}")
+
+    @staticmethod
+    def index(conn, recipes: Iterable[Any]) -> None:
+        """Add or replace the index entries for recipes, without committing"""
+        documents = [_document(recipe) for recipe in recipes]
+        if not documents:
+            return
+        if _dialect(conn) == "sqlite":
+            RecipeSearch.remove(conn, [document["recipe_id"] for document in documents])
+            conn.execute(text(
+                f"INSERT INTO {SEARCH_TABLE} "
+                "(rowid, profile_key, title, ingredients, cuisine_type, instructions) "
+                "VALUES (:recipe_id, :profile_key, :title, :ingredients, :cuisine_type, :instructions)"
+            ), documents)
+        else:
+            vector = " || ".join(
+                f"setweight(to_tsvector('simple', :{field}), '{weight}')"
+                for field, weight in _POSTGRES_WEIGHTS.items()
+            )
+            conn.execute(text(
+                f"INSERT INTO {SEARCH_TABLE} (recipe_id, profile_id, document) "
+                f"VALUES (:recipe_id, :profile_id, {vector}) "
+                "ON CONFLICT (recipe_id) DO UPDATE "
+                "SET profile_id = EXCLUDED.profile_id, document = EXCLUDED.document"
+            ), documents)
+
+    @staticmethod
+    def remove(conn, recipe_ids: List[int]) -> None:
+        """Drop the index entries for recipes, without committing"""
+        if not recipe_ids:
+            return
+        key = "rowid" if _dialect(conn) == "sqlite" else "recipe_id"
+        conn.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE {key} IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": list(recipe_ids)}
+        )
+
+    @staticmethod
+    def remove_profile(conn, profile_id: int) -> None:
+        """Drop the index entries for all of a profile's recipes, without committing"""
+        if _dialect(conn) == "sqlite":
+            conn.execute(
+                text(f"DELETE FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match"),
+                {"match": f"profile_key:p{profile_id}"}
+            )
+        else:
+            conn.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE profile_id = :profile_id"), {"profile_id": profile_id})
+
+    @staticmethod
+    def rebuild(conn) -> int:
+        """Re-index every stored recipe in id order, chunk by chunk; returns the count"""
+        conn.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        recipes = Recipe.__table__
+        columns = [recipes.c[name] for name in (
+            "id", "profile_id", "title", "ingredients", "cuisine_type", "instructions"
+        )]
+        last_id = 0
+        total = 0
+        while True:
+            rows = conn.execute(
+                select(*columns).where(recipes.c.id > last_id).order_by(recipes.c.id).limit(_REBUILD_CHUNK)
+            ).all()
+            if not rows:
+                return total
+            RecipeSearch.index(conn, rows)
+            last_id = rows[-1].id
+            total += len(rows)
+
+    @staticmethod
+    def search(
+        db: Session,
+        profile_id: int,
+        q: str,
+        difficulty: Optional[str] = None,
+        max_cooking_time: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[List[Recipe], int, Dict[str, Dict[str, int]]]:
+        """
+        Rank a profile's recipes against q, matching every term as a prefix
+
+        Returns a page of recipes (with is_favorite set), the number of
+        matches after filtering, and facet counts: matches per difficulty
+        (with only the cooking-time filter applied) and per cooking-time
+        bucket (with only the difficulty filter applied).
+        """
+        terms = query_terms(q)
+        if not terms:
+            raise ValueError("Search query must contain at least one word")
+
+        if _dialect(db) == "sqlite":
+            # Terms are matched in the text columns only, never against profile_key
+            match = "profile_key:p%d AND {%s}:(%s)" % (
+                profile_id,
+                " ".join(_SQLITE_WEIGHTS),
+                " AND ".join(f'"{term}"*' for term in terms)
+            )
+            weights = [0.0] + list(_SQLITE_WEIGHTS.values())
+            source = _sqlite_search
+            join_on = Recipe.id == _sqlite_search.c.rowid
+            matches = text(f"{SEARCH_TABLE} MATCH :match").bindparams(match=match)
+            # bm25() is lower for better matches
+            order = func.bm25(literal_column(SEARCH_TABLE), *weights).asc()
+        else:
+            query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+            source = _postgres_search
+            join_on = Recipe.id == _postgres_search.c.recipe_id
+            matches = (_postgres_search.c.profile_id == profile_id) & _postgres_search.c.document.op("@@")(query)
+            order = func.ts_rank_cd(_postgres_search.c.document, query).desc()
+
+        difficulty_key = func.lower(Recipe.difficulty)
+        facet_rows = db.execute(
+            select(difficulty_key, Recipe.cooking_time, func.count())
+            .select_from(source)
+            .join(Recipe, join_on)
+            .where(matches)
+            .group_by(difficulty_key, Recipe.cooking_time)
+        ).all()
+
+        wanted_difficulty = difficulty.lower() if difficulty else None
+        total = 0
+        facets: Dict[str, Dict[str, int]] = {"difficulty": {}, "cooking_time": {}}
+        for row_difficulty, cooking_time, count in facet_rows:
+            difficulty_ok = wanted_difficulty is None or row_difficulty == wanted_difficulty
+            time_ok = max_cooking_time is None or (cooking_time is not None and cooking_time <= max_cooking_time)
+            if time_ok:
+                label = row_difficulty or "unknown"
+                facets["difficulty"][label] = facets["difficulty"].get(label, 0) + count
+            if difficulty_ok:
+                label = cooking_time_bucket(cooking_time)
+                facets["cooking_time"][label] = facets["cooking_time"].get(label, 0) + count
+            if difficulty_ok and time_ok:
+                total += count
+
+        if not total or offset >= total:
+            return [], total, facets
+
+        is_favorite = exists().where(
+            RecipeFavorite.profile_id == profile_id,
+            RecipeFavorite.recipe_id == Recipe.id
+        ).label("is_favorite")
+        query = (
+            select(Recipe, is_favorite)
+            .select_from(source)
+            .join(Recipe, join_on)
+            .where(matches)
+        )
+        if wanted_difficulty:
+            query = query.where(difficulty_key == wanted_difficulty)
+        if max_cooking_time is not None:
+            query = query.where(Recipe.cooking_time <= max_cooking_time)
+        rows = db.execute(query.order_by(order, Recipe.id.desc()).limit(limit).offset(offset)).all()
+
+        recipes = []
+        for recipe, favorited in rows:
+            recipe.is_favorite = bool(favorited)
+            recipes.append(recipe)
+        return recipes, total, facets
@@ -1,42 +1,302 @@
-from sqlalchemy.orm import Session
+import asyncio
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime
+from sqlalchemy import bindparam, case, delete, exists, false, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+from app.config import get_settings
+from app.database import session_scope
 from app.models.recipe import Recipe, RecipeFavorite
 from app.models.inventory import InventoryItem
-from app.schemas.recipe import RecipeGenerateRequest, RecipeFavoriteCreate
+from app.models.expiry_alert import ExpiryAlertEntry
+from app.models.preference import UserPreference
+from app.schemas.recipe import (
+    RecipeGenerateRequest,
+    RecipeFavoriteCreate,
+    RecipeResponse,
+    RecipeBatchItemResult,
+    RecipeCookResponse,
+    RecipeMatch,
+    CookedIngredient,
+    UnmatchedIngredient
+)
 from app.services.gemini_service import gemini_service
-from typing import List, Optional
+from app.services.llm_client import LLMUnavailableError
+from app.services.recipe_cache import recipe_cache, build_cache_key
+from app.services.recipe_stream_parser import recipe_events
+from app.services.pagination import keyset_paginate
+from app.services.ingredients import match_ingredient
+from app.services.ingredient_registry import ingredient_registry
+from app.services.recipe_index import RecipeIndexNotReadyError, recipe_index, ingredient_tokens
+from app.services.recipe_search import RecipeSearch
+from app.services.collection_versions import CollectionVersions, FAVORITES, INVENTORY, RECIPES
+from app.services.units import CONVERSIONS, parse_quantity, parse_unit, to_base_quantity
+from typing import List, Dict, Any, Optional, Set, Tuple, AsyncIterator
+import json
+
+settings = get_settings()
+
+# Stored recipes considered when one stands in for a generated recipe
+_FALLBACK_CANDIDATES = 20
+
+
+def _format_sse(event: str, data: Any) -> str:
+    """Format a single Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _lock_inventory(db: Session) -> None:
+    """On SQLite, take the database write lock before reading stock to decrement"""
+    if db.get_bind().dialect.name == "sqlite":
+        # A no-op write starts the transaction holding the write lock
+        table = InventoryItem.__table__
+        db.execute(update(table).where(false()).values(id=table.c.id))
 
 
 class RecipeService:
     
     @staticmethod
-    def generate_recipe(db: Session, request: RecipeGenerateRequest) -> Recipe:
-        """Generate a recipe using Gemini API and save it"""
+    async def generate_recipe(request: RecipeGenerateRequest) -> Tuple[Recipe, bool]:
+        """Generate a recipe using Gemini API and save it
+        
+        Database sessions are only held for the inventory lookup and the final
+        insert, never while waiting on the LLM. Returns the recipe and whether
+        it is an existing one: when the LLM circuit breaker is open, one of the
+        profile's stored recipes that fits the request may stand in.
+        """
         
         # Get ingredients from inventory if not provided
         if not request.ingredients:
-            inventory_items = db.query(InventoryItem).filter(
-                InventoryItem.profile_id == request.profile_id
-            ).all()
-            ingredients = [item.name for item in inventory_items if item.quantity > 0]
+            ingredients = await run_in_threadpool(
+                RecipeService._load_inventory_ingredients, request.profile_id
+            )
         else:
             ingredients = request.ingredients
         
+        try:
+            recipe_data = await RecipeService._generate_recipe_data(request, ingredients)
+        except LLMUnavailableError:
+            # While the LLM circuit is open, the best stored match stands in
+            if not settings.llm_fallback_to_match:
+                raise
+            recipe = await run_in_threadpool(RecipeService._best_stored_match, request)
+            if recipe is None:
+                raise
+            return recipe, True
+        
+        recipe = await run_in_threadpool(
+            RecipeService._save_generated_recipe, request.profile_id, recipe_data
+        )
+        return recipe, False
+    
+    @staticmethod
+    def _best_stored_match(request: RecipeGenerateRequest) -> Optional[Recipe]:
+        """The profile's own stored recipe that best fits the request, if any
+        
+        Recipes are ranked against the request's ingredients (or the pantry)
+        and must have the requested cuisine and cooking time. Stored recipes
+        carry no dietary information, so requests with dietary preferences
+        never fall back.
+        """
+        if request.dietary_preferences:
+            return None
+        with session_scope() as db:
+            try:
+                matches = RecipeService.match_recipes(
+                    db,
+                    request.profile_id,
+                    limit=_FALLBACK_CANDIDATES,
+                    max_cooking_time=request.max_cooking_time,
+                    ingredients=request.ingredients
+                )
+            except RecipeIndexNotReadyError:
+                return None
+        cuisine = request.cuisine_type.strip().lower() if request.cuisine_type else None
+        for match in matches:
+            if cuisine is None or (match.recipe.cuisine_type or "").strip().lower() == cuisine:
+                return match.recipe
+        return None
+    
+    @staticmethod
+    async def generate_recipes_batch(
+        requests: List[RecipeGenerateRequest],
+        variants: Optional[List[Optional[int]]] = None
+    ) -> List[RecipeBatchItemResult]:
+        """Generate several recipes concurrently and save them in one transaction
+        
+        Failures are reported per item; the LLM client's concurrency limit
+        bounds how many calls are in flight at once.
+        """
+        variants = variants or [None] * len(requests)
+        
+        # Inventory is loaded once per profile rather than once per request
+        profile_ids = {r.profile_id for r in requests if not r.ingredients}
+        inventory = await run_in_threadpool(
+            RecipeService._load_inventory_ingredients_bulk, profile_ids
+        ) if profile_ids else {}
+        
+        outcomes = await asyncio.gather(
+            *[
+                RecipeService._generate_recipe_data(
+                    request,
+                    request.ingredients or inventory.get(request.profile_id, []),
+                    variant
+                )
+                for request, variant in zip(requests, variants)
+            ],
+            return_exceptions=True
+        )
+        
+        generated = [
+            (index, requests[index].profile_id, outcome)
+            for index, outcome in enumerate(outcomes)
+            if not isinstance(outcome, BaseException)
+        ]
+        saved = await run_in_threadpool(
+            RecipeService._save_generated_recipes,
+            [(profile_id, recipe_data) for _, profile_id, recipe_data in generated]
+        ) if generated else []
+        
+        results = [
+            RecipeBatchItemResult(index=index, success=False, error=str(outcome))
+            for index, outcome in enumerate(outcomes)
+            if isinstance(outcome, BaseException)
+        ]
+        results.extend(
+            RecipeBatchItemResult(index=index, success=True, recipe=recipe)
+            for (index, _, _), recipe in zip(generated, saved)
+        )
+        return sorted(results, key=lambda result: result.index)
+    
+    @staticmethod
+    async def stream_recipe(request: RecipeGenerateRequest) -> AsyncIterator[str]:
+        """Generate a recipe as a stream of Server-Sent Events
+        
+        Emits field, ingredient and step events as the LLM produces them, then
+        saves the recipe and emits a final "done" event carrying its id.
+        """
+        try:
+            if not request.ingredients:
+                ingredients = await run_in_threadpool(
+                    RecipeService._load_inventory_ingredients, request.profile_id
+                )
+            else:
+                ingredients = request.ingredients
+            
+            if not ingredients:
+                raise ValueError("No ingredients available to generate recipe")
+            
+            prompt_inputs = dict(
+                ingredients=ingredients,
+                cuisine_type=request.cuisine_type,
+                max_cooking_time=request.max_cooking_time,
+                dietary_preferences=request.dietary_preferences,
+                available_utensils=request.available_utensils,
+                servings=request.servings
+            )
+            
+            cache_key = await run_in_threadpool(build_cache_key, **prompt_inputs)
+            recipe_data = recipe_cache.get(cache_key)
+            if recipe_data is not None:
+                for event, data in recipe_events(recipe_data):
+                    yield _format_sse(event, data)
+            else:
+                async for event, data in gemini_service.generate_recipe_stream(**prompt_inputs):
+                    if event == "recipe":
+                        recipe_data = data
+                    else:
+                        yield _format_sse(event, data)
+                recipe_cache.set(cache_key, recipe_data)
+            
+            db_recipe = await run_in_threadpool(
+                RecipeService._save_generated_recipe, request.profile_id, recipe_data
+            )
+            yield _format_sse("done", {"id": db_recipe.id})
+        except Exception as e:
+            yield _format_sse("error", {"detail": str(e)})
+    
+    @staticmethod
+    async def _generate_recipe_data(
+        request: RecipeGenerateRequest,
+        ingredients: List[str],
+        variant: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Produce recipe data for a request, from the cache when possible"""
         if not ingredients:
             raise ValueError("No ingredients available to generate recipe")
         
-        # Generate recipe using Gemini
-        recipe_data = gemini_service.generate_recipe(
+        prompt_inputs = dict(
             ingredients=ingredients,
             cuisine_type=request.cuisine_type,
             max_cooking_time=request.max_cooking_time,
             dietary_preferences=request.dietary_preferences,
             available_utensils=request.available_utensils,
-            servings=request.servings
+            servings=request.servings,
+            variant=variant
         )
         
-        # Save recipe to database
-        db_recipe = Recipe(
-            profile_id=request.profile_id,
+        # Identical inputs are served from the cache without calling Gemini
+        cache_key = await run_in_threadpool(build_cache_key, **prompt_inputs)
+        recipe_data = recipe_cache.get(cache_key)
+        if recipe_data is None:
+            recipe_data = await gemini_service.generate_recipe(**prompt_inputs)
+            recipe_cache.set(cache_key, recipe_data)
+        return recipe_data
+    
+    @staticmethod
+    def _load_inventory_ingredients(profile_id: int) -> List[str]:
+        """Get the names of all in-stock inventory items for a profile"""
+        return RecipeService._load_inventory_ingredients_bulk({profile_id}).get(profile_id, [])
+    
+    @staticmethod
+    def _load_inventory_ingredients_bulk(profile_ids: Set[int]) -> Dict[int, List[str]]:
+        """Get the names of all in-stock inventory items for several profiles
+        
+        Names come soonest-expiring first, which is the order the prompt
+        builder uses to decide what to keep when it has to truncate.
+        """
+        with session_scope() as db:
+            rows = db.query(InventoryItem.profile_id, InventoryItem.name).filter(
+                InventoryItem.profile_id.in_(profile_ids),
+                InventoryItem.quantity > 0
+            ).order_by(
+                InventoryItem.expiry_date.is_(None), InventoryItem.expiry_date, InventoryItem.id
+            ).all()
+        
+        ingredients: Dict[int, List[str]] = {}
+        for profile_id, name in rows:
+            ingredients.setdefault(profile_id, []).append(name)
+        return ingredients
+    
+    @staticmethod
+    def _with_ingredient_ids(items: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Tag each generated ingredient with its canonical ingredient_id
+        
+        Every name across the batch is resolved in one registry call; unseen
+        names are registered. Cached recipe data is copied, not modified.
+        """
+        names = [
+            str(ingredient.get("name", ""))
+            for _, recipe_data in items
+            for ingredient in recipe_data['ingredients']
+        ]
+        ids = iter(ingredient_registry.resolve_many(names))
+        return [
+            (profile_id, {
+                **recipe_data,
+                'ingredients': [
+                    {**ingredient, "ingredient_id": next(ids)}
+                    for ingredient in recipe_data['ingredients']
+                ]
+            })
+            for profile_id, recipe_data in items
+        ]
+    
+    @staticmethod
+    def _build_recipe(profile_id: int, recipe_data: Dict[str, Any]) -> Recipe:
+        """Build a Recipe row from generated recipe data"""
+        return Recipe(
+            profile_id=profile_id,
             title=recipe_data['title'],
             cuisine_type=recipe_data.get('cuisine_type'),
             cooking_time=recipe_data.get('cooking_time'),
@@ -48,19 +308,190 @@ class RecipeService:
             nutritional_info=recipe_data.get('nutritional_info'),
             generated_by_ai=True
         )
+    
+    @staticmethod
+    def _save_generated_recipe(profile_id: int, recipe_data: Dict[str, Any]) -> Recipe:
+        """Save a generated recipe to the database"""
+        [(profile_id, recipe_data)] = RecipeService._with_ingredient_ids([(profile_id, recipe_data)])
+        with session_scope() as db:
+            db_recipe = RecipeService._build_recipe(profile_id, recipe_data)
+            db.add(db_recipe)
+            db.flush()
+            RecipeSearch.index(db, [db_recipe])
+            CollectionVersions.bump(db, profile_id, RECIPES)
+            db.commit()
+            db.refresh(db_recipe)
+            RecipeService._index_recipe(db_recipe)
+            
+            return db_recipe
+    
+    @staticmethod
+    def _save_generated_recipes(items: List[Tuple[int, Dict[str, Any]]]) -> List[RecipeResponse]:
+        """Save several generated recipes with a single bulk insert and commit"""
+        items = RecipeService._with_ingredient_ids(items)
+        with session_scope() as db:
+            db_recipes = [
+                RecipeService._build_recipe(profile_id, recipe_data)
+                for profile_id, recipe_data in items
+            ]
+            db.add_all(db_recipes)
+            db.flush()
+            RecipeSearch.index(db, db_recipes)
+            CollectionVersions.bump(db, {profile_id for profile_id, _ in items}, RECIPES)
+            
+            # Serialize before commit so the rows don't need to be reloaded
+            responses = [RecipeResponse.model_validate(recipe) for recipe in db_recipes]
+            db.commit()
+            for recipe in responses:
+                RecipeService._index_recipe(recipe)
+            
+            return responses
+    
+    @staticmethod
+    def _index_recipe(recipe) -> None:
+        """Add a stored recipe to the in-memory ingredient index"""
+        recipe_index.add(recipe.id, recipe.profile_id, recipe.cooking_time, recipe.ingredients)
+    
+    @staticmethod
+    def get_recipes_with_favorite_flags(
+        db: Session,
+        profile_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Recipe], Optional[str]]:
+        """Get a page of recipes for a profile with is_favorite set, using a single query"""
+        is_favorite = exists().where(
+            RecipeFavorite.profile_id == profile_id,
+            RecipeFavorite.recipe_id == Recipe.id
+        ).label("is_favorite")
         
-        db.add(db_recipe)
-        db.commit()
-        db.refresh(db_recipe)
+        query = db.query(Recipe, is_favorite).filter(Recipe.profile_id == profile_id)
+        rows, next_cursor = keyset_paginate(query, Recipe, cursor, limit, key=lambda row: row[0])
         
-        return db_recipe
+        recipes = []
+        for recipe, favorited in rows:
+            recipe.is_favorite = bool(favorited)
+            recipes.append(recipe)
+        return recipes, next_cursor
     
     @staticmethod
-    def get_recipes_by_profile(db: Session, profile_id: int, limit: int = 50) -> List[Recipe]:
-        """Get all recipes for a profile"""
-        return db.query(Recipe).filter(
-            Recipe.profile_id == profile_id
-        ).order_by(Recipe.created_at.desc()).limit(limit).all()
+    def cook_recipe(
+        db: Session,
+        recipe_id: int,
+        profile_id: int,
+        servings: Optional[int] = None
+    ) -> Optional[RecipeCookResponse]:
+        """Consume a recipe's ingredients from the cooking profile's inventory
+        
+        The recipe may belong to another profile (see match_recipes); stock is
+        always taken from profile_id's pantry.
+        Every decrement is applied in one transaction using a fixed number of
+        statements, however many ingredients the recipe has. Inventory rows are
+        locked first (SELECT ... FOR UPDATE on Postgres, the database write lock
+        on SQLite) and decrements are relative, so concurrent cooks in the same
+        household cannot spend the same stock twice. Items that run out are
+        removed.
+        """
+        recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
+        if not recipe:
+            return None
+        scale = servings / recipe.servings if servings and recipe.servings else 1.0
+        
+        _lock_inventory(db)
+        # Earliest-expiring stock is used first when several rows share a name
+        items = db.query(InventoryItem).filter(
+            InventoryItem.profile_id == profile_id
+        ).order_by(
+            InventoryItem.expiry_date.is_(None), InventoryItem.expiry_date, InventoryItem.id
+        ).with_for_update().all()
+        
+        items_by_ingredient: Dict[int, List[InventoryItem]] = {}
+        items_by_name: Dict[str, List[InventoryItem]] = {}
+        unresolved_by_name: Dict[str, List[InventoryItem]] = {}
+        for item in items:
+            if item.ingredient_id is not None:
+                items_by_ingredient.setdefault(item.ingredient_id, []).append(item)
+            else:
+                unresolved_by_name.setdefault(item.name, []).append(item)
+            items_by_name.setdefault(item.name, []).append(item)
+        
+        remaining = {item.id: item.quantity for item in items}
+        consumed: List[CookedIngredient] = []
+        unmatched: List[UnmatchedIngredient] = []
+        for ingredient in recipe.ingredients:
+            name = str(ingredient.get("name", "")).strip()
+            # Canonical ids compare directly. Rows with a different id are a
+            # different ingredient, so a known ingredient is only matched by
+            # name against rows stored without an id
+            ingredient_id = ingredient.get("ingredient_id")
+            if ingredient_id is None:
+                ingredient_id = ingredient_registry.lookup(name)
+            candidates = items_by_ingredient.get(ingredient_id)
+            if candidates is None:
+                by_name = items_by_name if ingredient_id is None else unresolved_by_name
+                match = match_ingredient(name, by_name)
+                candidates = by_name[match] if match is not None else None
+            if candidates is None:
+                unmatched.append(UnmatchedIngredient(ingredient=name, reason="not_in_inventory"))
+                continue
+            
+            amount = parse_quantity(ingredient.get("quantity"))
+            unit = parse_unit(ingredient.get("unit"))
+            if amount is None or unit is None:
+                unmatched.append(UnmatchedIngredient(ingredient=name, reason="unknown_quantity"))
+                continue
+            needed, base_unit = to_base_quantity(amount * scale, unit)
+            
+            item = next((i for i in candidates if i.base_unit == base_unit), None)
+            if item is None:
+                unmatched.append(UnmatchedIngredient(ingredient=name, reason="unit_mismatch"))
+                continue
+            
+            _, factor = CONVERSIONS[item.unit]
+            before = remaining[item.id]
+            used = min(needed / factor, before)
+            remaining[item.id] = before - used
+            consumed.append(CookedIngredient(
+                ingredient=name,
+                item_id=item.id,
+                item_name=item.name,
+                unit=item.unit.value,
+                quantity_used=used,
+                quantity_before=before,
+                quantity_after=remaining[item.id],
+                removed=remaining[item.id] <= 0
+            ))
+        
+        used_by_item: Dict[int, float] = {}
+        for entry in consumed:
+            used_by_item[entry.item_id] = used_by_item.get(entry.item_id, 0.0) + entry.quantity_used
+        
+        if used_by_item:
+            factors = {item.id: CONVERSIONS[item.unit][1] for item in items}
+            table = InventoryItem.__table__
+            left = table.c.quantity - bindparam("b_used")
+            # A single executemany applies every decrement relative to the stored value
+            db.execute(
+                update(table).where(table.c.id == bindparam("b_id")).values(
+                    quantity=case((left > 0, left), else_=0.0),
+                    base_quantity=case((left > 0, left * bindparam("b_factor")), else_=0.0),
+                    updated_at=datetime.utcnow()
+                ),
+                [
+                    {"b_id": item_id, "b_used": used, "b_factor": factors[item_id]}
+                    for item_id, used in used_by_item.items()
+                ]
+            )
+            
+            exhausted = select(table.c.id).where(
+                table.c.id.in_(list(used_by_item)), table.c.quantity <= 0
+            )
+            db.execute(delete(ExpiryAlertEntry).where(ExpiryAlertEntry.item_id.in_(exhausted)))
+            db.execute(delete(table).where(table.c.id.in_(list(used_by_item)), table.c.quantity <= 0))
+            CollectionVersions.bump(db, profile_id, INVENTORY)
+        
+        db.commit()
+        return RecipeCookResponse(recipe_id=recipe.id, consumed=consumed, unmatched=unmatched)
     
     @staticmethod
     def get_recipe_by_id(db: Session, recipe_id: int) -> Optional[Recipe]:
@@ -74,27 +505,123 @@ class RecipeService:
         if not db_recipe:
             return False
         
+        # Favourites of the recipe, from any profile, are deleted with it
+        favorited_by = set(db.scalars(
+            select(RecipeFavorite.profile_id).where(RecipeFavorite.recipe_id == recipe_id)
+        ))
         db.delete(db_recipe)
+        RecipeSearch.remove(db, [recipe_id])
+        CollectionVersions.bump(db, db_recipe.profile_id, RECIPES)
+        CollectionVersions.bump(db, favorited_by, FAVORITES)
         db.commit()
+        recipe_index.remove(recipe_id)
         return True
     
     @staticmethod
-    def add_to_favorites(db: Session, favorite: RecipeFavoriteCreate) -> RecipeFavorite:
-        """Add a recipe to favorites"""
-        # Check if already favorited
-        existing = db.query(RecipeFavorite).filter(
-            RecipeFavorite.profile_id == favorite.profile_id,
-            RecipeFavorite.recipe_id == favorite.recipe_id
+    def match_recipes(
+        db: Session,
+        profile_id: int,
+        limit: int = 20,
+        min_coverage: float = 0.0,
+        max_cooking_time: Optional[int] = None,
+        include_other_profiles: bool = False,
+        ingredients: Optional[List[str]] = None
+    ) -> List[RecipeMatch]:
+        """Rank the profile's stored recipes by how much of their ingredient list the pantry covers
+        
+        Uses the in-memory ingredient index, so no LLM call is made; raises
+        RecipeIndexNotReadyError while the startup build is still running.
+        Other profiles' recipes are only considered with include_other_profiles.
+        When ingredients are given they stand in for the pantry. Disliked
+        ingredients and the maximum cooking time come from the profile's
+        preferences unless max_cooking_time is given.
+        """
+        if not recipe_index.ready:
+            raise RecipeIndexNotReadyError("Recipe matching is starting up, try again shortly")
+        
+        if ingredients:
+            pantry = ingredient_tokens(ingredients)
+        else:
+            stock = db.query(InventoryItem.ingredient_id, InventoryItem.name).filter(
+                InventoryItem.profile_id == profile_id,
+                InventoryItem.quantity > 0
+            ).all()
+            pantry = ingredient_tokens(
+                name if ingredient_id is None else ingredient_id for ingredient_id, name in stock
+            )
+        
+        preference = db.query(UserPreference).filter(
+            UserPreference.profile_id == profile_id
         ).first()
+        disliked = set()
+        if preference:
+            disliked = ingredient_tokens(
+                preference.disliked_ingredient_ids or preference.disliked_ingredients or []
+            )
+        if max_cooking_time is None and preference:
+            max_cooking_time = preference.max_cooking_time
         
+        ranked = recipe_index.match(
+            pantry,
+            disliked=disliked,
+            max_cooking_time=max_cooking_time,
+            profile_id=None if include_other_profiles else profile_id,
+            min_coverage=min_coverage,
+            limit=limit
+        )
+        if not ranked:
+            return []
+        
+        recipes = {
+            recipe.id: recipe
+            for recipe in db.query(Recipe).filter(Recipe.id.in_([r[0] for r in ranked])).all()
+        }
+        matches = []
+        for recipe_id, matched, total in ranked:
+            recipe = recipes.get(recipe_id)
+            if recipe is None:
+                continue
+            missing = [
+                ingredient.get("name", "")
+                for ingredient in recipe.ingredients
+                if not ingredient_tokens([ingredient]) <= pantry
+            ]
+            matches.append(RecipeMatch(
+                recipe=recipe,
+                coverage=matched / total,
+                matched_count=matched,
+                total_count=total,
+                missing_ingredients=missing
+            ))
+        return matches
+    
+    @staticmethod
+    def add_to_favorites(db: Session, favorite: RecipeFavoriteCreate) -> RecipeFavorite:
+        """Add a recipe to favorites, returning it with its recipe loaded"""
+        # Check if already favorited
+        existing = RecipeService._get_favorite(db, favorite.profile_id, favorite.recipe_id)
         if existing:
             return existing
         
         db_favorite = RecipeFavorite(**favorite.dict())
         db.add(db_favorite)
-        db.commit()
-        db.refresh(db_favorite)
-        return db_favorite
+        CollectionVersions.bump(db, favorite.profile_id, FAVORITES)
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request favourited the same recipe first
+            db.rollback()
+        return RecipeService._get_favorite(db, favorite.profile_id, favorite.recipe_id)
+    
+    @staticmethod
+    def _get_favorite(db: Session, profile_id: int, recipe_id: int) -> Optional[RecipeFavorite]:
+        """Load a favourite together with its recipe in one query"""
+        return db.query(RecipeFavorite).options(
+            joinedload(RecipeFavorite.recipe, innerjoin=True)
+        ).filter(
+            RecipeFavorite.profile_id == profile_id,
+            RecipeFavorite.recipe_id == recipe_id
+        ).first()
     
     @staticmethod
     def remove_from_favorites(db: Session, profile_id: int, recipe_id: int) -> bool:
@@ -108,22 +635,24 @@ class RecipeService:
             return False
         
         db.delete(db_favorite)
+        CollectionVersions.bump(db, profile_id, FAVORITES)
         db.commit()
         return True
     
     @staticmethod
-    def get_favorites(db: Session, profile_id: int) -> List[RecipeFavorite]:
-        """Get all favorite recipes for a profile"""
-        return db.query(RecipeFavorite).filter(
-            RecipeFavorite.profile_id == profile_id
-        ).order_by(RecipeFavorite.created_at.desc()).all()
-    
-    @staticmethod
-    def is_favorited(db: Session, profile_id: int, recipe_id: int) -> bool:
-        """Check if a recipe is favorited by a profile"""
-        favorite = db.query(RecipeFavorite).filter(
-            RecipeFavorite.profile_id == profile_id,
-            RecipeFavorite.recipe_id == recipe_id
-        ).first()
-        return favorite is not None
+    def get_favorites(
+        db: Session,
+        profile_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[RecipeFavorite], Optional[str]]:
+        """Get favorite recipes for a profile, newest first, and the next cursor
+        
+        Each favourite's recipe is joined into the same query rather than
+        lazy-loaded per row during serialization.
+        """
+        query = db.query(RecipeFavorite).options(
+            joinedload(RecipeFavorite.recipe, innerjoin=True)
+        ).filter(RecipeFavorite.profile_id == profile_id)
+        return keyset_paginate(query, RecipeFavorite, cursor, limit)
 
@@ -0,0 +1,176 @@
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# (event name, payload) pairs emitted while a recipe is streamed
+RecipeEvent = Tuple[str, Any]
+
+# Top-level arrays whose elements are emitted one by one as they complete
+_ITEM_EVENTS = {"ingredients": "ingredient", "instructions": "step"}
+
+
+def _split_steps(text: str) -> List[str]:
+    """Split instruction text into non-empty step lines"""
+    return [line.strip() for line in text.split("\n") if line.strip()]
+
+
+def recipe_events(recipe_data: Dict[str, Any]) -> Iterator[RecipeEvent]:
+    """Yield the events a streamed recipe would produce, for already-complete data"""
+    for key, value in recipe_data.items():
+        if key == "ingredients":
+            for ingredient in value:
+                yield "ingredient", ingredient
+        elif key == "instructions":
+            steps = value if isinstance(value, list) else _split_steps(value)
+            for step in steps:
+                yield "step", step
+        else:
+            yield "field", {"name": key, "value": value}
+
+
+class IncrementalRecipeParser:
+    """Incremental parser for a JSON recipe object arriving in arbitrary chunks
+
+    Emits an event for each top-level field as soon as its value is complete,
+    one event per ingredient object, and one event per instruction step, either
+    from an instructions array or from newline-separated instruction text.
+    Anything before the opening brace (such as a markdown code fence) is skipped.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self.done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = True
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._step_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[RecipeEvent]:
+        """Consume a chunk of text and return the events it completed"""
+        self._buffer += chunk
+        events: List[RecipeEvent] = []
+
+        while self._pos < len(self._buffer) and not self.done:
+            char = self._buffer[self._pos]
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+            elif self._in_string:
+                self._consume_string_char(char, events)
+            else:
+                self._consume_char(char, events)
+            self._pos += 1
+
+        return events
+
+    def _streaming_instruction_text(self) -> bool:
+        return self._depth == 1 and not self._expect_key and self._key == "instructions"
+
+    def _streaming_items(self) -> bool:
+        return self._key in _ITEM_EVENTS
+
+    def _consume_string_char(self, char: str, events: List[RecipeEvent]) -> None:
+        if self._escape:
+            self._escape = False
+            # A JSON "\n" escape inside instruction text ends a step
+            if char == "n" and self._streaming_instruction_text():
+                self._emit_step(self._pos - 1, events)
+                self._step_start = self._pos + 1
+            return
+
+        if char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._depth == 1 and self._expect_key:
+                self._key = json.loads(self._buffer[self._key_start:self._pos + 1])
+                self._expect_key = False
+            elif self._depth == 1:
+                if self._key == "instructions":
+                    self._emit_step(self._pos, events)
+                else:
+                    self._emit_value(self._pos + 1, events)
+                self._value_start = None
+            elif self._depth == 2 and self._item_start is not None:
+                self._emit_item(self._pos + 1, events)
+
+    def _consume_char(self, char: str, events: List[RecipeEvent]) -> None:
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1 and self._expect_key:
+                self._key_start = self._pos
+            elif self._depth == 1:
+                self._value_start = self._pos
+                self._step_start = self._pos + 1
+            elif self._depth == 2 and self._streaming_items() and self._item_start is None:
+                self._item_start = self._pos
+        elif char in "{[":
+            if self._depth == 1:
+                self._value_start = self._pos
+            elif self._depth == 2 and self._streaming_items() and self._item_start is None:
+                self._item_start = self._pos
+            self._depth += 1
+        elif char in "}]":
+            if self._depth == 2 and self._item_start is not None:
+                # Trailing scalar item closed by the end of its array
+                self._emit_item(self._pos, events)
+            self._depth -= 1
+            if self._depth == 0:
+                if self._value_start is not None:
+                    self._emit_value(self._pos, events)
+                self.done = True
+            elif self._depth == 1:
+                if not self._streaming_items():
+                    self._emit_value(self._pos + 1, events)
+                self._value_start = None
+            elif self._depth == 2 and self._item_start is not None:
+                self._emit_item(self._pos + 1, events)
+        elif char == ",":
+            if self._depth == 1:
+                if self._value_start is not None:
+                    self._emit_value(self._pos, events)
+                self._value_start = None
+                self._expect_key = True
+            elif self._depth == 2 and self._item_start is not None:
+                self._emit_item(self._pos, events)
+        elif char == ":" or char.isspace():
+            pass
+        elif self._depth == 1 and not self._expect_key and self._value_start is None:
+            # Start of a number, boolean or null value
+            self._value_start = self._pos
+        elif self._depth == 2 and self._streaming_items() and self._item_start is None:
+            self._item_start = self._pos
+
+    def _emit_value(self, end: int, events: List[RecipeEvent]) -> None:
+        raw = self._buffer[self._value_start:end].strip()
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        events.append(("field", {"name": self._key, "value": value}))
+
+    def _emit_item(self, end: int, events: List[RecipeEvent]) -> None:
+        raw = self._buffer[self._item_start:end].strip()
+        self._item_start = None
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        if self._key == "instructions" and isinstance(value, str):
+            value = value.strip()
+        events.append((_ITEM_EVENTS[self._key], value))
+
+    def _emit_step(self, end: int, events: List[RecipeEvent]) -> None:
+        raw = self._buffer[self._step_start:end]
+        try:
+            text = json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return
+        events.extend(("step", step) for step in _split_steps(text))
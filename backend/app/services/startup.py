@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.database import session_scope
+from app.migrations import run_migrations
+from app.services.ingredient_registry import ingredient_registry
+from app.services.recipe_index import recipe_index
+
+logger = logging.getLogger(__name__)
+
+# Attempts at building the recipe index, and the delay before the first retry (doubled after each)
+INDEX_BUILD_ATTEMPTS = 3
+INDEX_RETRY_DELAY = 1.0
+
+
+def warm_up_pool(engine: Engine, connections: int) -> int:
+    """Open pooled connections ahead of the first requests; returns how many were opened
+
+    The connections are checked out together so each one is a new
+    connection, then returned to the pool, where they stay open.
+    """
+    pool_size = getattr(engine.pool, "size", None)
+    if callable(pool_size):
+        connections = min(connections, pool_size())
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
+class StartupState:
+    """
+    Database preparation run from the app lifespan, and the readiness it implies
+
+    Importing the app does no I/O; migrations, pool warm-up and loading the
+    ingredient registry happen when the server starts. The app is ready once
+    that is done and the pantry-matching index has been built. If every
+    attempt at building the index fails, startup is marked failed instead.
+    """
+
+    def __init__(self):
+        self.database_ready = False
+        self.failure: Optional[str] = None
+        self.stats: Dict[str, Any] = {
+            "migrations_applied": None,
+            "migration_seconds": None,
+            "warm_connections": None,
+            "warm_up_seconds": None,
+            "index_build_attempts": 0,
+        }
+
+    def prepare_database(self, engine: Engine, warm_connections: int) -> None:
+        """Apply pending migrations, then open pooled connections and load the ingredient registry"""
+        started = time.perf_counter()
+        applied = run_migrations(engine)
+        migrated = time.perf_counter()
+        opened = warm_up_pool(engine, warm_connections) if warm_connections > 0 else 0
+        with session_scope() as db:
+            ingredient_registry.load(db)
+        self.stats.update(
+            migrations_applied=len(applied),
+            migration_seconds=migrated - started,
+            warm_connections=opened,
+            warm_up_seconds=time.perf_counter() - migrated,
+        )
+        self.database_ready = True
+        logger.info(
+            "Database prepared in %.3fs (%d migrations applied, %d connections opened)",
+            time.perf_counter() - started, len(applied), opened
+        )
+
+    def build_recipe_index(self) -> None:
+        """Load the stored recipes into the pantry-matching index"""
+        with session_scope() as db:
+            recipe_index.build(db)
+
+    async def build_recipe_index_with_retries(
+        self,
+        attempts: int = INDEX_BUILD_ATTEMPTS,
+        delay: float = INDEX_RETRY_DELAY
+    ) -> None:
+        """Build the recipe index off the event loop, retrying with backoff; raises the last error"""
+        for attempt in range(1, attempts + 1):
+            self.stats["index_build_attempts"] = attempt
+            try:
+                await run_in_threadpool(self.build_recipe_index)
+                return
+            except Exception:
+                if attempt == attempts:
+                    raise
+                logger.warning(
+                    "Building the recipe index failed (attempt %d of %d), retrying in %.1fs",
+                    attempt, attempts, delay, exc_info=True
+                )
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    def index_build_done(self, task: asyncio.Task) -> None:
+        """Done-callback of the index build task: log a failure and mark startup failed"""
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.failure = f"recipe index: {error!r}"
+            logger.error("Could not build the recipe index; the app will not become ready", exc_info=error)
+
+    def check(self, engine: Engine) -> Dict[str, Any]:
+        """Readiness checks by name, including a round trip to the database"""
+        database = False
+        if self.database_ready:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                database = True
+            except Exception:
+                logger.warning("Readiness check could not reach the database", exc_info=True)
+        return {
+            "migrations": self.database_ready,
+            "database": database,
+            "recipe_index": recipe_index.ready,
+        }
+
+
+# Singleton instance
+startup_state = StartupState()
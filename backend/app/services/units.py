@@ -0,0 +1,99 @@
+import re
+from fractions import Fraction
+from typing import Dict, Optional, Tuple
+from sqlalchemy import case
+from sqlalchemy.sql.elements import ColumnElement
+from app.models.inventory import UnitType
+
+# Canonical base units for each measurement dimension
+MASS = "g"
+VOLUME = "ml"
+COUNT = "count"
+
+# Every UnitType maps to its base unit and the factor converting into it
+CONVERSIONS: Dict[UnitType, Tuple[str, float]] = {
+    UnitType.GRAM: (MASS, 1.0),
+    UnitType.KILOGRAM: (MASS, 1000.0),
+    UnitType.MILLILITER: (VOLUME, 1.0),
+    UnitType.LITER: (VOLUME, 1000.0),
+    UnitType.CUP: (VOLUME, 240.0),
+    UnitType.TABLESPOON: (VOLUME, 15.0),
+    UnitType.TEASPOON: (VOLUME, 5.0),
+    UnitType.PIECE: (COUNT, 1.0),
+}
+
+assert set(CONVERSIONS) == set(UnitType), "Every UnitType needs a base unit conversion"
+
+# Free-form unit spellings found in generated recipes
+UNIT_ALIASES: Dict[str, UnitType] = {
+    "g": UnitType.GRAM, "gr": UnitType.GRAM, "gram": UnitType.GRAM, "grams": UnitType.GRAM,
+    "kg": UnitType.KILOGRAM, "kilo": UnitType.KILOGRAM, "kilogram": UnitType.KILOGRAM,
+    "kilograms": UnitType.KILOGRAM,
+    "ml": UnitType.MILLILITER, "milliliter": UnitType.MILLILITER, "milliliters": UnitType.MILLILITER,
+    "millilitre": UnitType.MILLILITER, "millilitres": UnitType.MILLILITER,
+    "l": UnitType.LITER, "liter": UnitType.LITER, "liters": UnitType.LITER,
+    "litre": UnitType.LITER, "litres": UnitType.LITER,
+    "cup": UnitType.CUP, "cups": UnitType.CUP, "c": UnitType.CUP,
+    "tbsp": UnitType.TABLESPOON, "tablespoon": UnitType.TABLESPOON,
+    "tablespoons": UnitType.TABLESPOON, "tbs": UnitType.TABLESPOON,
+    "tsp": UnitType.TEASPOON, "teaspoon": UnitType.TEASPOON, "teaspoons": UnitType.TEASPOON,
+    "": UnitType.PIECE, "pc": UnitType.PIECE, "pcs": UnitType.PIECE, "piece": UnitType.PIECE,
+    "pieces": UnitType.PIECE, "whole": UnitType.PIECE, "unit": UnitType.PIECE,
+    "units": UnitType.PIECE, "clove": UnitType.PIECE, "cloves": UnitType.PIECE,
+}
+
+_UNICODE_FRACTIONS = {"½": "1/2", "⅓": "1/3", "⅔": "2/3", "¼": "1/4", "¾": "3/4", "⅛": "1/8"}
+_QUANTITY = re.compile(r"(\d+/\d+)|(\d+(?:\.\d+)?)(?:\s+(\d+/\d+))?")
+
+
+def parse_unit(unit: Optional[str]) -> Optional[UnitType]:
+    """Map a free-form unit string to a UnitType, or None if unknown"""
+    key = (unit or "").strip().lower().rstrip(".")
+    if key in UNIT_ALIASES:
+        return UNIT_ALIASES[key]
+    try:
+        return UnitType(key)
+    except ValueError:
+        return None
+
+
+def parse_quantity(quantity) -> Optional[float]:
+    """Parse amounts such as 2, "1.5", "1 1/2", "½" or "2-3" (first value wins)"""
+    if isinstance(quantity, (int, float)):
+        return float(quantity)
+    text = str(quantity or "")
+    for symbol, fraction in _UNICODE_FRACTIONS.items():
+        text = text.replace(symbol, f" {fraction}")
+    match = _QUANTITY.search(text)
+    if not match:
+        return None
+    fraction_only, whole, part = match.groups()
+    try:
+        if fraction_only:
+            return float(Fraction(fraction_only))
+        return float(whole) + (float(Fraction(part)) if part else 0.0)
+    except (ValueError, ZeroDivisionError):
+        # Such as "1/0": treated like any other unparseable amount
+        return None
+
+
+def to_base_quantity(quantity: Optional[float], unit: UnitType) -> Tuple[Optional[float], str]:
+    """Convert a quantity into its base unit, returning (base_quantity, base_unit)"""
+    base_unit, factor = CONVERSIONS[UnitType(unit)]
+    if quantity is None:
+        return None, base_unit
+    return quantity * factor, base_unit
+
+
+def base_unit_expression(unit_column: ColumnElement) -> ColumnElement:
+    """SQL expression mapping a unit column to its base unit"""
+    return case(
+        *[(unit_column == unit, base_unit) for unit, (base_unit, _) in CONVERSIONS.items()]
+    )
+
+
+def base_quantity_expression(quantity: ColumnElement, unit_column: ColumnElement) -> ColumnElement:
+    """SQL expression converting a quantity into base units using the conversion table"""
+    return quantity * case(
+        *[(unit_column == unit, factor) for unit, (_, factor) in CONVERSIONS.items()]
+    )
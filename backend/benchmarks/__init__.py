@@ -0,0 +1,14 @@
+"""
+Benchmark harness for the CookGenie API
+
+Seeds a database with synthetic profiles, inventory and recipes, then drives
+a weighted mix of API requests against the app, either in-process over ASGI
+or against a separate uvicorn server, and reports throughput, latency
+percentiles and SQL statement counts as JSON. Recipe generation uses the stub
+LLM provider, so no network access or API key is needed.
+
+    python -m benchmarks --mix mixed --requests 2000 --concurrency 16
+    python -m benchmarks --server uvicorn --output bench.json
+
+Run from the backend directory. See ``python -m benchmarks --help``.
+"""
@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.environment import configure_environment, git_commit
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the CookGenie API")
+    parser.add_argument("--server", choices=["asgi", "uvicorn"], default="asgi",
+                        help="drive the app in-process over ASGI, or a uvicorn subprocess")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database-url", help="database to seed and use (default: a fresh SQLite file)")
+    parser.add_argument("--profiles", type=int, default=20)
+    parser.add_argument("--items", type=int, default=100, help="inventory items per profile")
+    parser.add_argument("--recipes", type=int, default=50, help="stored recipes per profile")
+    parser.add_argument("--mix", default="mixed",
+                        help='request mix: "read", "mixed", "generate" or "scenario=weight,..."')
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--llm-latency", default="lognormal:0.8:0.35",
+                        help="stub LLM latency distribution (see LLM_STUB_LATENCY)")
+    parser.add_argument("--recipe-cache", default="none", help="RECIPE_CACHE_BACKEND for the run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+async def _run_asgi(args: argparse.Namespace, mix: Dict[str, int], profile_ids: List[int]) -> Dict[str, Any]:
+    import main
+    from app.database import engine
+    from app.services.recipe_index import recipe_index
+    from benchmarks.runner import count_statements, run
+
+    count_statements(engine)
+    async with main.app.router.lifespan_context(main.app):
+        # Startup builds the recipe index in the background; measure with it in place
+        deadline = time.monotonic() + 120
+        while not recipe_index.ready and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+            return await run(
+                client, mix, profile_ids, args.requests, args.concurrency,
+                warmup=args.warmup, seed=args.seed, in_process=True
+            )
+
+
+async def _run_uvicorn(args: argparse.Namespace, mix: Dict[str, int], profile_ids: List[int]) -> Dict[str, Any]:
+    from benchmarks.runner import run
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        env=os.environ.copy()
+    )
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    if (await client.get("/ready")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("uvicorn did not start")
+                await asyncio.sleep(0.2)
+            return await run(
+                client, mix, profile_ids, args.requests, args.concurrency,
+                warmup=args.warmup, seed=args.seed
+            )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main(argv: List[str]) -> None:
+    args = _parse_args(argv)
+    configure_environment(args.database_url, args.llm_latency, args.seed, args.recipe_cache)
+
+    from app.database import engine
+    from app.migrations import run_migrations
+    from benchmarks.scenarios import parse_mix
+    from benchmarks.seed import seed
+
+    mix = parse_mix(args.mix)
+    run_migrations(engine)
+    started = time.perf_counter()
+    seeded = seed(engine, args.profiles, args.items, args.recipes, seed=args.seed)
+    seed_seconds = time.perf_counter() - started
+
+    runner = _run_asgi if args.server == "asgi" else _run_uvicorn
+    results = asyncio.run(runner(args, mix, seeded["profile_ids"]))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.utcnow().isoformat(),
+            "server": args.server,
+            "workers": args.workers if args.server == "uvicorn" else None,
+            "database": engine.dialect.name if args.database_url else "sqlite (fresh file)",
+            "profiles": args.profiles,
+            "items_per_profile": args.items,
+            "recipes_per_profile": args.recipes,
+            "mix": mix,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "llm_latency": args.llm_latency,
+            "recipe_cache": args.recipe_cache,
+            "seed": args.seed,
+        },
+        "seed_seconds": seed_seconds,
+        **results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
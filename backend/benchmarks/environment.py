@@ -0,0 +1,36 @@
+import os
+import subprocess
+import tempfile
+from typing import Optional
+
+
+def configure_environment(
+    database_url: Optional[str],
+    llm_latency: str = "lognormal:0.8:0.35",
+    seed: int = 0,
+    recipe_cache: str = "none",
+    filename: str = "cookgenie_bench.db"
+) -> str:
+    """Point the app at the benchmark database and the stub LLM, before it is imported"""
+    if not database_url:
+        path = os.path.join(tempfile.gettempdir(), filename)
+        if os.path.exists(path):
+            os.remove(path)
+        database_url = f"sqlite:///{path}"
+    os.environ.update({
+        "DATABASE_URL": database_url,
+        "LLM_PROVIDER": "stub",
+        "LLM_STUB_LATENCY": llm_latency,
+        "LLM_STUB_SEED": str(seed),
+        "RECIPE_CACHE_BACKEND": recipe_cache,
+    })
+    return database_url
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
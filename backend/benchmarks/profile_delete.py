@@ -0,0 +1,127 @@
+"""
+Benchmark profile deletion against profiles of growing size
+
+For each size, profiles with that many inventory items and recipes are
+seeded (half their recipes favourited by the owner and some by another
+profile), then deleted through the API in-process. The SQL statement count
+per deletion should stay the same at every size; latency grows only with
+the rows the database itself has to remove.
+
+    python -m benchmarks.profile_delete --sizes 10,100,1000,5000 --repeat 3
+
+Run from the backend directory.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from statistics import median
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.environment import configure_environment, git_commit
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.profile_delete", description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="database to seed and use (default: a fresh SQLite file)")
+    parser.add_argument("--sizes", default="10,100,1000",
+                        help="comma-separated inventory items and recipes per deleted profile")
+    parser.add_argument("--repeat", type=int, default=3, help="profiles deleted per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def _add_favorites(engine, profile_ids: List[int], neighbour_id: int) -> None:
+    """Favourite half of each profile's recipes, and a few of them from the neighbour profile"""
+    from sqlalchemy import insert, select
+    from app.models.recipe import Recipe, RecipeFavorite
+
+    with engine.begin() as conn:
+        rows = conn.execute(
+            select(Recipe.id, Recipe.profile_id).where(Recipe.profile_id.in_(profile_ids)).order_by(Recipe.id)
+        ).all()
+        recipe_ids: Dict[int, List[int]] = {}
+        for row in rows:
+            recipe_ids.setdefault(row.profile_id, []).append(row.id)
+        favorites = []
+        for profile_id, ids in recipe_ids.items():
+            favorites += [{"profile_id": profile_id, "recipe_id": recipe_id} for recipe_id in ids[::2]]
+            favorites += [{"profile_id": neighbour_id, "recipe_id": recipe_id} for recipe_id in ids[1::50]]
+        if favorites:
+            conn.execute(insert(RecipeFavorite), favorites)
+
+
+async def _delete_profiles(profile_ids: List[int]) -> List[Dict[str, Any]]:
+    import main
+    from benchmarks.runner import _statements
+
+    samples = []
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=300) as client:
+            for profile_id in profile_ids:
+                counter = [0]
+                token = _statements.set(counter)
+                started = time.perf_counter()
+                try:
+                    response = await client.delete(f"/api/profiles/{profile_id}")
+                finally:
+                    _statements.reset(token)
+                if response.status_code != 204:
+                    raise RuntimeError(f"Deleting profile {profile_id} returned {response.status_code}")
+                samples.append({"seconds": time.perf_counter() - started, "statements": counter[0]})
+    return samples
+
+
+def main(argv: List[str]) -> None:
+    args = _parse_args(argv)
+    configure_environment(args.database_url, seed=args.seed, filename="cookgenie_bench_delete.db")
+
+    from app.database import engine
+    from app.migrations import run_migrations
+    from benchmarks.runner import count_statements
+    from benchmarks.seed import seed
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    run_migrations(engine)
+    count_statements(engine)
+    neighbour_id = seed(engine, 1, 10, 10, seed=args.seed)["profile_ids"][0]
+
+    results = []
+    for size in sizes:
+        profile_ids = seed(engine, args.repeat, size, size, seed=args.seed)["profile_ids"]
+        _add_favorites(engine, profile_ids, neighbour_id)
+        samples = asyncio.run(_delete_profiles(profile_ids))
+        results.append({
+            "size": size,
+            "deleted": len(samples),
+            "statements": sorted({sample["statements"] for sample in samples}),
+            "median_ms": round(median(sample["seconds"] for sample in samples) * 1000, 2),
+            "max_ms": round(max(sample["seconds"] for sample in samples) * 1000, 2),
+        })
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.utcnow().isoformat(),
+            "database": engine.dialect.name if args.database_url else "sqlite (fresh file)",
+            "sizes": sizes,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
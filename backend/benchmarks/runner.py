@@ -0,0 +1,106 @@
+import asyncio
+import contextvars
+import random
+import time
+from typing import Any, Dict, List, Optional
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from benchmarks.scenarios import SCENARIOS, pick
+
+# Per-request statement counter; the app's threadpool calls inherit the request's context
+_statements: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar(
+    "benchmark_statements", default=None
+)
+
+
+def count_statements(engine: Engine) -> None:
+    """Count SQL statements issued on behalf of the current benchmark request"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter = _statements.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+async def run(
+    client: httpx.AsyncClient,
+    mix: Dict[str, int],
+    profile_ids: List[int],
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+    seed: int = 0,
+    in_process: bool = False
+) -> Dict[str, Any]:
+    """
+    Issue requests from a fixed number of concurrent workers and summarize them
+
+    Each worker sends its next request as soon as the previous one returns
+    (a closed loop). Warm-up requests are sent first and not recorded.
+    Statement counts are only available in-process.
+    """
+    rng = random.Random(seed)
+    plan = [(pick(mix, rng), rng.choice(profile_ids), random.Random(rng.random())) for _ in range(warmup + requests)]
+    samples: Dict[str, List[Dict[str, Any]]] = {name: [] for name in mix}
+    position = 0
+
+    async def worker(record: bool, stop: int) -> None:
+        nonlocal position
+        while position < stop:
+            name, profile_id, request_rng = plan[position]
+            position += 1
+            counter = [0]
+            token = _statements.set(counter)
+            started = time.perf_counter()
+            try:
+                response = await SCENARIOS[name](client, profile_id, request_rng)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            finally:
+                _statements.reset(token)
+            if record:
+                samples[name].append({
+                    "seconds": time.perf_counter() - started,
+                    "ok": ok,
+                    "statements": counter[0],
+                })
+
+    if warmup:
+        await asyncio.gather(*[worker(False, warmup) for _ in range(concurrency)])
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(True, warmup + requests) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    return {
+        "elapsed_seconds": elapsed,
+        "total": _summarize([s for rows in samples.values() for s in rows], elapsed, in_process),
+        "scenarios": {
+            name: _summarize(rows, elapsed, in_process) for name, rows in samples.items() if rows
+        },
+    }
+
+
+def _summarize(rows: List[Dict[str, Any]], elapsed: float, in_process: bool) -> Dict[str, Any]:
+    latencies_ms = [row["seconds"] * 1000 for row in rows]
+    statements = [row["statements"] for row in rows]
+    return {
+        "requests": len(rows),
+        "errors": sum(1 for row in rows if not row["ok"]),
+        "throughput_rps": len(rows) / elapsed if elapsed else None,
+        "p50_ms": percentile(latencies_ms, 0.50),
+        "p95_ms": percentile(latencies_ms, 0.95),
+        "p99_ms": percentile(latencies_ms, 0.99),
+        "max_ms": max(latencies_ms) if latencies_ms else None,
+        "statements_per_request": sum(statements) / len(rows) if in_process and rows else None,
+        "statements_max": max(statements) if in_process and rows else None,
+    }
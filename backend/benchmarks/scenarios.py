@@ -0,0 +1,95 @@
+import random
+from typing import Any, Awaitable, Callable, Dict, List
+import httpx
+from benchmarks.seed import INGREDIENTS
+
+# A scenario issues one request for a randomly chosen seeded profile
+Scenario = Callable[[httpx.AsyncClient, int, random.Random], Awaitable[httpx.Response]]
+
+
+async def list_inventory(client: httpx.AsyncClient, profile_id: int, rng: random.Random) -> httpx.Response:
+    return await client.get(f"/api/inventory/profile/{profile_id}", params={"limit": 50})
+
+
+async def list_recipes(client: httpx.AsyncClient, profile_id: int, rng: random.Random) -> httpx.Response:
+    return await client.get(f"/api/recipes/profile/{profile_id}")
+
+
+async def list_favorites(client: httpx.AsyncClient, profile_id: int, rng: random.Random) -> httpx.Response:
+    return await client.get(f"/api/recipes/favorites/profile/{profile_id}")
+
+
+async def expiry_alerts(client: httpx.AsyncClient, profile_id: int, rng: random.Random) -> httpx.Response:
+    return await client.get(f"/api/inventory/profile/{profile_id}/expiry-alerts")
+
+
+async def match_recipes(client: httpx.AsyncClient, profile_id: int, rng: random.Random) -> httpx.Response:
+    return await client.get(f"/api/recipes/match/{profile_id}", params={"limit": 10})
+
+
+async def search_recipes(client: httpx.AsyncClient, profile_id: int, rng: random.Random) -> httpx.Response:
+    # A partly typed ingredient name, as in search-as-you-type
+    name = rng.choice(INGREDIENTS)
+    return await client.get("/api/recipes/search", params={
+        "profile_id": profile_id,
+        "q": name[:rng.randint(3, len(name))],
+    })
+
+
+async def add_inventory(client: httpx.AsyncClient, profile_id: int, rng: random.Random) -> httpx.Response:
+    return await client.post("/api/inventory/", json={
+        "profile_id": profile_id,
+        "name": rng.choice(INGREDIENTS),
+        "quantity": rng.randint(1, 10),
+        "unit": "piece",
+    })
+
+
+async def generate_recipe(client: httpx.AsyncClient, profile_id: int, rng: random.Random) -> httpx.Response:
+    # A variant-free request with a random subset keeps most calls off the recipe cache
+    return await client.post("/api/recipes/generate", json={
+        "profile_id": profile_id,
+        "ingredients": rng.sample(INGREDIENTS, 6),
+    })
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "list_inventory": list_inventory,
+    "list_recipes": list_recipes,
+    "list_favorites": list_favorites,
+    "expiry_alerts": expiry_alerts,
+    "match_recipes": match_recipes,
+    "search_recipes": search_recipes,
+    "add_inventory": add_inventory,
+    "generate_recipe": generate_recipe,
+}
+
+# Named request mixes: scenario name -> relative weight
+MIXES: Dict[str, Dict[str, int]] = {
+    "read": {"list_inventory": 4, "list_recipes": 4, "list_favorites": 1, "expiry_alerts": 2, "match_recipes": 1,
+             "search_recipes": 2},
+    "mixed": {
+        "list_inventory": 4, "list_recipes": 4, "list_favorites": 1, "expiry_alerts": 2,
+        "match_recipes": 1, "search_recipes": 2, "add_inventory": 2, "generate_recipe": 1,
+    },
+    "generate": {"generate_recipe": 1},
+}
+
+
+def pick(mix: Dict[str, int], rng: random.Random) -> str:
+    """Choose a scenario name according to the mix weights"""
+    names: List[str] = list(mix)
+    return rng.choices(names, weights=[mix[name] for name in names])[0]
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    """A named mix, or an explicit "scenario=weight,..." list"""
+    if spec in MIXES:
+        return MIXES[spec]
+    mix: Dict[str, Any] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name.strip()}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
@@ -0,0 +1,113 @@
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from app.database import session_scope
+from app.models import InventoryItem, Profile, Recipe, UserPreference
+from app.models.inventory import UnitType
+from app.services.expiry_service import ExpiryService
+from app.services.ingredient_registry import ingredient_registry
+from app.services.recipe_search import RecipeSearch
+from app.services.units import to_base_quantity
+
+# Pantry vocabulary; real names so normalization and matching behave as in production
+INGREDIENTS = [
+    "tomato", "onion", "garlic", "ginger", "potato", "carrot", "spinach", "bell pepper",
+    "chili pepper", "cilantro", "basil", "mushroom", "zucchini", "eggplant", "cauliflower",
+    "broccoli", "cabbage", "peas", "corn", "green beans", "cucumber", "lettuce", "avocado",
+    "lemon", "lime", "apple", "banana", "mango", "chickpea", "lentils", "kidney beans",
+    "black beans", "rice", "pasta", "flour", "oats", "bread", "tortilla", "quinoa", "noodles",
+    "egg", "milk", "butter", "yogurt", "cream", "paneer", "cheddar", "parmesan", "mozzarella",
+    "tofu", "chicken breast", "chicken thigh", "beef", "pork", "lamb", "salmon", "shrimp",
+    "tuna", "cumin", "turmeric", "paprika", "cinnamon", "oregano", "thyme", "coconut milk",
+    "soy sauce", "vinegar", "honey", "peanut butter", "almonds", "cashews", "walnuts",
+]
+CATEGORIES = ["vegetable", "fruit", "dairy", "grain", "protein", "spice", "pantry"]
+CUISINES = ["Indian", "Italian", "Mexican", "Thai", "Mediterranean", "Japanese"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+UNITS = [UnitType.GRAM, UnitType.KILOGRAM, UnitType.PIECE, UnitType.MILLILITER, UnitType.CUP]
+
+
+def seed(engine: Engine, profiles: int, items: int, recipes: int, seed: int = 0) -> Dict[str, List[int]]:
+    """
+    Insert profiles, each with ``items`` inventory rows and ``recipes`` recipes
+
+    Rows are written with bulk inserts rather than through the services, then
+    expiry alerts are materialized and the search index rebuilt once. Returns the ids of the new profiles.
+    """
+    rng = random.Random(seed)
+    ingredient_ids = dict(zip(INGREDIENTS, ingredient_registry.resolve_many(INGREDIENTS)))
+    now = datetime.utcnow()
+    today = date.today()
+
+    with engine.begin() as conn:
+        profile_ids = conn.execute(
+            insert(Profile).returning(Profile.id, sort_by_parameter_order=True),
+            [{"name": f"Bench profile {i}", "created_at": now, "updated_at": now} for i in range(profiles)]
+        ).scalars().all()
+
+        conn.execute(insert(UserPreference), [
+            {
+                "profile_id": profile_id,
+                "disliked_ingredients": [name],
+                "disliked_ingredient_ids": [ingredient_ids[name]],
+                "max_cooking_time": rng.choice([None, 30, 45, 60]),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for profile_id, name in zip(profile_ids, (rng.choice(INGREDIENTS) for _ in profile_ids))
+        ])
+
+        inventory_rows = []
+        recipe_rows = []
+        for profile_id in profile_ids:
+            for _ in range(items):
+                name = rng.choice(INGREDIENTS)
+                unit = rng.choice(UNITS)
+                quantity = float(rng.randint(1, 500))
+                base_quantity, base_unit = to_base_quantity(quantity, unit)
+                inventory_rows.append({
+                    "profile_id": profile_id,
+                    "name": name,
+                    "ingredient_id": ingredient_ids[name],
+                    "quantity": quantity,
+                    "unit": unit,
+                    "base_quantity": base_quantity,
+                    "base_unit": base_unit,
+                    "category": rng.choice(CATEGORIES),
+                    "expiry_date": today + timedelta(days=rng.randint(-3, 60)) if rng.random() < 0.7 else None,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+            for _ in range(recipes):
+                names = rng.sample(INGREDIENTS, rng.randint(4, 10))
+                recipe_rows.append({
+                    "profile_id": profile_id,
+                    "title": f"{names[0].title()} {rng.choice(['Curry', 'Bake', 'Salad', 'Soup'])}",
+                    "cuisine_type": rng.choice(CUISINES),
+                    "cooking_time": rng.choice([15, 20, 30, 45, 60, 90]),
+                    "difficulty": rng.choice(DIFFICULTIES),
+                    "servings": rng.choice([1, 2, 4]),
+                    "ingredients": [
+                        {"name": name, "quantity": str(rng.randint(1, 300)), "unit": "g",
+                         "ingredient_id": ingredient_ids[name]}
+                        for name in names
+                    ],
+                    "instructions": "\n".join(f"{i}. Cook the {name}." for i, name in enumerate(names, 1)),
+                    "utensils_required": ["pan"],
+                    "generated_by_ai": True,
+                    "created_at": now,
+                })
+
+        # Chunked so very large seeds don't build one enormous parameter list
+        for start in range(0, len(inventory_rows), 5000):
+            conn.execute(insert(InventoryItem), inventory_rows[start:start + 5000])
+        for start in range(0, len(recipe_rows), 5000):
+            conn.execute(insert(Recipe), recipe_rows[start:start + 5000])
+        RecipeSearch.rebuild(conn)
+
+    with session_scope() as db:
+        ExpiryService.refresh_alerts(db)
+        db.commit()
+    return {"profile_ids": list(profile_ids)}
@@ -0,0 +1,123 @@
+"""
+Measure cold-start cost: importing the app, and startup until /ready
+
+Each run starts a fresh interpreter that imports ``main``, runs the app
+lifespan against a migrated database and polls /ready in-process. The
+report gives the median and worst times per phase and, with --importtime,
+the modules that take longest to import. The run fails (exit status 1)
+when the median import time exceeds --budget-ms, so it can gate a build.
+
+    python -m benchmarks.startup --runs 5 --budget-ms 1500
+
+Run from the backend directory.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from statistics import median
+from typing import Any, Dict, List
+
+from benchmarks.environment import configure_environment, git_commit
+
+# Runs in the child interpreter; prints one JSON line of phase timings
+_MEASURE = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def start():
+    import httpx
+    async with main.app.router.lifespan_context(main.app):
+        lifespan_done = time.perf_counter()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            while (response := await client.get("/ready")).status_code != 200:
+                if response.json()["status"] == "failed":
+                    raise SystemExit(response.json()["error"])
+                await asyncio.sleep(0.01)
+        return lifespan_done, time.perf_counter()
+
+lifespan_done, ready = asyncio.run(start())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "lifespan_ms": (lifespan_done - imported) * 1000,
+    "ready_ms": (ready - imported) * 1000,
+}))
+"""
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="database to start against (default: a fresh SQLite file)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="maximum median import time")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N",
+                        help="also list the N modules with the longest cumulative import time")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def _slowest_imports(count: int) -> List[Dict[str, Any]]:
+    """Modules with the longest cumulative import time, from python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, check=True, env=os.environ.copy()
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules.append({"module": name.strip(), "cumulative_ms": int(cumulative) / 1000})
+    return sorted(modules, key=lambda module: module["cumulative_ms"], reverse=True)[:count]
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {"median": round(median(values), 1), "max": round(max(values), 1)}
+
+
+def main(argv: List[str]) -> int:
+    args = _parse_args(argv)
+    configure_environment(args.database_url, filename="cookgenie_bench_startup.db")
+    # The first start applies the migrations; measured runs see an up-to-date schema
+    subprocess.run([sys.executable, "-c", _MEASURE], capture_output=True, check=True, env=os.environ.copy())
+
+    samples = []
+    for _ in range(args.runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _MEASURE], capture_output=True, text=True, check=True, env=os.environ.copy()
+        )
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    import_ms = median(sample["import_ms"] for sample in samples)
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.utcnow().isoformat(),
+            "runs": args.runs,
+            "budget_ms": args.budget_ms,
+        },
+        **{
+            phase: _summary([sample[f"{phase}_ms"] for sample in samples])
+            for phase in ("import", "lifespan", "ready")
+        },
+        "within_budget": import_ms <= args.budget_ms,
+    }
+    if args.importtime:
+        report["slowest_imports"] = _slowest_imports(args.importtime)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0 if report["within_budget"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
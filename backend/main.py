@@ -1,16 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.config import get_settings
+from app.database import engine
 from app.api import profiles, inventory, recipes, preferences
+from fastapi.concurrency import run_in_threadpool
+from app.services.expiry_service import expiry_scanner
+from app.services.recipe_cache import recipe_cache
+from app.services.gemini_service import gemini_service
+from app.services.collection_versions import response_cache
+from app.services.metrics import MetricsMiddleware, instrument_engine, metrics
+from app.services.startup import startup_state
+
+settings = get_settings()
+
+# Count and time SQL statements, and export service stats on /metrics
+instrument_engine(engine)
+metrics.register_stats("recipe_cache", recipe_cache.stats)
+metrics.register_stats("expiry_scan", lambda: expiry_scanner.stats)
+metrics.register_stats("llm", lambda: gemini_service.stats)
+metrics.register_stats("llm_client", gemini_service.client.stats)
+metrics.register_stats("response_cache", response_cache.stats)
+metrics.register_stats("startup", lambda: startup_state.stats)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Importing the app does no I/O: the schema is brought up to date and
+    # pooled connections are opened here, before requests are accepted
+    await run_in_threadpool(startup_state.prepare_database, engine, settings.db_warmup_connections)
+    # Recompute expiry alerts now and at every day rollover
+    scanner_task = asyncio.create_task(expiry_scanner.run_forever())
+    # Load stored recipes into the pantry-matching index without delaying startup
+    index_task = asyncio.create_task(startup_state.build_recipe_index_with_retries())
+    index_task.add_done_callback(startup_state.index_build_done)
+    yield
+    scanner_task.cancel()
+    index_task.cancel()
+    # A build already in a worker thread runs to completion before its task ends
+    await asyncio.gather(scanner_task, index_task, return_exceptions=True)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Initialize FastAPI app
 app = FastAPI(
     title="CookGenie API",
     description="AI-powered recipe generator and kitchen inventory manager",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -24,8 +62,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing", "ETag", "X-Recipe-Source"],
 )
 
+# Outermost, so the timings include the other middleware
+app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing_header)
+
 # Include routers
 app.include_router(profiles.router)
 app.include_router(inventory.router)
@@ -44,9 +86,29 @@ def read_root():
 
 @app.get("/health")
 def health_check():
+    """Liveness: the process is serving requests"""
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+def readiness_check():
+    """Readiness: startup has finished and the database answers"""
+    checks = startup_state.check(engine)
+    ready = all(checks.values())
+    if ready:
+        body = {"status": "ready", "checks": checks}
+    elif startup_state.failure:
+        body = {"status": "failed", "checks": checks, "error": startup_state.failure}
+    else:
+        body = {"status": "starting", "checks": checks}
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,71 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Settings are read when app modules are first imported, so the test
+# database and the stub LLM are configured before any of them load
+_TEST_DIR = tempfile.mkdtemp(prefix="cookgenie_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DIR, 'test.db')}"
+os.environ["LLM_PROVIDER"] = "stub"
+os.environ["RECIPE_CACHE_BACKEND"] = "none"
+# Any relationship access not covered by an explicit loader option fails the test
+os.environ["DB_LAZY_RAISE"] = "true"
+
+import pytest
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine as app_engine
+from app.migrations import run_migrations
+from app.models.profile import Profile
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """The app's engine, on a migrated temporary SQLite database"""
+    run_migrations(app_engine)
+    return app_engine
+
+
+@pytest.fixture
+def db(engine):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_profile(db):
+    """Factory creating new, empty profiles"""
+    def make(name: str = "Test profile") -> Profile:
+        db_profile = Profile(name=name)
+        db.add(db_profile)
+        db.commit()
+        return db_profile
+
+    return make
+
+
+@pytest.fixture
+def profile(make_profile):
+    return make_profile()
+
+
+@pytest.fixture
+def count_statements(engine):
+    """Context manager yielding a list whose length is the SQL statements run inside it"""
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return counting
@@ -0,0 +1,33 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.schemas.preference import UserPreferenceCreate
+from app.services.preference_service import PreferenceService
+from main import app
+
+
+@pytest.fixture
+def client(engine):
+    # Not used as a context manager, so the lifespan (scanner, index build) does not run
+    return TestClient(app)
+
+
+def test_if_none_match_star_needs_a_current_representation(client, db, profile):
+    url = f"/api/preferences/{profile.id}"
+
+    response = client.get(url, headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+
+    PreferenceService.create_preference(db, UserPreferenceCreate(profile_id=profile.id))
+    response = client.get(url, headers={"If-None-Match": "*"})
+    assert response.status_code == 304
+    assert response.headers["ETag"]
+
+
+def test_if_none_match_etag_revalidates(client, db, profile):
+    url = f"/api/preferences/{profile.id}"
+    PreferenceService.create_preference(db, UserPreferenceCreate(profile_id=profile.id))
+
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"stale"'}).status_code == 200
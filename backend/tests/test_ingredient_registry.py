@@ -0,0 +1,19 @@
+from app.services.ingredient_registry import IngredientRegistry
+
+
+def test_fuzzy_memo_is_bounded(engine):
+    registry = IngredientRegistry()
+    registry.lookup("tomato")
+    maxsize = registry._fuzzy.cache_info().maxsize
+
+    # Normalization drops digits, so the names are spelled out in letters
+    for i in range(maxsize + 100):
+        registry.lookup("unknown " + "".join(chr(ord("a") + int(digit)) for digit in str(i)))
+
+    assert registry._fuzzy.cache_info().currsize == maxsize
+
+
+def test_fuzzy_lookup_matches_misspellings(engine):
+    registry = IngredientRegistry()
+    assert registry.lookup("tumeric") == registry.lookup("turmeric") is not None
+    assert registry.lookup("tumeric") == registry.lookup("tumeric")
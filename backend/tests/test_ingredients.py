@@ -0,0 +1,17 @@
+import pytest
+
+from app.services.ingredients import match_ingredient
+
+
+@pytest.mark.parametrize("name, candidates, expected", [
+    ("Red Onions", ["onion", "garlic"], "onion"),
+    ("onion", ["red onion"], "red onion"),
+    ("unsalted butter", ["butter"], "butter"),
+    ("tomatoe", ["tomato"], "tomato"),
+    ("black pepper", ["bell pepper"], None),
+    ("coconut milk", ["milk"], None),
+    ("milk", ["coconut milk"], None),
+    ("tomato", ["tomato paste"], None),
+])
+def test_match_ingredient(name, candidates, expected):
+    assert match_ingredient(name, candidates) == expected
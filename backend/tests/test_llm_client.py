@@ -0,0 +1,234 @@
+import asyncio
+import time
+from typing import AsyncIterator, List, Tuple, Union
+
+import pytest
+
+from app.services.llm_client import (
+    CircuitBreaker,
+    LLMResponseError,
+    LLMTimeoutError,
+    LLMUnavailableError,
+    LLMUpstreamError,
+    ResilientLLMClient,
+)
+from app.services.llm_providers import LLMProvider, LLMResponse
+
+Step = Tuple[float, Union[str, Exception]]
+
+
+class FakeProvider(LLMProvider):
+    """Answers each call from a script of (delay, text or exception) steps
+
+    Calls past the end of the script repeat its last step.
+    """
+
+    name = "fake"
+
+    def __init__(self, *steps: Step):
+        self.steps: List[Step] = list(steps)
+        self.calls = 0
+
+    def _next(self) -> Step:
+        step = self.steps[min(self.calls, len(self.steps) - 1)]
+        self.calls += 1
+        return step
+
+    async def generate(self, prompt: str) -> LLMResponse:
+        delay, result = self._next()
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return LLMResponse(result)
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[LLMResponse]:
+        delay, result = self._next()
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        for word in result.split():
+            yield LLMResponse(word)
+
+
+def _retryable() -> LLMUpstreamError:
+    return LLMUpstreamError("overloaded", retryable=True)
+
+
+def _client(provider: FakeProvider, **options) -> ResilientLLMClient:
+    options.setdefault("timeout", 1.0)
+    options.setdefault("backoff_base", 0.001)
+    options.setdefault("backoff_max", 0.002)
+    return ResilientLLMClient(provider, **options)
+
+
+def test_call_past_deadline_times_out():
+    client = _client(FakeProvider((0.2, "late")), timeout=0.02, max_retries=0)
+
+    with pytest.raises(LLMTimeoutError):
+        asyncio.run(client.generate("prompt"))
+    assert client.counters["timeouts"] == 1
+
+
+def test_retryable_failures_are_retried_then_succeed():
+    provider = FakeProvider((0, _retryable()), (0, _retryable()), (0, "recipe"))
+    client = _client(provider, max_retries=2)
+
+    response = asyncio.run(client.generate("prompt"))
+
+    assert response.text == "recipe"
+    assert provider.calls == 3
+    assert client.counters["retries"] == 2
+
+
+def test_non_retryable_failures_are_not_retried():
+    provider = FakeProvider((0, LLMResponseError("no recipe")))
+    client = _client(provider, max_retries=3)
+
+    with pytest.raises(LLMResponseError):
+        asyncio.run(client.generate("prompt"))
+    assert provider.calls == 1
+
+
+def test_backoff_stays_within_the_exponential_cap():
+    client = _client(FakeProvider((0, "recipe")), backoff_base=0.5, backoff_max=3.0)
+
+    for attempt, cap in [(0, 0.5), (1, 1.0), (2, 2.0), (5, 3.0)]:
+        assert all(0 <= client._backoff(attempt) <= cap for _ in range(50))
+
+
+def test_breaker_opens_and_rejects_calls():
+    provider = FakeProvider((0, _retryable()))
+    breaker = CircuitBreaker(failure_threshold=0.5, min_calls=3, open_seconds=60)
+    client = _client(provider, max_retries=0, breaker=breaker)
+
+    for _ in range(3):
+        with pytest.raises(LLMUpstreamError):
+            asyncio.run(client.generate("prompt"))
+    with pytest.raises(LLMUnavailableError) as rejected:
+        asyncio.run(client.generate("prompt"))
+
+    assert breaker.state == "open" and breaker.times_opened == 1
+    assert rejected.value.retry_after > 0
+    assert provider.calls == 3
+
+
+def _opened_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(min_calls=2, window=4, open_seconds=0.05)
+    for _ in range(2):
+        breaker.record(False, breaker.before_call())
+    assert breaker.state == "open"
+    return breaker
+
+
+def test_half_open_probe_success_closes_the_breaker():
+    breaker = _opened_breaker()
+    time.sleep(0.06)
+
+    probe = breaker.before_call()
+    assert probe and breaker.state == "half_open"
+    # Only one probe at a time
+    with pytest.raises(LLMUnavailableError):
+        breaker.before_call()
+    breaker.record(True, probe)
+
+    assert breaker.state == "closed"
+
+
+def test_half_open_probe_failure_reopens_the_breaker():
+    breaker = _opened_breaker()
+    time.sleep(0.06)
+
+    breaker.record(False, breaker.before_call())
+
+    assert breaker.state == "open"
+    assert breaker.times_opened == 2
+
+
+def test_calls_in_flight_when_the_breaker_opened_are_ignored():
+    breaker = CircuitBreaker(min_calls=2, window=4, open_seconds=60)
+    in_flight = breaker.before_call()
+    for _ in range(2):
+        breaker.record(False, breaker.before_call())
+
+    breaker.record(True, in_flight)
+
+    assert breaker.state == "open"
+
+
+def test_hedged_request_wins_over_a_slow_first_attempt():
+    provider = FakeProvider((0.5, "slow"), (0, "fast"))
+    client = _client(provider, hedge_delay=0.02)
+
+    response = asyncio.run(client.generate("prompt"))
+
+    assert response.text == "fast"
+    assert client.counters["hedges"] == 1
+    assert client.counters["hedge_wins"] == 1
+
+
+def test_cancelled_caller_leaves_no_attempt_running():
+    client = _client(FakeProvider((1.0, "slow")), hedge_delay=0.5)
+
+    async def run():
+        call = asyncio.create_task(client.generate("prompt"))
+        # Cancelled while waiting out the hedge delay on the first attempt
+        await asyncio.sleep(0.02)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+        # Let the cancellation of anything the call started finish unwinding
+        await asyncio.sleep(0.01)
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(run()) == set()
+
+
+def test_no_hedge_when_the_first_attempt_is_quick():
+    provider = FakeProvider((0, "quick"))
+    client = _client(provider, hedge_delay=0.2)
+
+    assert asyncio.run(client.generate("prompt")).text == "quick"
+    assert client.counters["hedges"] == 0
+
+
+def test_backoff_does_not_hold_a_concurrency_slot():
+    provider = FakeProvider((0, _retryable()), (0, "second"), (0, "first"))
+    client = _client(provider, max_concurrency=1)
+    client._backoff = lambda attempt: 0.3
+
+    async def run():
+        first = asyncio.create_task(client.generate("prompt"))
+        # The first call has failed once and is sleeping before its retry
+        await asyncio.sleep(0.02)
+        started = time.perf_counter()
+        second = await client.generate("prompt")
+        return second.text, time.perf_counter() - started, (await first).text
+
+    second, waited, first = asyncio.run(run())
+
+    assert (second, first) == ("second", "first")
+    assert waited < 0.2
+
+
+def test_stream_holds_its_slot_until_it_ends():
+    client = _client(FakeProvider((0, "one two three"), (0, "recipe")), max_concurrency=1)
+
+    async def run():
+        stream = client.generate_stream("prompt")
+        await stream.__anext__()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.generate("prompt"), 0.05)
+        await stream.aclose()
+        return await asyncio.wait_for(client.generate("prompt"), 0.05)
+
+    assert asyncio.run(run()).text == "recipe"
+
+
+def test_stream_records_one_outcome_per_call():
+    breaker = CircuitBreaker()
+    client = _client(FakeProvider((0, "a rice bowl")), breaker=breaker)
+
+    async def consume():
+        return [chunk.text async for chunk in client.generate_stream("prompt")]
+
+    assert asyncio.run(consume()) == ["a", "rice", "bowl"]
+    assert breaker.stats()["recent_calls"] == 1
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import Session
+from app.migrations import run_migrations
+from app.services.expiry_service import ExpiryService
+from app.services.recipe_service import RecipeService
+
+
+@pytest.fixture
+def fresh_engine(tmp_path):
+    """A new SQLite database brought up to date by the migrations alone"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+def _query_plans(engine, call):
+    """EXPLAIN QUERY PLAN details of every SELECT that call(session) runs"""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "INSERT INTO EXPIRY_ALERTS")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with Session(engine) as session:
+            call(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in captured:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append(" | ".join(row[-1] for row in rows))
+    return plans
+
+
+def test_recipe_listing_uses_profile_created_index(fresh_engine):
+    [plan] = _query_plans(
+        fresh_engine, lambda db: RecipeService.get_recipes_with_favorite_flags(db, 1, 20)
+    )
+    assert "USING INDEX ix_recipes_profile_created" in plan
+    assert "USE TEMP B-TREE" not in plan
+    # The is_favorite flag is a lookup on the unique favourites index
+    assert "USING INDEX uq_recipe_favorites_profile_recipe" in plan
+
+
+def test_expiry_queries_use_profile_expiry_indexes(fresh_engine):
+    def scan_and_read(db):
+        ExpiryService.refresh_alerts(db, profile_id=1)
+        ExpiryService.get_alerts(db, 1)
+
+    scan, read = _query_plans(fresh_engine, scan_and_read)
+    assert "ix_inventory_items_profile_expiry" in scan
+    assert "ix_expiry_alerts_profile_expiry" in read
+
+
+def test_favorites_have_unique_profile_recipe_index(fresh_engine):
+    indexes = {index["name"]: index for index in inspect(fresh_engine).get_indexes("recipe_favorites")}
+    index = indexes["uq_recipe_favorites_profile_recipe"]
+    assert index["column_names"] == ["profile_id", "recipe_id"]
+    assert index["unique"]
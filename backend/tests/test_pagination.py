@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.inventory import InventoryItem, UnitType
+from app.models.recipe import Recipe, RecipeFavorite
+from main import app
+
+
+@pytest.fixture
+def client(engine):
+    return TestClient(app)
+
+
+def _add_inventory(db, profile_id, count):
+    db.add_all(
+        InventoryItem(profile_id=profile_id, name=f"item {i}", quantity=1, unit=UnitType.PIECE)
+        for i in range(count)
+    )
+    db.commit()
+
+
+def _add_favorites(db, profile_id, count):
+    recipes = [
+        Recipe(profile_id=profile_id, title=f"Recipe {i}", ingredients=[], instructions="1. Cook.")
+        for i in range(count)
+    ]
+    db.add_all(recipes)
+    db.flush()
+    db.add_all(RecipeFavorite(profile_id=profile_id, recipe_id=recipe.id) for recipe in recipes)
+    db.commit()
+
+
+@pytest.mark.parametrize("path, add", [
+    ("/api/inventory/profile/{}", _add_inventory),
+    ("/api/recipes/favorites/profile/{}", _add_favorites),
+])
+def test_listings_are_paged_by_default(client, db, profile, path, add):
+    add(db, profile.id, 60)
+    url = path.format(profile.id)
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert len(first.json()) == 50
+
+    rest = client.get(url, params={"cursor": first.headers["X-Next-Cursor"]})
+    assert len(rest.json()) == 10
+    assert "X-Next-Cursor" not in rest.headers
+    assert {row["id"] for row in first.json()}.isdisjoint(row["id"] for row in rest.json())
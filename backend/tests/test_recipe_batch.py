@@ -0,0 +1,23 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.schemas.recipe import RecipeBatchGenerateRequest
+from main import app
+
+REQUEST = {"profile_id": 1, "ingredients": ["rice", "onion"]}
+
+
+def test_variants_apply_to_a_single_request():
+    batch = RecipeBatchGenerateRequest(request=REQUEST, variants=3)
+    assert batch.variants == 3
+
+
+def test_variants_with_a_request_list_are_rejected(engine):
+    with pytest.raises(ValidationError, match="'variants' only applies to 'request'"):
+        RecipeBatchGenerateRequest(requests=[REQUEST, REQUEST], variants=2)
+
+    response = TestClient(app).post(
+        "/api/recipes/generate/batch", json={"requests": [REQUEST], "variants": 2}
+    )
+    assert response.status_code == 422
@@ -0,0 +1,24 @@
+from app.config import get_settings
+from app.services.recipe_cache import build_cache_key
+
+MAX_INGREDIENTS = get_settings().llm_prompt_max_ingredients
+
+
+def _pantry(count, prefix="item"):
+    return [f"{prefix} {chr(ord('a') + i // 26)}{chr(ord('a') + i % 26)}" for i in range(count)]
+
+
+def test_key_ignores_ingredients_left_out_of_the_prompt(engine):
+    listed = _pantry(MAX_INGREDIENTS)
+
+    assert build_cache_key(listed + ["saffron"]) == build_cache_key(listed + ["vanilla"])
+    assert build_cache_key(listed + ["salt"]) == build_cache_key(listed)
+
+
+def test_key_follows_the_prompt_order(engine):
+    assert build_cache_key(["rice", "onion"]) != build_cache_key(["onion", "rice"])
+
+
+def test_key_shares_spellings_of_an_ingredient(engine):
+    assert build_cache_key(["Tomatoes", "red onion"]) == build_cache_key(["tomato", "onion"])
+    assert build_cache_key(["tomato"]) != build_cache_key(["cherry tomato"])
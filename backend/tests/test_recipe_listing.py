@@ -0,0 +1,66 @@
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.models.recipe import Recipe, RecipeFavorite
+from app.schemas.recipe import RecipeFavoriteResponse
+from app.services.recipe_service import RecipeService
+
+
+def _add_recipes(db, profile_id, count):
+    recipes = [
+        Recipe(
+            profile_id=profile_id,
+            title=f"Recipe {i}",
+            ingredients=[{"name": "rice", "quantity": "100", "unit": "g"}],
+            instructions="1. Cook."
+        )
+        for i in range(count)
+    ]
+    db.add_all(recipes)
+    db.flush()
+    db.add_all(RecipeFavorite(profile_id=profile_id, recipe_id=recipe.id) for recipe in recipes[::3])
+    db.commit()
+    return recipes
+
+
+def test_favorite_flags_use_constant_statements_per_page(db, profile, count_statements):
+    _add_recipes(db, profile.id, 60)
+
+    counts = {}
+    for limit in (5, 50):
+        db.expire_all()
+        with count_statements() as statements:
+            recipes, _ = RecipeService.get_recipes_with_favorite_flags(db, profile.id, limit)
+            flags = [recipe.is_favorite for recipe in recipes]
+        assert len(recipes) == limit
+        assert any(flags) and not all(flags)
+        counts[limit] = len(statements)
+
+    assert counts[5] == counts[50]
+
+
+def test_favorite_flags_match_favorites(db, profile):
+    recipes = _add_recipes(db, profile.id, 6)
+    favorited = {recipe.id for recipe in recipes[::3]}
+
+    page, _ = RecipeService.get_recipes_with_favorite_flags(db, profile.id, 10)
+
+    assert {recipe.id for recipe in page if recipe.is_favorite} == favorited
+
+
+def test_favorites_load_their_recipes_in_constant_statements(db, make_profile, count_statements):
+    adapter = TypeAdapter(List[RecipeFavoriteResponse])
+    counts = {}
+    for recipes in (3, 30):
+        profile = make_profile()
+        _add_recipes(db, profile.id, recipes)
+        db.expire_all()
+        with count_statements() as statements:
+            favorites, _ = RecipeService.get_favorites(db, profile.id, limit=50)
+            # Serializing reads each favourite's recipe; a lazy load would raise
+            responses = adapter.validate_python(favorites, from_attributes=True)
+        assert len(responses) == len(range(0, recipes, 3))
+        counts[recipes] = len(statements)
+
+    assert counts[3] == counts[30]
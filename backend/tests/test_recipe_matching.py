@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from app.models.inventory import InventoryItem, UnitType
+from app.schemas.inventory import InventoryItemCreate
+from app.schemas.recipe import RecipeGenerateRequest
+from app.services.inventory_service import InventoryService
+from app.services.llm_client import LLMUnavailableError
+from app.services.recipe_index import RecipeIndexNotReadyError, recipe_index
+from app.services.recipe_service import RecipeService
+
+RICE_BOWL = {
+    "title": "Rice bowl",
+    "ingredients": [
+        {"name": "rice", "quantity": "200", "unit": "g"},
+        {"name": "onion", "quantity": "1", "unit": "piece"},
+    ],
+    "instructions": "1. Cook the rice.\n2. Add the onion.",
+    "servings": 2,
+}
+
+
+@pytest.fixture
+def built_index(db):
+    recipe_index.build(db)
+    yield recipe_index
+
+
+def _stock(db, profile_id, name, quantity, unit):
+    return InventoryService.create_item(db, InventoryItemCreate(
+        profile_id=profile_id, name=name, quantity=quantity, unit=unit
+    ))
+
+
+def test_match_is_scoped_to_own_recipes_by_default(db, make_profile, built_index):
+    owner, other = make_profile("Owner"), make_profile("Other")
+    recipe = RecipeService._save_generated_recipe(owner.id, RICE_BOWL)
+    _stock(db, other.id, "rice", 500, UnitType.GRAM)
+
+    assert RecipeService.match_recipes(db, other.id) == []
+    shared = RecipeService.match_recipes(db, other.id, limit=100, include_other_profiles=True)
+    assert recipe.id in {match.recipe.id for match in shared}
+
+
+def test_match_requires_built_index(db, profile, monkeypatch):
+    monkeypatch.setattr(recipe_index, "ready", False)
+    with pytest.raises(RecipeIndexNotReadyError):
+        RecipeService.match_recipes(db, profile.id)
+
+
+def test_cook_uses_the_cooking_profiles_inventory(db, make_profile, built_index):
+    owner, cook = make_profile("Owner"), make_profile("Cook")
+    recipe = RecipeService._save_generated_recipe(owner.id, RICE_BOWL)
+    owner_rice = _stock(db, owner.id, "rice", 500, UnitType.GRAM)
+    cook_rice = _stock(db, cook.id, "rice", 1, UnitType.KILOGRAM)
+
+    result = RecipeService.cook_recipe(db, recipe.id, cook.id)
+
+    assert [entry.item_id for entry in result.consumed] == [cook_rice.id]
+    db.expire_all()
+    assert db.get(InventoryItem, cook_rice.id).quantity == pytest.approx(0.8)
+    assert db.get(InventoryItem, owner_rice.id).quantity == 500
+
+
+@pytest.mark.parametrize("needed, stocked", [("black pepper", "bell pepper"), ("coconut milk", "milk")])
+@pytest.mark.parametrize("legacy_row", [False, True])
+def test_cook_does_not_take_a_different_ingredient(db, profile, built_index, needed, stocked, legacy_row):
+    recipe = RecipeService._save_generated_recipe(profile.id, {
+        **RICE_BOWL, "ingredients": [{"name": needed, "quantity": "100", "unit": "g"}]
+    })
+    item = _stock(db, profile.id, stocked, 500, UnitType.GRAM)
+    if legacy_row:
+        # Stored before ingredients had canonical ids, so only its name can match
+        item.ingredient_id = None
+        db.commit()
+
+    result = RecipeService.cook_recipe(db, recipe.id, profile.id)
+
+    assert result.consumed == []
+    assert [entry.reason for entry in result.unmatched] == ["not_in_inventory"]
+    db.expire_all()
+    assert db.get(InventoryItem, item.id).quantity == 500
+
+
+@pytest.fixture
+def llm_unavailable(monkeypatch):
+    async def unavailable(*args, **kwargs):
+        raise LLMUnavailableError("Recipe generation is temporarily unavailable", 30.0)
+
+    monkeypatch.setattr(RecipeService, "_generate_recipe_data", unavailable)
+
+
+def _request(profile_id, **fields):
+    return RecipeGenerateRequest(profile_id=profile_id, ingredients=["rice", "onion"], **fields)
+
+
+def test_fallback_serves_only_the_requesters_own_recipes(make_profile, built_index, llm_unavailable):
+    owner, other = make_profile("Owner"), make_profile("Other")
+    RecipeService._save_generated_recipe(owner.id, {**RICE_BOWL, "cuisine_type": "Italian"})
+
+    with pytest.raises(LLMUnavailableError):
+        asyncio.run(RecipeService.generate_recipe(_request(other.id)))
+
+    recipe, stored = asyncio.run(RecipeService.generate_recipe(_request(owner.id, cuisine_type="italian")))
+    assert stored and recipe.profile_id == owner.id
+
+
+@pytest.mark.parametrize("fields", [{"cuisine_type": "Thai"}, {"dietary_preferences": ["vegan"]}])
+def test_fallback_honours_cuisine_and_dietary_requests(make_profile, built_index, llm_unavailable, fields):
+    owner = make_profile("Owner")
+    RecipeService._save_generated_recipe(owner.id, {**RICE_BOWL, "cuisine_type": "Italian"})
+
+    with pytest.raises(LLMUnavailableError):
+        asyncio.run(RecipeService.generate_recipe(_request(owner.id, **fields)))
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.services.startup import StartupState
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Generous next to the benchmark's 1.5s median budget, so only a real regression
+# (I/O or a heavy SDK import at import time) fails it on a slow CI machine
+IMPORT_BUDGET_SECONDS = 10.0
+
+_IMPORT_MAIN = """
+import json, sys, time
+started = time.perf_counter()
+import main
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "llm_sdk_imported": "google.generativeai" in sys.modules,
+}))
+"""
+
+
+def _run_build(state: StartupState, attempts: int = 3) -> asyncio.Task:
+    async def run():
+        task = asyncio.create_task(state.build_recipe_index_with_retries(attempts=attempts, delay=0))
+        task.add_done_callback(state.index_build_done)
+        await asyncio.gather(task, return_exceptions=True)
+        return task
+
+    return asyncio.run(run())
+
+
+def test_index_build_is_retried(monkeypatch):
+    state = StartupState()
+    outcomes = [RuntimeError("database locked"), None]
+
+    def build():
+        error = outcomes.pop(0)
+        if error:
+            raise error
+
+    monkeypatch.setattr(state, "build_recipe_index", build)
+    task = _run_build(state)
+    assert task.exception() is None
+    assert state.stats["index_build_attempts"] == 2
+    assert state.failure is None
+
+
+def test_failed_index_build_marks_startup_failed(monkeypatch):
+    state = StartupState()
+
+    def build():
+        raise RuntimeError("no such table: recipes")
+
+    monkeypatch.setattr(state, "build_recipe_index", build)
+    task = _run_build(state, attempts=2)
+    assert isinstance(task.exception(), RuntimeError)
+    assert state.stats["index_build_attempts"] == 2
+    assert "no such table" in state.failure
+
+
+def test_cancelled_index_build_is_not_a_failure():
+    state = StartupState()
+
+    async def run():
+        task = asyncio.create_task(asyncio.sleep(10))
+        task.add_done_callback(state.index_build_done)
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert state.failure is None
+
+
+def test_importing_main_is_fast_and_has_no_side_effects(tmp_path):
+    database = tmp_path / "import.db"
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "LLM_PROVIDER": "gemini",
+        "RECIPE_CACHE_BACKEND": "memory",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_MAIN],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert measured["seconds"] < IMPORT_BUDGET_SECONDS
+    assert not measured["llm_sdk_imported"]
+    assert not database.exists()
@@ -0,0 +1,17 @@
+import pytest
+
+from app.services.units import parse_quantity
+
+
+@pytest.mark.parametrize("quantity, expected", [
+    (2, 2.0),
+    ("1.5", 1.5),
+    ("1 1/2", 1.5),
+    ("½", 0.5),
+    ("2-3", 2.0),
+    ("a pinch", None),
+    ("1/0", None),
+    ("2 3/0", None),
+])
+def test_parse_quantity(quantity, expected):
+    assert parse_quantity(quantity) == expected
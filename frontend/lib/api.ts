@@ -9,6 +9,18 @@ export const api = axios.create({
   },
 });
 
+// Fetch every page of a cursor-paginated listing by following X-Next-Cursor
+const getAllPages = async (url: string) => {
+  const data: any[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await api.get(url, { params: { limit: 500, cursor } });
+    data.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return { data };
+};
+
 // Profile APIs
 export const profileAPI = {
   getAll: () => api.get('/api/profiles'),
@@ -20,7 +32,7 @@ export const profileAPI = {
 
 // Inventory APIs
 export const inventoryAPI = {
-  getByProfile: (profileId: number) => api.get(`/api/inventory/profile/${profileId}`),
+  getByProfile: (profileId: number) => getAllPages(`/api/inventory/profile/${profileId}`),
   getById: (id: number) => api.get(`/api/inventory/${id}`),
   create: (data: any) => api.post('/api/inventory', data),
   update: (id: number, data: any) => api.put(`/api/inventory/${id}`, data),
@@ -40,7 +52,7 @@ export const recipeAPI = {
   addToFavorites: (data: any) => api.post('/api/recipes/favorites', data),
   removeFromFavorites: (profileId: number, recipeId: number) => 
     api.delete(`/api/recipes/favorites/${profileId}/${recipeId}`),
-  getFavorites: (profileId: number) => api.get(`/api/recipes/favorites/profile/${profileId}`),
+  getFavorites: (profileId: number) => getAllPages(`/api/recipes/favorites/profile/${profileId}`),
 };
 
 // Preference APIs